@@ -42,15 +42,47 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from src.pattern_scanner import PatternScanner
 from src.gene_encoder import GeneEncoder
 from src.mutation_encoder import MutationEncoder
-from src.genome_compressor import GenomeCompressor
+from src.genome_compressor import EVICTION_POLICIES, GENE_ALPHABETS, GenomeCompressor
 from src.genome_decoder import GenomeDecoder
 from src.storage_model import StorageModel
-
-def compress(input_path: str, output_path: str, verbose: bool = False):
+from src.reference_index import REFERENCE_K, ReferenceIndex
+from src.gene_dictionary import DICTIONARY_GENES, GeneDictionary
+from src.entropy_coder import CODECS
+
+def compress(input_path: str, output_path: str, verbose: bool = False, binary: bool = False,
+             codec: str = "zlib", stream: bool = False, jobs: int = 1, mapped: bool = False, band: int = 0,
+             gene_alphabet: str = "dna", max_genes: int = None, eviction: str = "lru", reference_path: str = None,
+             block_size: int = None, dictionary_path: str = None):
     """
     FR: Compresse un fichier texte contenant une séquence ADN vers un fichier .dna.
+    `binary` choisit le conteneur binaire v2 au lieu du JSON v1 (défaut), `codec` le
+    codage entropique des flux binaires. `stream` compresse par morceaux en
+    mémoire bornée (format en flux v2.1). `jobs` répartit la compression sur
+    plusieurs processus. `mapped` écrit le conteneur v3 lisible par mmap.
+    `band` > 0 encode les mutations par alignement en bande (insertions/suppressions).
+    `gene_alphabet` choisit la forme des gènes initiaux ("dna" par défaut, "raw" :
+    motifs bruts).
+    `max_genes` borne le dictionnaire de gènes (65536 par défaut avec `stream`),
+    `eviction` choisit les gènes retirés quand il est plein. `reference_path`
+    désigne un génome de référence indexé (voir build_reference) contre lequel les
+    blocs de `block_size` bases sont encodés (par défaut 6, ou k de la référence s'il
+    est plus grand). `dictionary_path` désigne un dictionnaire de gènes partagé (voir
+    train) que le fichier référence par son empreinte au lieu d'embarquer ces gènes.
 
     EN: Compresses a text file containing a DNA sequence into a .dna file.
+    `binary` selects the v2 binary container instead of v1 JSON (default), `codec` the
+    entropy coding of the binary streams. `stream` compresses chunk by chunk
+    with bounded memory (v2.1 streaming format). `jobs` spreads compression over
+    several processes. `mapped` writes the mmap-readable v3 container.
+    `band` > 0 encodes mutations through banded alignment (insertions/deletions).
+    `gene_alphabet` selects the form of the seed genes ("dna" by default, "raw": raw
+    motifs).
+    `max_genes` bounds the gene dictionary (65536 by default with `stream`),
+    `eviction` selects the genes removed when it is full. `reference_path` names an
+    indexed reference genome (see build_reference) against which the blocks of
+    `block_size` bases are encoded (6 by default, or the reference's k when larger).
+    `dictionary_path` names a shared gene dictionary (see train) that the file
+    refers to by its digest instead of embedding those genes.
     """
     start_time = time.time()
 
@@ -59,6 +91,33 @@ def compress(input_path: str, output_path: str, verbose: bool = False):
         sys.exit(1)
 
     print(Fore.BLUE + f"[INFO] Lécture du fichier {input_path}..." + Style.RESET_ALL)
+    reference = load_reference(reference_path)
+    dictionary = load_dictionary(dictionary_path)
+    if block_size is None:
+        block_size = max(6, reference.k) if reference is not None else 6
+    elif reference is not None and block_size < reference.k:
+        print(Fore.RED + f"[ERREUR] --block-size doit être au moins égal à k ({reference.k}) avec --reference."
+              + Style.RESET_ALL)
+        sys.exit(1)
+
+    if stream:
+        if jobs > 1:
+            print(Fore.RED + "[ERREUR] --jobs n'est pas disponible avec --stream." + Style.RESET_ALL)
+            sys.exit(1)
+        compressor = GenomeCompressor(block_size=block_size, band=band, gene_alphabet=gene_alphabet,
+                                      eviction=eviction, reference=reference, dictionary=dictionary)
+        with open(input_path, "r", encoding="utf-8") as f, open(output_path, "wb") as out, \
+                tqdm(desc="Compression", unit="bloc", colour="green", dynamic_ncols=True) as pbar:
+            length = compressor.compress_stream(f, out, codec=codec, max_genes=max_genes or 65536,
+                                                progress=pbar.update)
+        if not length:
+            os.remove(output_path)
+            print(Fore.RED + "[ERREUR] Le fichier est vide." + Style.RESET_ALL)
+            sys.exit(1)
+        print(Fore.GREEN + f"[SUCCES] Compression réussie : '{input_path}' -> '{output_path}'" + Style.RESET_ALL)
+        elapsed = time.time() - start_time
+        print(Fore.YELLOW + f"[FIN] Durée totale de compression : {elapsed:.2f} secondes" + Style.RESET_ALL)
+        return
 
     with open(input_path, "r", encoding="utf-8") as f:
         raw_data = f.read().strip()
@@ -67,29 +126,19 @@ def compress(input_path: str, output_path: str, verbose: bool = False):
         print(Fore.RED + "[ERREUR] Le fichier est vide." + Style.RESET_ALL)
         sys.exit(1)
 
-    block_size = 6
-    compressor = GenomeCompressor(block_size=block_size)
+    compressor = GenomeCompressor(block_size=block_size, workers=jobs, band=band, gene_alphabet=gene_alphabet,
+                                  max_genes=max_genes, eviction=eviction, reference=reference,
+                                  dictionary=dictionary)
     total_blocks = len(raw_data) // block_size + (1 if len(raw_data) % block_size else 0)
 
-    
     print(Fore.BLUE + "[INFO] Compression finale..." + Style.RESET_ALL)
-    compressed_chunks = []
     with tqdm(total=total_blocks, desc="Compression", unit="bloc", colour="green", dynamic_ncols=True) as pbar:
-        for i in range(0, len(raw_data), block_size):
-            block = raw_data[i:i + block_size]
-            compressed = compressor.compress(block)
-            compressed_chunks.append(compressed)
-            pbar.update(1)
-    
-    compressed_data = compressor.compress(raw_data)
-            
-
-    
+        compressed_data = compressor.compress(raw_data, progress=pbar.update)
 
     if verbose:
         print(Fore.BLUE + f"[DEBUG] Aperçu compression: {str(compressed_data)[100]}..." + Style.RESET_ALL)
     
-    StorageModel.save(compressed_data, output_path)
+    StorageModel.save(compressed_data, output_path, binary=binary, codec=codec, mapped=mapped)
 
     print(Fore.GREEN + f"[SUCCES] Compression réussie : '{input_path}' -> '{output_path}'" + Style.RESET_ALL)
 
@@ -100,10 +149,110 @@ def compress(input_path: str, output_path: str, verbose: bool = False):
  
     
 
-def decompress(input_path: str, output_path: str, verbose: bool = False):
+def load_reference(reference_path: str = None):
+    """
+    FR: Charge le génome de référence indexé `reference_path` (None si absent).
+    EN: Loads the indexed reference genome `reference_path` (None when absent).
+    """
+    if reference_path is None:
+        return None
+    if not os.path.exists(reference_path):
+        print(Fore.RED + f"[ERREUR] Référence introuvable : {reference_path}" + Style.RESET_ALL)
+        sys.exit(1)
+    try:
+        return ReferenceIndex.load(reference_path)
+    except ValueError as e:
+        print(Fore.RED + f"[ERREUR] {e}" + Style.RESET_ALL)
+        sys.exit(1)
+
+
+def load_dictionary(dictionary_path: str = None):
+    """
+    FR: Charge le fichier de dictionnaire de gènes `dictionary_path` (None si absent).
+    EN: Loads the gene dictionary file `dictionary_path` (None when absent).
+    """
+    if dictionary_path is None:
+        return None
+    if not os.path.isfile(dictionary_path):
+        print(Fore.RED + f"[ERREUR] Dictionnaire introuvable : {dictionary_path}" + Style.RESET_ALL)
+        sys.exit(1)
+    try:
+        return GeneDictionary.load(dictionary_path)
+    except ValueError as e:
+        print(Fore.RED + f"[ERREUR] {e}" + Style.RESET_ALL)
+        sys.exit(1)
+
+
+def use_dictionaries(dictionary_path: str = None):
+    """
+    FR: Rend disponibles au décodage le dictionnaire `dictionary_path`, ou ceux d'un
+    répertoire (cherchés par empreinte).
+    EN: Makes the dictionary `dictionary_path`, or those of a directory (looked up by
+    digest), available for decoding.
+    """
+    if dictionary_path is None:
+        return
+    if not os.path.exists(dictionary_path):
+        print(Fore.RED + f"[ERREUR] Dictionnaire introuvable : {dictionary_path}" + Style.RESET_ALL)
+        sys.exit(1)
+    try:
+        GenomeDecoder.load_dictionary(dictionary_path)
+    except ValueError as e:
+        print(Fore.RED + f"[ERREUR] {e}" + Style.RESET_ALL)
+        sys.exit(1)
+
+
+def train(sample_paths: list, output_path: str, size: int = DICTIONARY_GENES, block_size: int = 6):
+    """
+    FR: Entraîne un dictionnaire de gènes partagé sur des échantillons similaires et
+    l'écrit dans `output_path` (fichier, ou répertoire : "<empreinte>.dnadict").
+    EN: Trains a shared gene dictionary on similar samples and writes it to
+    `output_path` (file, or directory: "<digest>.dnadict").
+    """
+    samples = []
+    for sample_path in sample_paths:
+        if not os.path.exists(sample_path):
+            print(Fore.RED + f"[ERREUR] Fichier introuvable : {sample_path}" + Style.RESET_ALL)
+            sys.exit(1)
+        with open(sample_path, "r", encoding="utf-8") as f:
+            samples.append(f.read())
+
+    dictionary = GenomeCompressor(block_size=block_size).train_dictionary(samples, size)
+    if os.path.isdir(output_path):
+        output_path = dictionary.save_to(output_path)
+    else:
+        dictionary.save(output_path)
+    print(Fore.GREEN + f"[SUCCES] Dictionnaire de {len(dictionary)} gènes : '{output_path}' "
+          f"(empreinte {dictionary.digest})" + Style.RESET_ALL)
+
+
+def build_reference(input_path: str, output_path: str, k: int = REFERENCE_K):
+    """
+    FR: Indexe une fois pour toutes la séquence de référence d'un fichier texte
+    (k-mers -> positions) et l'écrit dans `output_path`.
+    EN: Indexes once and for all the reference sequence of a text file
+    (k-mers -> positions) and writes it to `output_path`.
+    """
+    if not os.path.exists(input_path):
+        print(Fore.RED + f"[ERREUR] Fichier introuvable : {input_path}" + Style.RESET_ALL)
+        sys.exit(1)
+    with open(input_path, "r", encoding="utf-8") as f:
+        sequence = f.read().strip()
+    ReferenceIndex(sequence, k).save(output_path)
+    print(Fore.GREEN + f"[SUCCES] Référence indexée : '{input_path}' -> '{output_path}'" + Style.RESET_ALL)
+
+
+def decompress(input_path: str, output_path: str, verbose: bool = False, jobs: int = 1,
+               reference_path: str = None, dictionary_path: str = None):
     """
-    FR: Décompresse un fichier .dna vers un fichier texte brute.
-    EN: Decompresses a .dna file inot a plain text file.
+    FR: Décompresse un fichier .dna vers un fichier texte brute. `jobs` répartit le
+    décodage sur plusieurs processus. `reference_path` charge le génome de
+    référence d'un fichier compressé par référence, `dictionary_path` son
+    dictionnaire de gènes partagé (fichier ou répertoire).
+    EN: Decompresses a .dna file inot a plain text file. `jobs` spreads decoding over
+    several processes. `reference_path` loads the reference genome of a file
+    compressed against a reference, `dictionary_path` its shared gene dictionary
+    (file or directory).
     """
     start_time = time.time()
 
@@ -115,36 +264,25 @@ def decompress(input_path: str, output_path: str, verbose: bool = False):
     if not input_path.endswith(".dna"):
         print(Fore.RED + "[ERREUR] Le fichier d'entrée doit avoir l'éxtension .dna" + Style.RESET_ALL)
         sys.exit(1)
+    load_reference(reference_path)
+    use_dictionaries(dictionary_path)
     
     print(Fore.BLUE + f"[INFO] Décompréssion du fichier {input_path}..." + Style.RESET_ALL)
     
 
-    # Lecture progressive pour montrer la barre de chargement
-    file_size = os.path.getsize(input_path)
-    with open(input_path, "r", encoding="utf-8") as f:
-        buffer = []
-        with tqdm(total=file_size, desc="Lecture .dna", unit="o", dynamic_ncols=True, leave=True, colour="magenta") as pbar:
-            while True:
-                chunk = f.read(1024)
-                if not chunk:
-                    break
-                buffer.append(chunk)
-                pbar.update(len(chunk))
-    
-    json_data = ''.join(buffer)
     if verbose:
-        print(Fore.BLUE + f"[DEBUG] Taille .dna: {file_size} octets"+ Style.RESET_ALL)
-        print(Fore.BLUE + "[DEBUG] Données JSON début:", json_data[:100],"...", Style.RESET_ALL)
-    
-    
-
+        with open(input_path, "rb") as f:
+            head = f.read(100)
+        print(Fore.BLUE + f"[DEBUG] Taille .dna: {os.path.getsize(input_path)} octets"+ Style.RESET_ALL)
+        print(Fore.BLUE + "[DEBUG] Données début:", head,"...", Style.RESET_ALL)
 
     print(Fore.BLUE + "[INFO] Reconstruction de la séquence..." + Style.RESET_ALL)
-    reconstructed = GenomeDecoder.decode_from_file(input_path)
-
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(reconstructed)
+    try:
+        with tqdm(desc="Décompression", unit="car", unit_scale=True, dynamic_ncols=True, colour="magenta") as pbar:
+            GenomeDecoder.decode_to_file(input_path, output_path, workers=jobs, progress=pbar.update)
+    except ValueError as e:
+        print(Fore.RED + f"[ERREUR] {e}" + Style.RESET_ALL)
+        sys.exit(1)
 
     print(Fore.GREEN + f"[SUCCES] Décompréssion réussie : '{input_path}' -> '{output_path}'" + Style.RESET_ALL)
     
@@ -152,6 +290,34 @@ def decompress(input_path: str, output_path: str, verbose: bool = False):
     print(Fore.YELLOW + f"[FIN] Durée totale de décompréssion : {elapsed:.2f} secondes" + Style.RESET_ALL)
 
 
+def extract(input_path: str, start: int, end: int, output_path: str = None, reference_path: str = None,
+            dictionary_path: str = None):
+    """
+    FR: Extrait la région [start, end) d'un fichier .dna sans le décompresser en entier.
+    Sans `output_path`, la région est affichée sur la sortie standard.
+    EN: Extracts the region [start, end) of a .dna file without fully decompressing it.
+    Without `output_path`, the region is printed to standard output.
+    """
+    if not os.path.exists(input_path):
+        print(Fore.RED + f"[ERREUR] Fichier .dna introuvable : {input_path}" + Style.RESET_ALL)
+        sys.exit(1)
+    load_reference(reference_path)
+    use_dictionaries(dictionary_path)
+
+    try:
+        region = GenomeDecoder.decode_range(input_path, start, end)
+    except ValueError as e:
+        print(Fore.RED + f"[ERREUR] {e}" + Style.RESET_ALL)
+        sys.exit(1)
+
+    if output_path is None:
+        print(region)
+        return
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(region)
+    print(Fore.GREEN + f"[SUCCES] Région [{start}, {end}) extraite : '{input_path}' -> '{output_path}'" + Style.RESET_ALL)
+
+
 def show_about():
     """
     FR: Affiche les informations à propos du projet.
@@ -181,6 +347,7 @@ def show_about():
     print(Style.BRIGHT + "Utilisation rapide :" + Style.RESET_ALL)
     print("  puthon3 cli/compressor_cli.py compress fichier.txt -o fichier.dna\n")
     print("  python3 cli/compressor-cli.py decompress fichier.dna -o reconstruction.txt\n")
+    print("  python3 cli/compressor_cli.py extract fichier.dna --start 0 --end 1000\n")
     print("  python3 cli/compressor_cli.py about\n")
     print(Fore.MAGENTA + "Projet développé avec passion pour la bio-informatique." + Style.RESET_ALL)
 
@@ -249,6 +416,18 @@ def main(args=None):
 
     compress_parser.add_argument("-o", "--output", default="output.dna", help="Fichier de sortie .dna")
     compress_parser.add_argument("--verbose", action="store_true",help="Afficher plus de détails pendant l'exécution")
+    compress_parser.add_argument("--format", choices=["json", "binary", "mapped"], default="json", help="Format du fichier .dna : JSON v1 (défaut), binaire v2 ou tables fixes v3 lisibles par mmap")
+    compress_parser.add_argument("--codec", choices=list(CODECS), default="zlib", help="Codage entropique des flux du format binaire (--format binary)")
+    compress_parser.add_argument("--jobs", type=int, default=1, help="Nombre de processus de compression (segments parallèles)")
+    compress_parser.add_argument("--stream", action="store_true", help="Compresser par morceaux en mémoire bornée (fichiers volumineux)")
+    compress_parser.add_argument("--genes", choices=list(GENE_ALPHABETS), default="dna", help="Forme des gènes initiaux : encodés en ADN (défaut), ou motifs bruts comparables aux blocs (raw)")
+    compress_parser.add_argument("--band", type=int, default=0, help="Largeur de bande de l'alignement des mutations (0 = position par position)")
+    compress_parser.add_argument("--max-genes", type=int, default=None, help="Taille maximale du dictionnaire de gènes (défaut : illimitée, 65536 avec --stream)")
+    compress_parser.add_argument("--eviction", choices=list(EVICTION_POLICIES), default="lru", help="Gènes retirés du dictionnaire plein : moins récemment (lru) ou moins souvent (lfu) utilisés, ou réinitialisation complète (reset)")
+    compress_parser.add_argument("--reference", default=None, help="Génome de référence indexé (sous-commande reference) : seules les différences sont stockées")
+    compress_parser.add_argument("--block-size", type=int, default=None,
+                                 help="Taille des blocs (6 par défaut ; au moins k, et k par défaut, avec --reference)")
+    compress_parser.add_argument("--dictionary", default=None, help="Dictionnaire de gènes partagé (sous-commande train), référencé par empreinte")
 
     # Sous-commnande : decompress
     decompress_parser = subparsers.add_parser("decompress", help="Décompresser un fichier .dna en text brut")
@@ -257,6 +436,34 @@ def main(args=None):
 
     decompress_parser.add_argument("-o", "--output", default="reconstructed.txt",help="Fichier texte de sortie")
     decompress_parser.add_argument("--verbose", action="store_true", help="Afficher plus de details pendant l'éxécution")
+    decompress_parser.add_argument("--jobs", type=int, default=1, help="Nombre de processus de décodage")
+    decompress_parser.add_argument("--reference", default=None, help="Génome de référence indexé utilisé à la compression")
+    decompress_parser.add_argument("--dictionary", default=None, help="Dictionnaire de gènes partagé, ou répertoire de dictionnaires")
+
+    # Sous-commande : extract
+    extract_parser = subparsers.add_parser("extract", help="Extraire une région d'un fichier .dna")
+
+    extract_parser.add_argument("input", help="Fichier .dna source")
+    extract_parser.add_argument("--start", type=int, required=True, help="Première position (incluse, à partir de 0)")
+    extract_parser.add_argument("--end", type=int, required=True, help="Dernière position (exclue)")
+    extract_parser.add_argument("-o", "--output", default=None, help="Fichier texte de sortie (sortie standard par défaut)")
+    extract_parser.add_argument("--reference", default=None, help="Génome de référence indexé utilisé à la compression")
+    extract_parser.add_argument("--dictionary", default=None, help="Dictionnaire de gènes partagé, ou répertoire de dictionnaires")
+
+    # Sous-commande : train
+    train_parser = subparsers.add_parser("train", help="Entraîner un dictionnaire de gènes partagé entre archives")
+
+    train_parser.add_argument("samples", nargs="+", help="Fichiers texte des échantillons d'entraînement")
+    train_parser.add_argument("-o", "--output", default="genes.dnadict", help="Fichier du dictionnaire, ou répertoire (nommé par empreinte)")
+    train_parser.add_argument("--size", type=int, default=DICTIONARY_GENES, help="Nombre maximal de gènes")
+    train_parser.add_argument("--block-size", type=int, default=6, help="Taille des blocs (identique à la compression)")
+
+    # Sous-commande : reference
+    reference_parser = subparsers.add_parser("reference", help="Indexer un génome de référence pour la compression par référence")
+
+    reference_parser.add_argument("input", help="Fichier texte de la séquence de référence")
+    reference_parser.add_argument("-o", "--output", default="reference.dnaref", help="Fichier de référence indexé")
+    reference_parser.add_argument("-k", type=int, default=REFERENCE_K, help="Longueur des k-mers indexés")
 
     # Sous-commande : about
     subparsers.add_parser("about", help="Afficher les inforamtions sur le projet")
@@ -281,9 +488,20 @@ def main(args=None):
     args = parser.parse_args(args)
 
     if args.command == "compress":
-        compress(args.input, args.output, verbose=args.verbose)
+        compress(args.input, args.output, verbose=args.verbose, binary=args.format == "binary", codec=args.codec,
+                 stream=args.stream, jobs=args.jobs, mapped=args.format == "mapped", band=args.band,
+                 gene_alphabet=args.genes, max_genes=args.max_genes, eviction=args.eviction,
+                 reference_path=args.reference, block_size=args.block_size, dictionary_path=args.dictionary)
     elif args.command == "decompress":
-        decompress(args.input, args.output, verbose=args.verbose)
+        decompress(args.input, args.output, verbose=args.verbose, jobs=args.jobs, reference_path=args.reference,
+                   dictionary_path=args.dictionary)
+    elif args.command == "extract":
+        extract(args.input, args.start, args.end, args.output, reference_path=args.reference,
+                dictionary_path=args.dictionary)
+    elif args.command == "train":
+        train(args.samples, args.output, args.size, args.block_size)
+    elif args.command == "reference":
+        build_reference(args.input, args.output, args.k)
     elif args.command == "about":
         show_about()
 
@@ -62,6 +62,14 @@ setup(
         "Pillow",
     ],
 
+    # FR : Dépendances optionnelles : NumPy accélère le comptage des k-mers, la
+    #      matrice de gènes et la table des suffixes (pip install .[fast])
+    # EN : Optional dependencies: NumPy speeds up k-mer counting, the gene matrix
+    #      and the suffix array (pip install .[fast])
+    extras_require={
+        "fast": ["numpy"],
+    },
+
     # FR : Point d'entrée pour la commande 'genome_compressor'
     # En : Entry point for the 'genome_compressor' command
     entry_points={
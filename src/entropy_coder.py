@@ -0,0 +1,203 @@
+# src/entropy_coder.py
+
+#------------------------------------------------------------------------------
+
+# Copyright (c) 2025 Rakotondravelo Tahina Mickaël
+# All rights reserved.
+#
+# This file is part of the GENOME_COMPRESSOR project.
+#
+# licensed under the MIT License. You may obtain a copy of the License at:
+# https://opensource.org/licences/MIT
+#------------------------------------------------------------------------------
+
+"""
+FR:
+Étage de codage entropique appliqué aux flux de blocs et de mutations des fichiers
+.dna binaires. Codecs disponibles :
+
+- "rans" : codeur rANS d'ordre 0 implémenté dans le projet (table de fréquences
+  normalisée sur 12 bits, renormalisation par octet)
+- "zlib", "lzma" : repli sur la bibliothèque standard
+- "none" : flux stocké tel quel
+
+Auteur               : Rakotondravelo Tahina Mickaël
+
+
+EN:
+Entropy-coding stage applied to the block and mutation streams of binary .dna
+files. Available codecs:
+
+- "rans": in-project order-0 rANS coder (frequency table normalised to 12 bits,
+  byte-wise renormalisation)
+- "zlib", "lzma": standard library fallback
+- "none": stream stored verbatim
+
+Author               : Rakotondravelo Tahina Mickaël
+"""
+
+import lzma
+import zlib
+
+from src.utils import read_varint, write_varint
+
+CODECS = ("none", "zlib", "lzma", "rans")
+
+SCALE_BITS = 12
+SCALE = 1 << SCALE_BITS
+RANS_LOW = 1 << 23  # Borne basse de l'état / Lower bound of the state
+
+
+class RansCoder:
+    """
+    FR:
+    Codeur rANS statique d'ordre 0 sur des octets. La table des fréquences est
+    écrite en tête du flux codé.
+
+    EN:
+    Static order-0 rANS coder over bytes. The frequency table is written at the
+    head of the encoded stream.
+    """
+
+    @staticmethod
+    def _normalize(counts):
+        """
+        FR: Ramène les fréquences à une somme de 2^12, chaque symbole présent gardant >= 1.
+        EN: Scales frequencies to sum to 2^12, every present symbol keeping >= 1.
+        """
+        total = sum(counts)
+        freqs = [max(1, c * SCALE // total) if c else 0 for c in counts]
+        excess = sum(freqs) - SCALE
+        order = sorted(range(256), key=freqs.__getitem__, reverse=True)
+        i = 0
+        while excess > 0:
+            symbol = order[i % len(order)]
+            if freqs[symbol] > 1:
+                freqs[symbol] -= 1
+                excess -= 1
+            i += 1
+        freqs[order[0]] -= excess  # excès négatif : on complète le plus fréquent
+        return freqs
+
+    @staticmethod
+    def encode(data: bytes) -> bytes:
+        """
+        FR: Code `data` ; retourne en-tête (longueur, fréquences) + flux rANS.
+        EN: Encodes `data`; returns header (length, frequencies) + rANS stream.
+        """
+        out = bytearray()
+        write_varint(out, len(data))
+        if not data:
+            return bytes(out)
+
+        counts = [0] * 256
+        for byte in data:
+            counts[byte] += 1
+        freqs = RansCoder._normalize(counts)
+        starts = [0] * 256
+        running = 0
+        for symbol in range(256):
+            starts[symbol] = running
+            running += freqs[symbol]
+
+        present = [s for s in range(256) if freqs[s]]
+        write_varint(out, len(present))
+        for symbol in present:
+            out.append(symbol)
+            write_varint(out, freqs[symbol])
+
+        # Codage en ordre inverse pour un décodage dans l'ordre naturel
+        stream = bytearray()
+        state = RANS_LOW
+        bound = (RANS_LOW >> SCALE_BITS) << 8
+        for byte in reversed(data):
+            freq = freqs[byte]
+            limit = bound * freq
+            while state >= limit:
+                stream.append(state & 0xFF)
+                state >>= 8
+            state = ((state // freq) << SCALE_BITS) + (state % freq) + starts[byte]
+        for _ in range(4):
+            stream.append(state & 0xFF)
+            state >>= 8
+
+        stream.reverse()
+        out += stream
+        return bytes(out)
+
+    @staticmethod
+    def decode(payload: bytes) -> bytes:
+        """
+        FR: Décode un flux produit par RansCoder.encode.
+        EN: Decodes a stream produced by RansCoder.encode.
+        """
+        length, pos = read_varint(payload, 0)
+        if length == 0:
+            return b""
+
+        freqs = [0] * 256
+        present, pos = read_varint(payload, pos)
+        for _ in range(present):
+            symbol = payload[pos]
+            freqs[symbol], pos = read_varint(payload, pos + 1)
+
+        starts = [0] * 256
+        lookup = bytearray(SCALE)
+        running = 0
+        for symbol in range(256):
+            starts[symbol] = running
+            lookup[running:running + freqs[symbol]] = bytes([symbol]) * freqs[symbol]
+            running += freqs[symbol]
+
+        state = int.from_bytes(payload[pos:pos + 4], "big")
+        pos += 4
+        mask = SCALE - 1
+        out = bytearray(length)
+        for i in range(length):
+            slot = state & mask
+            symbol = lookup[slot]
+            out[i] = symbol
+            state = freqs[symbol] * (state >> SCALE_BITS) + slot - starts[symbol]
+            while state < RANS_LOW:
+                state = (state << 8) | payload[pos]
+                pos += 1
+        return bytes(out)
+
+
+class EntropyCoder:
+    """
+    FR : Sélection du codec entropique d'un flux.
+    EN : Entropy codec selection for a stream.
+    """
+
+    @staticmethod
+    def encode(data: bytes, codec: str = "none") -> bytes:
+        """
+        FR: Code `data` avec le codec choisi parmi CODECS.
+        EN: Encodes `data` with the codec chosen among CODECS.
+        """
+        if codec == "none":
+            return bytes(data)
+        if codec == "zlib":
+            return zlib.compress(bytes(data), 9)
+        if codec == "lzma":
+            return lzma.compress(bytes(data))
+        if codec == "rans":
+            return RansCoder.encode(bytes(data))
+        raise ValueError(f"Codec inconnu : {codec}")
+
+    @staticmethod
+    def decode(payload: bytes, codec: str = "none") -> bytes:
+        """
+        FR: Décode un flux codé avec `codec`.
+        EN: Decodes a stream encoded with `codec`.
+        """
+        if codec == "none":
+            return bytes(payload)
+        if codec == "zlib":
+            return zlib.decompress(payload)
+        if codec == "lzma":
+            return lzma.decompress(payload)
+        if codec == "rans":
+            return RansCoder.decode(payload)
+        raise ValueError(f"Codec inconnu : {codec}")
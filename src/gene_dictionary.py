@@ -0,0 +1,222 @@
+# src/gene_dictionary.py
+
+#------------------------------------------------------------------------------
+
+# Copyright (c) 2025 Rakotondravelo Tahina Mickaël
+# All rights reserved.
+#
+# This file is part of the GENOME_COMPRESSOR project.
+#
+# licensed under the MIT License. You may obtain a copy of the License at:
+# https://opensource.org/licences/MIT
+#------------------------------------------------------------------------------
+
+"""
+FR:
+Dictionnaire de gènes partagé entre archives. Entraîné une fois sur des
+échantillons similaires (voir GenomeCompressor.train_dictionary), il est écrit
+dans un fichier autonome et désigné par l'empreinte SHA-256 de son contenu.
+
+Ses gènes portent les identifiants fixes "D0", "D1", ... : les fichiers .dna qui
+l'utilisent notent seulement metadata["dictionary"] (empreinte et nombre de gènes)
+et leurs conteneurs binaires le traitent comme un préfixe implicite de la table des
+gènes. Au décodage, il est lu une seule fois par processus : les dictionnaires
+chargés sont gardés par empreinte, et un dictionnaire absent est cherché sous le
+nom "<empreinte>.dnadict" dans les répertoires de DICTIONARY_PATHS.
+
+Auteur               : Rakotondravelo Tahina Mickaël
+
+
+EN:
+Gene dictionary shared across archives. Trained once on similar samples (see
+GenomeCompressor.train_dictionary), it is written to a standalone file and named
+by the SHA-256 digest of its content.
+
+Its genes carry the fixed identifiers "D0", "D1", ...: the .dna files using it only
+record metadata["dictionary"] (digest and gene count) and their binary containers
+treat it as an implicit prefix of the gene table. At decoding time, it is read once
+per process: loaded dictionaries are kept by digest, and a missing dictionary is
+looked up as "<digest>.dnadict" in the directories of DICTIONARY_PATHS.
+
+Author               : Rakotondravelo Tahina Mickaël
+"""
+
+import hashlib
+import os
+from typing import Dict, List
+
+from src.utils import is_nucleotide_sequence, pack_bases, read_bytes, read_varint, unpack_bases, write_bytes, write_varint
+
+DICTIONARY_MAGIC = b"DNAD"
+DICTIONARY_SUFFIX = ".dnadict"
+DICTIONARY_GENES = 4096  # Taille par défaut d'un dictionnaire entraîné / Default trained dictionary size
+DICTIONARY_PATHS: List[str] = []  # Répertoires de recherche par empreinte / Lookup directories by digest
+
+_GENE_TEXT = 0
+_GENE_PACKED = 1
+
+_loaded: Dict[str, "GeneDictionary"] = {}  # Dictionnaires chargés, par empreinte / Loaded dictionaries, by digest
+_files: Dict[str, str] = {}  # {chemin: empreinte} des fichiers déjà lus / {path: digest} of the files already read
+
+
+def dictionary_id(index: int) -> str:
+    """
+    FR: Identifiant du gène numéro `index` d'un dictionnaire partagé.
+    EN: Identifier of gene number `index` of a shared dictionary.
+    """
+    return f"D{index}"
+
+
+def shared_ids(metadata: dict) -> List[str]:
+    """
+    FR: Identifiants des gènes du dictionnaire partagé désigné par `metadata` (préfixe
+    implicite de la table des gènes), liste vide sans dictionnaire.
+    EN: Identifiers of the genes of the shared dictionary named by `metadata` (implicit
+    prefix of the gene table), empty list without a dictionary.
+    """
+    dictionary = metadata.get("dictionary")
+    if dictionary is None:
+        return []
+    return [dictionary_id(index) for index in range(dictionary["genes"])]
+
+
+class GeneDictionary:
+    """
+    FR : Gènes partagés "D<i>", sérialisés et désignés par leur empreinte.
+    EN : Shared "D<i>" genes, serialised and named by their digest.
+    """
+
+    def __init__(self, sequences: List[str]):
+        """
+        FR: Construit le dictionnaire et l'enregistre dans le processus sous son empreinte.
+        EN: Builds the dictionary and registers it in the process under its digest.
+        """
+        self.genes = {dictionary_id(index): sequence for index, sequence in enumerate(sequences)}
+        self.payload = self._encode(sequences)
+        self.digest = hashlib.sha256(self.payload).hexdigest()
+        self.register()
+
+    def register(self) -> None:
+        """
+        FR: Enregistre le dictionnaire dans le processus sous son empreinte (voir get) ;
+        utile pour une copie reçue par un autre processus.
+        EN: Registers the dictionary in the process under its digest (see get); useful
+        for a copy received by another process.
+        """
+        _loaded[self.digest] = self
+
+    def __len__(self):
+        return len(self.genes)
+
+    def metadata(self) -> dict:
+        """
+        FR: Description du dictionnaire notée dans les fichiers .dna.
+        EN: Dictionary description recorded in .dna files.
+        """
+        return {"sha256": self.digest, "genes": len(self.genes)}
+
+    @staticmethod
+    def _encode(sequences: List[str]) -> bytes:
+        """
+        FR: Contenu du fichier (hors signature) : séquences A/C/G/T sur 2 bits, les autres en UTF-8.
+        EN: File content (signature excluded): A/C/G/T sequences on 2 bits, others in UTF-8.
+        """
+        out = bytearray()
+        write_varint(out, len(sequences))
+        for sequence in sequences:
+            if sequence and is_nucleotide_sequence(sequence):
+                out.append(_GENE_PACKED)
+                write_varint(out, len(sequence))
+                out += pack_bases(sequence)
+            else:
+                out.append(_GENE_TEXT)
+                write_bytes(out, sequence.encode("utf-8"))
+        return bytes(out)
+
+    @staticmethod
+    def _decode(payload: bytes) -> List[str]:
+        """
+        FR: Relit les séquences écrites par _encode.
+        EN: Reads back the sequences written by _encode.
+        """
+        sequences = []
+        count, pos = read_varint(payload, 0)
+        for _ in range(count):
+            kind = payload[pos]
+            if kind == _GENE_PACKED:
+                length, pos = read_varint(payload, pos + 1)
+                size = (length + 3) // 4
+                if pos + size > len(payload):
+                    raise IndexError("gène tronqué")
+                sequences.append(unpack_bases(payload[pos:pos + size], length))
+                pos += size
+            else:
+                raw_sequence, pos = read_bytes(payload, pos + 1)
+                sequences.append(raw_sequence.decode("utf-8"))
+        if pos != len(payload):
+            raise IndexError("données en trop")
+        return sequences
+
+    def save(self, filename: str) -> None:
+        """
+        FR: Écrit le dictionnaire dans `filename`.
+        EN: Writes the dictionary to `filename`.
+        """
+        with open(filename, "wb") as f:
+            f.write(DICTIONARY_MAGIC + self.payload)
+
+    def save_to(self, directory: str) -> str:
+        """
+        FR: Écrit le dictionnaire sous le nom "<empreinte>.dnadict" dans `directory` ;
+        retourne son chemin.
+        EN: Writes the dictionary as "<digest>.dnadict" in `directory`; returns its path.
+        """
+        filename = os.path.join(directory, self.digest + DICTIONARY_SUFFIX)
+        self.save(filename)
+        return filename
+
+    @staticmethod
+    def load(filename: str) -> "GeneDictionary":
+        """
+        FR: Charge un fichier de dictionnaire, une seule fois par processus.
+        EN: Loads a dictionary file, once per process.
+
+        Raises:
+          ValueError: Si le fichier est invalide / If the file is invalid.
+        """
+        path = os.path.abspath(filename)
+        digest = _files.get(path)
+        if digest in _loaded:
+            return _loaded[digest]
+
+        with open(filename, "rb") as f:
+            buffer = f.read()
+        if not buffer.startswith(DICTIONARY_MAGIC):
+            raise ValueError("Le fichier de dictionnaire est invalide ou corrompu.")
+        try:
+            sequences = GeneDictionary._decode(buffer[len(DICTIONARY_MAGIC):])
+        except (IndexError, UnicodeDecodeError) as e:
+            raise ValueError("Le fichier de dictionnaire est invalide ou corrompu.") from e
+        dictionary = GeneDictionary(sequences)
+        _files[path] = dictionary.digest
+        return dictionary
+
+    @staticmethod
+    def get(digest: str) -> "GeneDictionary":
+        """
+        FR: Dictionnaire d'empreinte `digest` : déjà chargé, ou lu depuis l'un des
+        répertoires de DICTIONARY_PATHS.
+        EN: Dictionary of digest `digest`: already loaded, or read from one of the
+        DICTIONARY_PATHS directories.
+
+        Raises:
+          ValueError: S'il est introuvable / If it cannot be found.
+        """
+        dictionary = _loaded.get(digest)
+        if dictionary is not None:
+            return dictionary
+        for directory in DICTIONARY_PATHS:
+            filename = os.path.join(directory, digest + DICTIONARY_SUFFIX)
+            if os.path.exists(filename) and GeneDictionary.load(filename).digest == digest:
+                return _loaded[digest]
+        raise ValueError(f"Dictionnaire de gènes non chargé : {digest}")
@@ -21,7 +21,7 @@ Transforme des motifs textuels en séquences ADN encodées (2 bits/base) et gén
 gènes optimisé pour la compression génomique
 
 Fonctionnalités :
-- Encodage texte -> ADN
+- Encodage texte -> ADN (tables de traduction par octet, encode_bytes / decode_bytes)
 - Construction de dictionnaire de gènes
 - Encodage de séquences par référence aux gènes
 - Décodage ADN -> texte
@@ -35,7 +35,7 @@ gene dictionnary
 optimized for genomic compression.
 
 Features:
-- Text to DNA encoding
+- Text to DNA encoding (per-byte translation tables, encode_bytes / decode_bytes)
 - Gene dictionary construction
 - Sequence encoding using gene references
 - DNA to text decoding
@@ -45,6 +45,12 @@ Author                 : Rakotondravelo tahina Mickaël
 
 from typing import Dict, List
 
+_BASES = b"ACGT"
+# Plan k : octet -> base codée par ses bits 7-6 (k = 0) ... 1-0 (k = 3)
+_ENCODE_PLANES = [bytes(_BASES[(byte >> (6 - 2 * k)) & 3] for byte in range(256)) for k in range(4)]
+# Plan k : base -> ses 2 bits, placés à la position de la k-ième base d'un octet
+_DECODE_PLANES = [bytes.maketrans(_BASES, bytes(code << (6 - 2 * k) for code in range(4))) for k in range(4)]
+
 
 class GeneEncoder:
     """
@@ -92,18 +98,68 @@ class GeneEncoder:
         """
         return ''.join(self.binary_to_dna[binary_str[i:i+2]] for i in range(0, len(binary_str),2))
     
+    @staticmethod
+    def encode_bytes(data) -> bytes:
+        """
+
+        FR : Encode des octets en bases ASCII (4 bases par octet, poids fort en premier).
+        Chaque plan de 2 bits est traduit d'un bloc par `bytes.translate`, puis
+        entrelacé par affectation de tranche : aucune boucle Python par octet.
+
+        EN : Encodes bytes into ASCII bases (4 bases per byte, most significant first).
+        Each 2-bit plane is translated in one go by `bytes.translate`, then interleaved
+        through slice assignment: no Python loop per byte.
+
+        :param data: Octets (bytes, bytearray, memoryview) / Bytes (bytes, bytearray, memoryview)
+        :return: Bases A/C/G/T en ASCII / A/C/G/T bases in ASCII
+        """
+        data = bytes(data)
+        out = bytearray(4 * len(data))
+        for k, plane in enumerate(_ENCODE_PLANES):
+            out[k::4] = data.translate(plane)
+        return bytes(out)
+
+    @staticmethod
+    def decode_bytes(bases) -> bytes:
+        """
+
+        FR : Inverse de encode_bytes. Les 4 plans de bases sont traduits en bits puis
+        réunis par un OU sur des entiers (bits disjoints, sans retenue).
+
+        EN : Inverse of encode_bytes. The 4 base planes are translated into bits then
+        merged by an OR over integers (disjoint bits, no carry).
+
+        :param bases: Bases A/C/G/T en ASCII, longueur multiple de 4 / A/C/G/T bases in ASCII, length multiple of 4
+        :return: Octets décodés / Decoded bytes
+        :raises ValueError: Base inconnue ou longueur invalide / Unknown base or invalid length
+        """
+        bases = bytes(bases)
+        if len(bases) % 4 or bases.translate(None, _BASES):
+            raise ValueError("La séquence ADN doit contenir des bases A/C/G/T par groupes de 4.")
+        size = len(bases) // 4
+        value = 0
+        for k, plane in enumerate(_DECODE_PLANES):
+            value |= int.from_bytes(bases[k::4].translate(plane), "big")
+        return value.to_bytes(size, "big")
+
     def encode_motif(self, motif: str) -> str:
         """
         
-        FR : Encode un motif en une séquence ADN.
+        FR : Encode un motif en une séquence ADN (tables d'octets pour le texte Latin-1,
+        conversion bit à bit au-delà).
         
-        EN : Encodes a textual motif into a DNA sequence.
+        EN : Encodes a textual motif into a DNA sequence (byte tables for Latin-1 text,
+        bit-by-bit conversion beyond).
         
         :param motif: Motif à encoder / Motif to encode
         :return: Séquence ADN encodée / Encoded DNA sequence
         """
-        binary = ''.join(self._char_to_binary(c) for c in motif)
-        return self._binary_to_dna(binary)
+        try:
+            data = motif.encode("latin-1")
+        except UnicodeEncodeError:
+            binary = ''.join(self._char_to_binary(c) for c in motif)
+            return self._binary_to_dna(binary)
+        return self.encode_bytes(data).decode("ascii")
     
     def build_gene_dict(self, motifs: Dict[str, int]) -> Dict[str, str]:
         """
@@ -166,6 +222,12 @@ class GeneEncoder:
         
         :param dna_seq: Séquence AND à décoder / DNA sequence to decode
         :return: Chaîne de texte / Text string"""
+        if len(dna_seq) % 4 == 0 and dna_seq.isascii():
+            try:
+                return self.decode_bytes(dna_seq.encode("ascii")).decode("latin-1")
+            except ValueError:
+                pass  # base inconnue : l'ancienne conversion lève l'erreur d'origine
+
         binary_str = ''.join(self.dna_to_binary[base] for base in dna_seq)
 
         chars = [chr(int(binary_str[i:i+8], 2)) for i in range(0,len(binary_str),8)]
@@ -0,0 +1,299 @@
+# src/gene_index.py
+
+#------------------------------------------------------------------------------
+
+# Copyright (c) 2025 Rakotondravelo Tahina Mickaël
+# All rights reserved.
+#
+# This file is part of the GENOME_COMPRESSOR project.
+#
+# licensed under the MIT License. You may obtain a copy of the License at:
+# https://opensource.org/licences/MIT
+#------------------------------------------------------------------------------
+
+"""
+FR:
+Index des gènes connus pour la recherche du gène le plus proche.
+
+Principe des tiroirs : si un bloc diffère d'un gène d'au plus k mutations, alors en
+découpant le bloc en k + 1 segments, au moins un segment est identique au gène à la
+même position. Chaque segment sert de clé dans une table de hachage ; seuls les gènes
+partageant un segment exact sont proposés comme candidats. Pour des mutations avec
+insertions et suppressions (alignement), les segments sont pris sur les n - k
+premières bases et cherchés dans le bloc avec un décalage d'au plus k positions.
+Des segments de une ou deux bases sont partagés par presque tous les gènes d'ADN :
+`min_segment` borne donc le nombre de segments, la garantie tombant alors à
+(n // min_segment) - 1 mutations.
+
+Variante vectorisée (GeneMatrix, NumPy) : les gènes de même longueur sont rangés dans
+une matrice 2-D et la distance de Hamming d'un bloc à tous les gènes est calculée en
+une seule opération.
+
+Auteur               : Rakotondravelo Tahina Mickaël
+
+
+EN:
+Index of known genes for the closest-gene lookup.
+
+Pigeonhole principle: if a block differs from a gene by at most k mutations, then
+splitting the block into k + 1 segments, at least one segment is identical to the
+gene at the same position. Each segment is used as a hash-table key; only genes
+sharing an exact segment are returned as candidates. For mutations with insertions
+and deletions (alignment), segments are taken over the first n - k bases and looked
+up in the block with a shift of at most k positions. Segments of one or two bases
+are shared by almost every DNA gene: `min_segment` therefore bounds the number of
+segments, the guarantee then dropping to (n // min_segment) - 1 mutations.
+
+Vectorised variant (GeneMatrix, NumPy): genes of the same length are stored in a 2-D
+matrix and the Hamming distance from a block to every gene is computed in a single
+operation.
+
+Author               : Rakotondravelo Tahina Mickaël
+"""
+
+from typing import Dict, List
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel / NumPy is optional
+    np = None
+
+
+class GeneIndex:
+    """
+    FR:
+    Index par segments exacts (principe des tiroirs) sur le dictionnaire de gènes.
+
+    EN:
+    Exact-segment (pigeonhole) index over the gene dictionary.
+    """
+
+    def __init__(self, max_mutations: int = 3, min_segment: int = 1):
+        """
+        FR: Initialise un index garantissant tous les gènes à <= `max_mutations` mutations,
+        ou à <= (longueur couverte // `min_segment`) - 1 si les segments seraient plus
+        courts que `min_segment` bases (recherche sélective, sans garantie au-delà).
+        EN: Initializes an index guaranteeing every gene within `max_mutations` mutations,
+        or within (covered length // `min_segment`) - 1 when segments would be shorter
+        than `min_segment` bases (selective lookup, no guarantee beyond).
+        """
+        self.max_mutations = max_mutations
+        self.min_segment = max(1, min_segment)
+        self.genes: Dict[str, str] = {}
+        self._order: Dict[str, int] = {}
+        self._added = 0
+        # {(longueur de requête, décalage): (bornes, [ {segment: {gene_id: None}} ])}
+        self._tables = {}
+
+    def __len__(self):
+        return len(self.genes)
+
+    def __contains__(self, gene_id):
+        return gene_id in self.genes
+
+    def add(self, gene_id: str, sequence: str) -> None:
+        """
+        FR: Ajoute un gène à l'index (et à toutes les tables déjà construites).
+        EN: Adds a gene to the index (and to every table already built).
+        """
+        self.genes[gene_id] = sequence
+        self._order[gene_id] = self._added
+        self._added += 1
+        for bounds, buckets in self._tables.values():
+            self._insert(gene_id, sequence, bounds, buckets)
+
+    def remove(self, gene_id: str) -> None:
+        """
+        FR: Retire un gène de l'index (gène évincé du dictionnaire).
+        EN: Removes a gene from the index (gene evicted from the dictionary).
+        """
+        sequence = self.genes.pop(gene_id)
+        del self._order[gene_id]
+        for bounds, buckets in self._tables.values():
+            for s, bucket in enumerate(buckets):
+                end = bounds[s + 1]
+                if len(sequence) < end:
+                    break
+                segment = sequence[bounds[s]:end]
+                ids = bucket[segment]
+                del ids[gene_id]
+                if not ids:
+                    del bucket[segment]
+
+    def candidates(self, sequence: str, shift: int = 0) -> List[str]:
+        """
+        FR:
+        Retourne les gènes susceptibles d'être à <= max_mutations mutations de `sequence`,
+        dans leur ordre d'insertion. Aucun gène qualifié n'est omis ; la vérification
+        exacte reste à la charge de l'appelant. Avec `shift` > 0, les mutations sont
+        des éditions (insertions et suppressions comprises) d'au plus `shift` positions
+        de décalage.
+
+        EN:
+        Returns the genes that may be within max_mutations mutations of `sequence`, in
+        insertion order. No qualifying gene is omitted; exact verification is left to
+        the caller. With `shift` > 0, mutations are edits (insertions and deletions
+        included) shifting positions by at most `shift`.
+        """
+        n = len(sequence)
+        if self._parts(n - shift) > n - shift:
+            # Segments vides : tout gène peut convenir
+            return list(self.genes)
+
+        table = self._tables.get((n, shift))
+        if table is None:
+            table = self._build_table(n, shift)
+        bounds, buckets = table
+
+        found = set()
+        for s, bucket in enumerate(buckets):
+            start, end = bounds[s], bounds[s + 1]
+            for d in range(max(-shift, -start), min(shift, n - end) + 1):
+                found.update(bucket.get(sequence[start + d:end + d], ()))
+        return sorted(found, key=self._order.__getitem__)
+
+    def _parts(self, covered: int) -> int:
+        """
+        FR: Nombre de segments pour `covered` bases : max_mutations + 1, sans segment
+        plus court que min_segment (au moins un).
+        EN: Number of segments for `covered` bases: max_mutations + 1, without any
+        segment shorter than min_segment (at least one).
+        """
+        return max(1, min(self.max_mutations + 1, covered // self.min_segment))
+
+    def _build_table(self, length: int, shift: int = 0):
+        """
+        FR: Construit la table de segments pour les requêtes de longueur `length` ; les
+        segments couvrent les `length - shift` premières bases, présentes dans tout gène
+        assez proche.
+        EN: Builds the segment table for queries of length `length`; segments cover the
+        first `length - shift` bases, present in every close enough gene.
+        """
+        covered = length - shift
+        parts = self._parts(covered)
+        bounds = [covered * s // parts for s in range(parts + 1)]
+        buckets = [{} for _ in range(parts)]
+        for gene_id, sequence in self.genes.items():
+            self._insert(gene_id, sequence, bounds, buckets)
+        self._tables[(length, shift)] = (bounds, buckets)
+        return self._tables[(length, shift)]
+
+    @staticmethod
+    def _insert(gene_id, sequence, bounds, buckets):
+        for s, bucket in enumerate(buckets):
+            end = bounds[s + 1]
+            if len(sequence) < end:
+                break
+            # Dictionnaire comme ensemble ordonné : retrait en O(1) à l'éviction
+            bucket.setdefault(sequence[bounds[s]:end], {})[gene_id] = None
+
+
+class GeneMatrix:
+    """
+    FR:
+    Matrices NumPy de gènes (une par longueur), agrandies de façon amortie. Même
+    interface que GeneIndex ; les candidats retournés sont exactement les gènes
+    à <= max_mutations mutations.
+
+    EN:
+    NumPy gene matrices (one per length), grown in an amortised way. Same interface
+    as GeneIndex; the returned candidates are exactly the genes within max_mutations
+    mutations.
+    """
+
+    def __init__(self, max_mutations: int = 3):
+        """
+        FR: Initialise des matrices vides (NumPy requis).
+        EN: Initializes empty matrices (NumPy required).
+        """
+        if np is None:
+            raise ImportError("GeneMatrix nécessite NumPy.")
+        self.max_mutations = max_mutations
+        self.genes: Dict[str, str] = {}
+        self._order: Dict[str, int] = {}
+        self._added = 0
+        self._rows = {}  # {longueur: [matrice, [gene_id], nombre de lignes]}
+        self._row_of: Dict[str, int] = {}  # {gene_id: ligne dans sa matrice}
+
+    def __len__(self):
+        return len(self.genes)
+
+    def __contains__(self, gene_id):
+        return gene_id in self.genes
+
+    @staticmethod
+    def _codes(sequence: str):
+        try:
+            return np.frombuffer(sequence.encode("latin-1"), dtype=np.uint8)
+        except UnicodeEncodeError:
+            return np.frombuffer(sequence.encode("utf-32-le"), dtype=np.uint32)
+
+    def add(self, gene_id: str, sequence: str) -> None:
+        """
+        FR: Ajoute un gène ; la matrice de sa longueur double de capacité si besoin.
+        EN: Adds a gene; the matrix for its length doubles its capacity when needed.
+        """
+        self.genes[gene_id] = sequence
+        self._order[gene_id] = self._added
+        self._added += 1
+
+        codes = self._codes(sequence)
+        rows = self._rows.get(len(sequence))
+        if rows is None:
+            rows = self._rows[len(sequence)] = [np.zeros((16, len(sequence)), dtype=np.uint8), [], 0]
+        matrix, ids, count = rows
+        if codes.dtype != matrix.dtype and codes.dtype == np.uint32:
+            matrix = matrix.astype(np.uint32)
+        if count == len(matrix):
+            grown = np.zeros((2 * len(matrix), len(sequence)), dtype=matrix.dtype)
+            grown[:count] = matrix[:count]
+            matrix = grown
+        matrix[count] = codes
+        ids.append(gene_id)
+        self._row_of[gene_id] = count
+        rows[0], rows[2] = matrix, count + 1
+
+    def remove(self, gene_id: str) -> None:
+        """
+        FR: Retire un gène : la dernière ligne de sa matrice prend sa place.
+        EN: Removes a gene: the last row of its matrix takes its place.
+        """
+        sequence = self.genes.pop(gene_id)
+        del self._order[gene_id]
+        rows = self._rows[len(sequence)]
+        matrix, ids, count = rows
+        row = self._row_of.pop(gene_id)
+        moved = ids.pop()
+        if moved != gene_id:
+            matrix[row] = matrix[count - 1]
+            ids[row] = moved
+            self._row_of[moved] = row
+        rows[2] = count - 1
+
+    def candidates(self, sequence: str, shift: int = 0) -> List[str]:
+        """
+        FR: Gènes à <= max_mutations mutations (substitutions + écart de longueur) de
+        `sequence`, dans l'ordre d'insertion. Une seule opération vectorisée par longueur.
+        La distance de Hamming ne borne pas une distance d'édition : avec `shift` > 0,
+        seuls les gènes de longueur compatible sont retenus, sans autre filtre.
+        EN: Genes within max_mutations mutations (substitutions + length gap) of
+        `sequence`, in insertion order. One vectorised operation per length.
+        The Hamming distance does not bound an edit distance: with `shift` > 0, only
+        genes of compatible length are kept, without further filtering.
+        """
+        codes = self._codes(sequence)
+        n = len(codes)
+        close = []
+        for length, (matrix, ids, count) in self._rows.items():
+            gap = abs(length - n)
+            if gap > self.max_mutations:
+                continue
+            if shift:
+                close.extend(ids[:count])
+                continue
+            overlap = min(length, n)
+            distances = (matrix[:count, :overlap] != codes[:overlap]).sum(axis=1)
+            close.extend(ids[row] for row in np.flatnonzero(distances <= self.max_mutations - gap).tolist())
+        if len(self._rows) > 1 or len(self._order) < self._added:  # plusieurs longueurs ou lignes déplacées
+            close.sort(key=self._order.__getitem__)
+        return close
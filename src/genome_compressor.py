@@ -29,11 +29,85 @@ DNA-like encoding, and a minimal-mutation strategy.
 Author               : Rakotondravelo Tahina Mickaël
 """
 
+import heapq
 import json
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
 from src.pattern_scanner import PatternScanner
 from src.gene_encoder import GeneEncoder
 from src.mutation_encoder import MutationEncoder
+from src.mutation_ops import MUTATION_FORMAT, MutationOps
+from src.gene_dictionary import DICTIONARY_GENES, GeneDictionary
+from src.gene_index import GeneIndex, GeneMatrix
+from src.reference_index import ReferenceIndex, reference_id, reference_position, resolve_genes
+from src.storage_model import DnaStreamWriter, StorageModel
 
+SEED_GENES = 5  # Nombre de motifs fréquents retenus comme gènes initiaux
+PROGRESS_STEP = 1024  # Blocs encodés entre deux appels du suivi de progression
+MIN_SEGMENT_SIZE = 1 << 16  # Taille minimale d'un segment compressé en parallèle
+GENE_ALPHABETS = ("dna", "raw")  # Forme des gènes initiaux / Form of the seed genes
+EVICTION_POLICIES = ("lru", "lfu", "reset")  # Politiques du dictionnaire borné / Bounded dictionary policies
+EVICTION_FRACTION = 8  # Part du dictionnaire évincée d'un coup (1/8) / Share evicted at once (1/8)
+INDEX_MIN_SEGMENT = 4  # Bases minimales d'un segment de GeneIndex / Minimum bases of a GeneIndex segment
+
+_worker_config: dict = {}  # Réglages du processus worker / Worker process settings
+
+
+def _init_worker(config: dict) -> None:
+    """
+    FR: Initialise un worker de la compression parallèle avec les réglages du
+    compresseur : la référence et le dictionnaire partagés ne sont transmis qu'une
+    fois par processus, et non à chaque segment.
+    EN: Initializes a parallel compression worker with the compressor settings: the
+    shared reference and dictionary are sent once per process, not with every segment.
+    """
+    global _worker_config
+    _worker_config = config
+
+
+def _compress_segment(segment: str) -> dict:
+    """
+    FR: Tâche d'un worker : compresse un segment avec un compresseur séquentiel.
+    EN: Worker task: compresses one segment with a sequential compressor.
+    """
+    return GenomeCompressor(**_worker_config).compress(segment)
+
+
+class _GeneUsage:
+    """
+    FR:
+    Suivi d'utilisation des gènes du dictionnaire borné : date du dernier usage
+    ("lru") ou nombre de correspondances ("lfu"). À score égal, le plus ancien part
+    en premier.
+
+    EN:
+    Usage tracking of the bounded dictionary's genes: time of last use ("lru") or
+    match count ("lfu"). On equal scores, the oldest goes first.
+    """
+
+    def __init__(self, policy: str):
+        self.lru = policy == "lru"
+        self.scores = {}
+        self.clock = 0
+
+    def touch(self, gene_id: str) -> None:
+        """
+        FR: Enregistre un usage (création comprise).
+        EN: Records a use (creation included).
+        """
+        self.clock += 1
+        self.scores[gene_id] = self.clock if self.lru else self.scores.get(gene_id, 0) + 1
+
+    def evict(self, count: int) -> list:
+        """
+        FR: Retire et retourne les `count` gènes les moins utiles.
+        EN: Removes and returns the `count` least useful genes.
+        """
+        victims = heapq.nsmallest(count, self.scores, key=self.scores.__getitem__)
+        for gene_id in victims:
+            del self.scores[gene_id]
+        return victims
 
 
 class GenomeCompressor:
@@ -44,83 +118,576 @@ class GenomeCompressor:
     EN:
     Genomic sequence compressor using frequent motifs and mutation encoding
     """
-    def __init__(self, block_size: int = 8):
+    def __init__(self, block_size: int = 8, scan_method: str = None, use_index: bool = True,
+                 match_mode: str = "best", index_type: str = "pigeonhole", workers: int = 1,
+                 band: int = 0, gene_alphabet: str = "dna", max_genes: int = None, eviction: str = "lru",
+                 reference: ReferenceIndex = None, dictionary: GeneDictionary = None):
         """
         FR:Initialise le compresseur avec une taille de bloc donnée.
+        `scan_method` choisit le moteur du PatternScanner (None = automatique,
+        "suffix-array" pour les chromosomes entiers). `use_index` active l'index
+        de gènes pour la recherche du gène le plus proche : `index_type` vaut
+        "pigeonhole" (GeneIndex) ou "matrix" (GeneMatrix, NumPy).
+        `match_mode` vaut "best" (gène le moins muté) ou "first" (premier gène
+        sous le seuil). `workers` > 1 découpe l'entrée en segments indépendants
+        compressés en parallèle dans un pool de processus. `band` > 0 aligne les
+        blocs sur les gènes (distance d'édition en bande, voir MutationEncoder) pour
+        absorber insertions et suppressions. `gene_alphabet` vaut "dna" (motifs
+        initiaux encodés en ADN par GeneEncoder, 4 bases par caractère) ou "raw"
+        (motifs gardés tels quels, dans l'alphabet des blocs : ils peuvent alors
+        servir de référence, et les conteneurs binaires compactent les gènes A/C/G/T
+        sur 2 bits à la sérialisation). `max_genes` borne le dictionnaire de
+        recherche (None = illimité) ; une fois plein, `eviction` en retire 1/8 :
+        les moins récemment ("lru") ou les moins souvent ("lfu") utilisés, ou le
+        vide entièrement avant de le réamorcer ("reset"). Vitesse et mémoire de la
+        recherche restent ainsi stables sur une entrée de longueur quelconque.
+        Avec `reference` (ReferenceIndex, `block_size` au moins égal à son k), chaque
+        bloc est d'abord cherché dans le génome de référence et encodé en gène
+        virtuel "R<position>" + mutations ;
+        il n'y a pas de gènes initiaux et seuls les blocs absents de la référence
+        deviennent des gènes stockés. Avec `dictionary` (GeneDictionary, voir
+        train_dictionary), les gènes partagés "D<i>" remplacent les gènes initiaux
+        et ne sont pas écrits dans les fichiers, qui notent seulement son empreinte.
         
         EN: Initialize the compressor with a given block size.
+        `scan_method` selects the PatternScanner engine (None = automatic,
+        "suffix-array" for whole chromosomes). `use_index` enables the gene
+        index for the closest-gene lookup: `index_type` is "pigeonhole"
+        (GeneIndex) or "matrix" (GeneMatrix, NumPy).
+        `match_mode` is "best" (least mutated gene) or "first" (first gene under
+        the threshold). `workers` > 1 splits the input into independent segments
+        compressed in parallel in a process pool. `band` > 0 aligns blocks on genes
+        (banded edit distance, see MutationEncoder) to absorb insertions and
+        deletions. `gene_alphabet` is "dna" (seed motifs DNA-encoded by GeneEncoder,
+        4 bases per character) or "raw" (motifs kept as they are, in the block
+        alphabet: they can then serve as references, and binary containers pack
+        A/C/G/T genes on 2 bits at serialisation time). `max_genes` bounds the search
+        dictionary (None = unbounded); once full, `eviction` removes 1/8 of it: the
+        least recently ("lru") or least frequently ("lfu") used genes, or empties it
+        before seeding it again ("reset"). Search speed and memory thus stay flat
+        over an input of any length.
+        With `reference` (ReferenceIndex, `block_size` at least its k), every block is
+        first looked up in the reference genome and encoded as the virtual gene
+        "R<position>" + mutations;
+        there are no seed genes and only the blocks missing from the reference become
+        stored genes. With `dictionary` (GeneDictionary, see train_dictionary), the
+        shared "D<i>" genes replace the seed genes and are not written to files,
+        which only record its digest.
         """
+        if gene_alphabet not in GENE_ALPHABETS:
+            raise ValueError(f"Alphabet de gènes inconnu : {gene_alphabet}")
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError(f"Politique d'éviction inconnue : {eviction}")
         self.block_size = block_size
-        self.pattern_scanner = PatternScanner(min_length=block_size, max_length=block_size)
+        self.use_index = use_index
+        self.match_mode = match_mode
+        self.index_type = index_type
+        self.workers = max(1, workers)
+        self.gene_alphabet = gene_alphabet
+        self.max_genes = max_genes
+        self.eviction = eviction
+        if reference is not None and block_size < reference.k:
+            # Aucun k-mer entier dans le bloc : l'index de la référence ne serait jamais consulté
+            raise ValueError(f"block_size doit être au moins égal à k ({reference.k}) avec une référence.")
+        self.reference = reference
+        self.dictionary = dictionary
+        if max_genes is not None:
+            self._check_max_genes(max_genes)
+        self.pattern_scanner = PatternScanner(min_length=block_size, max_length=block_size, method=scan_method)
         self.gene_encoder = GeneEncoder()
-        self.mutation_encoder = MutationEncoder()
+        self.mutation_encoder = MutationEncoder(band=band)
 
-    def compress(self, raw_sequence: str) -> dict:
+    def compress(self, raw_sequence: str, progress: Callable[[int], None] = None) -> dict:
         """
         FR:
         Compresse une séquence brute d'ADN.
 
         Paramètres:
         - raw_sequence (str): La séquence ADN originale 
+        - progress (callable): Appelé avec le nombre de blocs encodés depuis l'appel
+          précédent (par lots de PROGRESS_STEP blocs), ex. `tqdm.update`
         Retour:
-        - dict: Données compressées incluant les gènes, mutations, et métadonnées.
+        - dict: Données compressées incluant les gènes, mutations (MutationOps), et métadonnées.
+          Les gènes évincés du dictionnaire borné restent dans la sortie, sous des
+          identifiants uniques.
 
 
         EN: Compress a raw DNA sequence.
         Parameters:
         - raw_sequence (str): Original DNA sequence.
+        - progress (callable): Called with the number of blocks encoded since the
+          previous call (in batches of PROGRESS_STEP blocks), e.g. `tqdm.update`
         Returns:
-        - dict: Compressed data including genes, mutations, and metadata.
+        - dict: Compressed data including genes, mutations (MutationOps), and metadata.
+          Genes evicted from the bounded dictionary stay in the output, under unique
+          identifiers.
         """
+        bounds = self._segment_bounds(len(raw_sequence))
+        if len(bounds) > 1:
+            return self._compress_parallel(raw_sequence, bounds, progress)
+
         # Etape 1 : découper en blocs
         blocks = self.pattern_scanner.split_into_blocks(raw_sequence)
 
-        # Etape 2 : détecter motifs fréquents (ici, on choisit top 5 motifs les plus fréquents)
-        top_patterns = self.pattern_scanner.find_frequent_patterns(blocks, top_k=5)
+        # Etape 2 et 3 : motifs fréquents (encodés en ADN, ou bruts si gene_alphabet = "raw")
+        bounded = self.max_genes is not None
+        genes, index, exact, usage = self._new_dictionary(blocks, 0, bounded)
+        all_genes = self._stored_genes(genes)
+        next_id = len(genes)
+
+        # Etape 4 : encoder chaque bloc par mutation par rapport au gène le plus proche
+        compressed_blocks = []
+        start = 0
+        while True:
+            encoded, added, start = self._encode_blocks(blocks, start, genes, index, exact, next_id,
+                                                        self.max_genes, progress=progress, usage=usage)
+            compressed_blocks.extend(encoded)
+            all_genes.update(added)
+            next_id += len(added)
+            if start == len(blocks):
+                break
+            # Dictionnaire plein : les gènes évincés restent dans la sortie
+            if usage is None:
+                genes, index, exact, usage = self._new_dictionary(blocks[start:], next_id, bounded)
+                all_genes.update(self._stored_genes(genes))
+                next_id += len(genes)
+            else:
+                self._evict(genes, index, exact, usage, self.max_genes)
+
+        # Etape 5 : retourner les données compressées
+        metadata = {
+            "original_length": len(raw_sequence),
+            "block_size": self.block_size,
+            "format_version": "1.0",
+            "mutation_format": MUTATION_FORMAT,
+            "gene_alphabet": self.gene_alphabet
+        }
+        if bounded:
+            metadata.update(max_genes=self.max_genes, gene_eviction=self.eviction)
+        self._describe_shared(metadata)
+        return {
+            "genes": resolve_genes(all_genes, metadata),
+            "blocks": compressed_blocks,
+            "metadata": metadata
+        }
+
+    def compress_stream(self, reader, writer, chunk_size: int = 1 << 20, max_genes: int = 65536,
+                        codec: str = "none", progress: Callable[[int], None] = None) -> int:
+        """
+        FR:
+        Compresse un flux texte vers un fichier .dna en flux (v2.1) avec une mémoire
+        bornée : l'entrée est lue par morceaux de `chunk_size` caractères et chaque
+        morceau est écrit en trame dès qu'il est encodé. Le dictionnaire de gènes est
+        borné à `max_genes` gènes : une fois plein, la politique `eviction` du
+        compresseur en retire une partie et les identifiants libérés sont réutilisés
+        (la trame suivante renvoie leur nouvelle séquence), ou bien ("reset") il est
+        réinitialisé puis réamorcé sur le morceau courant. Comme `compress` après `str.strip()`, les blancs en tête et
+        en fin d'entrée sont ignorés.
+
+        Paramètres:
+        - reader: Fichier texte ouvert en lecture
+        - writer: Fichier binaire ouvert en écriture
+        - chunk_size (int): Taille des morceaux lus
+        - max_genes (int): Taille maximale du dictionnaire de gènes
+        - codec (str): Codec entropique des flux (voir EntropyCoder)
+        - progress (callable): Suivi de progression, comme pour `compress`
+        Retour:
+        - int: Longueur de la séquence compressée
+
+        EN:
+        Compresses a text stream into a streaming .dna file (v2.1) with bounded memory:
+        the input is read in chunks of `chunk_size` characters and each chunk is written
+        as a frame as soon as it is encoded. The gene dictionary is bounded to
+        `max_genes` genes: once full, the compressor's `eviction` policy removes part of
+        it and the freed identifiers are reused (the next frame sends their new
+        sequence), or else ("reset") it is emptied then seeded again from the current
+        chunk. As with
+        `compress` after `str.strip()`, leading and trailing whitespace is ignored.
+
+        Parameters:
+        - reader: Text file opened for reading
+        - writer: Binary file opened for writing
+        - chunk_size (int): Size of the chunks read
+        - max_genes (int): Maximum size of the gene dictionary
+        - codec (str): Entropy codec of the streams (see EntropyCoder)
+        - progress (callable): Progress hook, as for `compress`
+        Returns:
+        - int: Length of the compressed sequence
+        """
+        self._check_max_genes(max_genes)
+        chunk_size = max(self.block_size, chunk_size - chunk_size % self.block_size)
+
+        metadata = {"block_size": self.block_size, "mutation_format": MUTATION_FORMAT,
+                    "gene_alphabet": self.gene_alphabet, "max_genes": max_genes, "gene_eviction": self.eviction}
+        self._describe_shared(metadata)
+        stream = DnaStreamWriter(writer, metadata, codec=codec)
+        genes, index, exact, usage = {}, None, {}, None
+        free_ids = []
+        seeded = False
+        next_id = 0
+        total = 0
+        pending = ""
+        started = False
+        while True:
+            chunk = reader.read(chunk_size)
+            if not started:
+                chunk = chunk.lstrip()
+                started = bool(chunk)
+            pending += chunk
+            if chunk:
+                # Les blancs de fin sont retenus : ils ne sont gardés que si la suite n'est pas vide
+                usable = len(pending.rstrip())
+                usable -= usable % self.block_size
+            else:
+                pending = pending.rstrip()
+                usable = len(pending)
+            if usable:
+                data, pending = pending[:usable], pending[usable:]
+                total += usable
+                blocks = self.pattern_scanner.split_into_blocks(data)
+                start = 0
+                while start < len(blocks):
+                    full = len(genes) >= max_genes
+                    reset = not seeded or (full and usage is None)
+                    if reset:
+                        genes, index, exact, usage = self._new_dictionary(blocks[start:], next_id, True)
+                        free_ids = []
+                        seeded = True
+                        next_id += len(genes)
+                    elif full:
+                        # Les identifiants "D<i>" restent attachés au dictionnaire partagé
+                        free_ids.extend(gene_id for gene_id in self._evict(genes, index, exact, usage, max_genes)
+                                        if self.dictionary is None or gene_id not in self.dictionary.genes)
+                    new_genes = self._stored_genes(genes) if reset else {}
+                    encoded, added, start = self._encode_blocks(blocks, start, genes, index, exact, next_id,
+                                                                 max_genes, progress=progress,
+                                                                 usage=usage, free_ids=free_ids)
+                    new_genes.update(added)
+                    next_id += len(added)
+                    stream.write_frame(new_genes, encoded, reset=reset)
+            if not chunk:
+                break
+
+        stream.close({"original_length": total})
+        return total
+
+    def _segment_bounds(self, length: int) -> list:
+        """
+        FR: Bornes (début, fin) des segments : un par worker, alignés sur les blocs et
+        d'au moins MIN_SEGMENT_SIZE caractères.
+        EN: Segment (start, end) bounds: one per worker, aligned on blocks and at least
+        MIN_SEGMENT_SIZE characters long.
+        """
+        size = max(-(-length // self.workers), MIN_SEGMENT_SIZE)
+        size += -size % self.block_size
+        return [(start, min(start + size, length)) for start in range(0, length, size)] or [(0, 0)]
+
+    def _compress_parallel(self, raw_sequence: str, bounds: list, progress: Callable[[int], None] = None) -> dict:
+        """
+        FR:
+        Compresse chaque segment dans un processus avec son propre dictionnaire, puis
+        assemble le résultat. Les identifiants de gènes du segment k sont préfixés par
+        "S{k}_" et metadata["segments"] décrit chaque segment (position dans la
+        séquence, longueur, premier bloc, nombre de blocs).
+
+        EN:
+        Compresses each segment in a process with its own dictionary, then stitches the
+        results together. Gene ids of segment k are prefixed with "S{k}_" and
+        metadata["segments"] describes every segment (offset in the sequence, length,
+        first block, block count).
+        """
+        config = {
+            "block_size": self.block_size,
+            "scan_method": self.pattern_scanner.method,
+            "use_index": self.use_index,
+            "match_mode": self.match_mode,
+            "index_type": self.index_type,
+            "band": self.mutation_encoder.band,
+            "gene_alphabet": self.gene_alphabet,
+            "max_genes": self.max_genes,
+            "eviction": self.eviction,
+            "reference": self.reference,
+            "dictionary": self.dictionary,
+        }
+        genes, blocks, segments = {}, [], []
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(config,)) as pool:
+            futures = [pool.submit(_compress_segment, raw_sequence[start:end]) for start, end in bounds]
+            for k, ((start, end), future) in enumerate(zip(bounds, futures)):
+                part = future.result()
+                prefix = f"S{k}_"
+                genes.update((prefix + gene_id, seq) for gene_id, seq in part["genes"].items())
+                segments.append({
+                    "offset": start,
+                    "length": end - start,
+                    "first_block": len(blocks),
+                    "blocks": len(part["blocks"]),
+                })
+                # Les gènes de référence "R<p>" sont communs à tous les segments
+                blocks.extend({"gene": prefix + block["gene"] if block["gene"] in part["genes"] else block["gene"],
+                               "mutation": block["mutation"]} for block in part["blocks"])
+                if progress is not None:
+                    progress(len(part["blocks"]))
+
+        metadata = {
+            "original_length": len(raw_sequence),
+            "block_size": self.block_size,
+            "format_version": "1.0",
+            "mutation_format": MUTATION_FORMAT,
+            "gene_alphabet": self.gene_alphabet,
+            "segments": segments,
+        }
+        if self.max_genes is not None:
+            metadata.update(max_genes=self.max_genes, gene_eviction=self.eviction)
+        self._describe_shared(metadata)
+        return {
+            "genes": resolve_genes(genes, metadata),
+            "blocks": blocks,
+            "metadata": metadata
+        }
+
+    def train_dictionary(self, samples, size: int = DICTIONARY_GENES) -> GeneDictionary:
+        """
+        FR:
+        Entraîne un dictionnaire de gènes partagé sur des échantillons similaires :
+        les blocs de tous les échantillons sont encodés avec les réglages du
+        compresseur à partir d'un dictionnaire vide, et les `size` gènes les plus
+        utilisés (à égalité, les premiers créés) sont retenus. Le dictionnaire est
+        ensuite passé à GenomeCompressor(dictionary=...) et sauvegardé par
+        GeneDictionary.save / save_to.
+
+        EN:
+        Trains a shared gene dictionary on similar samples: the blocks of every
+        sample are encoded with the compressor settings starting from an empty
+        dictionary, and the `size` most used genes (on ties, the first created) are
+        kept. The dictionary is then passed to GenomeCompressor(dictionary=...) and
+        saved through GeneDictionary.save / save_to.
+        """
+        blocks = [block for sample in samples for block in self.pattern_scanner.split_into_blocks(sample.strip())]
+        genes = {}
+        encoded, _, _ = self._encode_blocks(blocks, 0, genes, self._build_index(genes), {}, 0)
+        uses = Counter(block["gene"] for block in encoded if block["gene"] in genes)
+        return GeneDictionary([genes[gene_id] for gene_id, _ in uses.most_common(size)])
+
+    def _check_max_genes(self, max_genes: int) -> None:
+        """
+        FR: Vérifie que `max_genes` laisse de la place après les gènes initiaux.
+        EN: Checks that `max_genes` leaves room after the seed genes.
+        """
+        if max_genes <= SEED_GENES:
+            raise ValueError(f"max_genes doit être supérieur à {SEED_GENES}.")
+        if self.dictionary is not None and max_genes <= len(self.dictionary):
+            raise ValueError(f"max_genes doit être supérieur à la taille du dictionnaire partagé ({len(self.dictionary)}).")
+
+    def _describe_shared(self, metadata: dict) -> None:
+        """
+        FR: Note dans `metadata` la référence et le dictionnaire partagé utilisés.
+        EN: Records the reference and the shared dictionary used in `metadata`.
+        """
+        if self.reference is not None:
+            metadata["reference"] = self.reference.metadata()
+        if self.dictionary is not None:
+            metadata["dictionary"] = self.dictionary.metadata()
+
+    def _stored_genes(self, genes: dict) -> dict:
+        """
+        FR: Gènes à écrire dans le fichier : tous sauf ceux du dictionnaire partagé.
+        EN: Genes to write to the file: all but those of the shared dictionary.
+        """
+        if self.dictionary is None:
+            return dict(genes)
+        return {gene_id: sequence for gene_id, sequence in genes.items() if gene_id not in self.dictionary.genes}
+
+    def _seed_genes(self, blocks: list, first_id: int) -> dict:
+        """
+        FR: Gènes initiaux : motifs les plus fréquents des blocs (à défaut, les premiers blocs),
+        numérotés à partir de `first_id`. Ce sont les gènes du dictionnaire partagé s'il
+        y en a un, et aucun avec un génome de référence.
+        EN: Seed genes: most frequent patterns of the blocks (failing that, the first blocks),
+        numbered from `first_id`. They are the shared dictionary genes when there is one,
+        and none with a reference genome.
+        """
+        if self.dictionary is not None:
+            return dict(self.dictionary.genes)
+        if self.reference is not None:
+            return {}
+        top_patterns = self.pattern_scanner.find_frequent_patterns(blocks, top_k=SEED_GENES)
 
         # Fallback : si aucun motif fréquent n'est trouvé, prendre les premiers blocs comme motifs
         if not top_patterns:
-            top_patterns = blocks[:min(5, len(blocks))]
+            top_patterns = blocks[:min(SEED_GENES, len(blocks))]
 
-        # Etape 3 : encoder les motifs en ADN (base des gènes)
-        genes = {
-            f"G{i}": self.gene_encoder.encode_motif(pattern)
+        if self.gene_alphabet == "raw":
+            return {f"G{first_id + i}": pattern for i, pattern in enumerate(top_patterns)}
+        return {
+            f"G{first_id + i}": self.gene_encoder.encode_motif(pattern)
             for i, pattern in enumerate(top_patterns)
         }
 
-        # Etape 4 : encoder chaque bloc par mutation par rapport au gène le plus proche
+    def _build_index(self, genes: dict):
+        """
+        FR: Construit l'index de gènes choisi (None si l'index est désactivé).
+        EN: Builds the selected gene index (None when the index is disabled).
+        """
+        if not self.use_index:
+            return None
+        if self.index_type == "matrix":
+            index = GeneMatrix(max_mutations=self.block_size // 2)
+        else:
+            index = GeneIndex(max_mutations=self.block_size // 2, min_segment=INDEX_MIN_SEGMENT)
+        for gene_id, gene_seq in genes.items():
+            index.add(gene_id, gene_seq)
+        return index
+
+    def _match_reference(self, block: str, expected: int):
+        """
+        FR: Cherche `block` dans la référence : d'abord à la position `expected` (suite
+        du dernier bloc trouvé), puis aux positions candidates de l'index. Retourne
+        (identifiant "R<position>", MutationOps) ou (None, None).
+        EN: Looks `block` up in the reference: first at position `expected` (following
+        the last block found), then at the candidate positions of the index. Returns
+        ("R<position>" identifier, MutationOps) or (None, None).
+        """
+        reference = self.reference
+        positions = reference.candidates(block)
+        if 0 <= expected <= len(reference) - len(block):
+            if reference.window(expected, len(block)) == block:
+                return reference_id(expected), MutationOps()
+            positions.insert(0, expected)
+        windows = {reference_id(position): reference.window(position, len(block)) for position in positions}
+        return self.mutation_encoder.find_closest_gene(block, windows, max_mutations=self.block_size // 2,
+                                                       mode=self.match_mode)
+
+    def _new_dictionary(self, blocks: list, first_id: int, bounded: bool):
+        """
+        FR: Dictionnaire amorcé sur `blocks` : (gènes, index, table exacte, suivi d'usage).
+        Le suivi est None sans borne ou avec la politique "reset".
+        EN: Dictionary seeded from `blocks`: (genes, index, exact table, usage tracking).
+        Tracking is None when unbounded or with the "reset" policy.
+        """
+        genes = self._seed_genes(blocks, first_id)
+        usage = None
+        if bounded and self.eviction != "reset":
+            usage = _GeneUsage(self.eviction)
+            for gene_id in genes:
+                usage.touch(gene_id)
+        return genes, self._build_index(genes), self._exact_index(genes), usage
+
+    @staticmethod
+    def _evict(genes: dict, index, exact: dict, usage: _GeneUsage, max_genes: int) -> list:
+        """
+        FR: Retire du dictionnaire actif 1/EVICTION_FRACTION des gènes, choisis par `usage` ;
+        retourne leurs identifiants.
+        EN: Removes 1/EVICTION_FRACTION of the genes from the active dictionary, chosen
+        by `usage`; returns their identifiers.
+        """
+        victims = usage.evict(max(1, max_genes // EVICTION_FRACTION))
+        for gene_id in victims:
+            sequence = genes.pop(gene_id)
+            if index is not None:
+                index.remove(gene_id)
+            if exact.get(sequence) == gene_id:
+                del exact[sequence]
+        return victims
+
+    @staticmethod
+    def _exact_index(genes: dict) -> dict:
+        """
+        FR: Table {séquence: gene_id} des correspondances exactes (premier gène en cas de doublon).
+        EN: {sequence: gene_id} table of exact matches (first gene on duplicates).
+        """
+        exact = {}
+        for gene_id, gene_seq in genes.items():
+            exact.setdefault(gene_seq, gene_id)
+        return exact
+
+    def _encode_blocks(self, blocks: list, start: int, genes: dict, index, exact: dict, next_id: int,
+                       max_genes: int = None, progress: Callable[[int], None] = None,
+                       usage: _GeneUsage = None, free_ids: list = None):
+        """
+        FR:
+        Encode les blocs à partir de `start` contre `genes` (complété au fil de l'eau).
+        Un bloc identique à un gène est résolu par la table `exact` (voir _exact_index,
+        tenue à jour avec `genes`) avant toute recherche approchée, puis, avec une
+        référence, cherché dans le génome de référence (voir _match_reference).
+        S'arrête avant le premier bloc qui exigerait un nouveau gène alors que le
+        dictionnaire compte déjà `max_genes` gènes. `progress` reçoit le nombre de
+        blocs encodés par lots de PROGRESS_STEP. `usage` (si fourni) enregistre chaque
+        gène utilisé ou créé ; un nouveau gène reprend en priorité un identifiant de
+        `free_ids` (libéré par éviction).
+
+        Retour: (blocs encodés, nouveaux gènes, index du prochain bloc à encoder)
+
+        EN:
+        Encodes the blocks from `start` against `genes` (extended along the way). A
+        block identical to a gene is resolved through the `exact` table (see
+        _exact_index, kept in sync with `genes`) before any approximate search, then,
+        with a reference, looked up in the reference genome (see _match_reference). Stops
+        before the first block that would need a new gene while the dictionary already
+        holds `max_genes` genes. `progress` receives the number of encoded blocks in
+        batches of PROGRESS_STEP. `usage` (when given) records every gene used or
+        created; a new gene takes an identifier from `free_ids` (freed by eviction)
+        first.
+
+        Returns: (encoded blocks, new genes, index of the next block to encode)
+        """
         compressed_blocks = []
+        new_genes = {}
         max_allowed_mutations = self.block_size // 2
+        diagonal = 0  # position de référence du bloc courant = diagonal + position * block_size
 
-        for block in blocks:
+        reported = start
+        for position in range(start, len(blocks)):
+            if progress is not None and position - reported >= PROGRESS_STEP:
+                progress(position - reported)
+                reported = position
+            block = blocks[position]
+            gene_id = exact.get(block)
+            if gene_id is not None:
+                if usage is not None:
+                    usage.touch(gene_id)
+                compressed_blocks.append({"gene": gene_id, "mutation": MutationOps()})
+                continue
+            if self.reference is not None and len(block) == self.block_size:
+                gene_id, mutation_ops = self._match_reference(block, diagonal + position * self.block_size)
+                if gene_id is not None:
+                    diagonal = reference_position(gene_id) - position * self.block_size
+                    compressed_blocks.append({"gene": gene_id, "mutation": mutation_ops})
+                    continue
             # Cherche un gène existant proche avec peu de mutations
-            gene_id, mutation_str = self.mutation_encoder.find_closest_gene(
-                block, genes, max_mutations=max_allowed_mutations
+            gene_id, mutation_ops = self.mutation_encoder.find_closest_gene(
+                block, genes, max_mutations=max_allowed_mutations, index=index, mode=self.match_mode
             )
             if gene_id is not None:
+                if usage is not None:
+                    usage.touch(gene_id)
                 compressed_blocks.append({
                     "gene": gene_id,
-                    "mutation": mutation_str
-                })
-            else:
-                # Aucun gène proche : ajouter comme nouveau gène dynamique
-                gene_id = f"G_dyn_{len(genes)}"
-                genes[gene_id] = block
-                compressed_blocks.append({
-                    "gene": gene_id,
-                    "mutation": "-"
+                    "mutation": mutation_ops
                 })
-    
-        # Etape 5 : retourner les données compressées
-        return {
-            "genes": genes,
-            "blocks": compressed_blocks,
-            "metadata": {
-                "original_length": len(raw_sequence),
-                "block_size": self.block_size,
-                "format_version": "1.0"
-            }
-        }
+                continue
+
+            if max_genes is not None and len(genes) >= max_genes:
+                if progress is not None and position > reported:
+                    progress(position - reported)
+                return compressed_blocks, new_genes, position
+
+            # Aucun gène proche : ajouter comme nouveau gène dynamique
+            gene_id = free_ids.pop() if free_ids else f"G_dyn_{next_id + len(new_genes)}"
+            genes[gene_id] = block
+            new_genes[gene_id] = block
+            exact[block] = gene_id
+            if index is not None:
+                index.add(gene_id, block)
+            if usage is not None:
+                usage.touch(gene_id)
+            compressed_blocks.append({
+                "gene": gene_id,
+                "mutation": MutationOps()
+            })
+
+        if progress is not None and len(blocks) > reported:
+            progress(len(blocks) - reported)
+        return compressed_blocks, new_genes, len(blocks)
 
     def save_to_dna(self, compressed_data: dict, filename: str) -> None:
 
@@ -139,7 +706,7 @@ class GenomeCompressor:
         - filename (str): Output filename
         """
         with open(filename, "w") as f:
-            json.dump(compressed_data, f, indent=2)
+            json.dump(compressed_data, f, indent=2, default=StorageModel.json_default)
 
 
 if __name__ == "__main__":
@@ -30,10 +30,19 @@ Author               : Rakotondravelo Tahina Mickaël               :
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from typing import Dict, List
-from src.storage_model import StorageModel
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List
+from src.gene_dictionary import DICTIONARY_PATHS, GeneDictionary
+from src.mapped_store import MAPPED_MAGIC, MappedStore
+from src.mutation_ops import MutationOps, apply_legacy, block_length
+from src.reference_index import ReferenceIndex, resolve_genes
+from src.storage_model import STREAM_MAGIC, DnaStreamReader, StorageModel
 
 SEPARATOR = "|"
+RANGE_BLOCKS = 1 << 16  # Blocs par plage du décodage parallèle / Blocks per parallel decoding range
+BATCH_BLOCKS = 4096  # Blocs décodés par lot / Blocks decoded per batch
+
+_worker_genes: Dict[str, str] = {}  # Gènes du processus worker / Worker process genes
 
 
 class GenomeDecoder:
@@ -46,14 +55,47 @@ class GenomeDecoder:
        decode(data: dict) -> str: Reconstitue la séquence ADN originale.
 
        decode_from_file(filename: str) -> str : lit un fichier .dna et décode la séquence
+
+       iter_decode(source) / decode_to_file(source, output_path) : décodage bloc par bloc
+
+       decode_blocks(genes, blocks) -> str : décode un lot de blocs en une passe
+
+       decode_range(filename, start, end) -> str : décode une région seulement
+
+       load_dictionary(path) : charge un dictionnaire de gènes partagé pour le processus
     EN:
     Class for decoding a compressed DNA sequence from a `.dna` file.
 
     Methods:
        decode(data: dict) -> str: Reconstructs the original DNA sequence.
        decode_from_file(filename: str) -> str: Reads a .dna file and decodes the sequence
+       iter_decode(source) / decode_to_file(source, output_path): block-by-block decoding
+       decode_blocks(genes, blocks) -> str: decodes a batch of blocks in one pass
+       decode_range(filename, start, end) -> str: decodes a region only
+       load_dictionary(path): loads a shared gene dictionary for the process
     """
 
+    @staticmethod
+    def load_dictionary(path: str) -> None:
+        """
+        FR:
+        Rend un dictionnaire de gènes partagé (voir gene_dictionary) disponible pour
+        tous les décodages du processus. Un fichier est lu une seule fois et gardé
+        par empreinte ; un répertoire est ajouté à DICTIONARY_PATHS, où chaque
+        dictionnaire est cherché par empreinte à sa première utilisation.
+
+        EN:
+        Makes a shared gene dictionary (see gene_dictionary) available to every
+        decoding of the process. A file is read only once and kept by digest; a
+        directory is added to DICTIONARY_PATHS, where each dictionary is looked up by
+        digest on first use.
+        """
+        if os.path.isdir(path):
+            if path not in DICTIONARY_PATHS:
+                DICTIONARY_PATHS.append(path)
+        else:
+            GeneDictionary.load(path)
+
     @staticmethod
     def decode(data: Dict) -> str:
         """
@@ -77,28 +119,381 @@ class GenomeDecoder:
           str: Reconstructed original DNA sequence
         """
 
-        genes = data["genes"]
-        blocks = data["blocks"]
+        return GenomeDecoder.decode_blocks(resolve_genes(data["genes"], data["metadata"]), data["blocks"])
 
-        sequence_parts : List[str] = []
+    @staticmethod
+    def iter_decode(source) -> Iterator[str]:
+        """
+        FR:
+        Reconstitue la séquence bloc par bloc, sans jamais la construire en entier.
+
+        Args:
+           source: Données déjà chargées (dict) ou chemin d'un fichier .dna. Pour un
+              fichier en flux (v2.1), seules les trames courantes et le dictionnaire
+              de gènes depuis la dernière réinitialisation sont gardés en mémoire ;
+              un fichier v3 est lu par projection mémoire.
+
+        Yields:
+           str: Séquence reconstituée de chaque bloc, dans l'ordre
+
+        EN:
+        Reconstructs the sequence block by block, without ever building it whole.
+
+        Args:
+          source: Already loaded data (dict) or path of a .dna file. For a streaming
+             file (v2.1), only the current frame and the gene dictionary since the
+             last reset are kept in memory; a v3 file is read through memory mapping.
+
+        Yields:
+          str: Reconstructed sequence of each block, in order
+        """
+        for genes, blocks in GenomeDecoder._iter_batches(source):
+            for block in blocks:
+                yield GenomeDecoder._decode_block(genes[block["gene"]], block["mutation"])
+
+    @staticmethod
+    def _iter_batches(source) -> Iterator[tuple]:
+        """
+        FR: Parcourt `source` (voir iter_decode) par lots (gènes, blocs) : tranches de
+        BATCH_BLOCKS blocs, ou trames d'un fichier en flux.
+        EN: Iterates over `source` (see iter_decode) in (genes, blocks) batches: slices of
+        BATCH_BLOCKS blocks, or the frames of a streaming file.
+        """
+        if isinstance(source, dict):
+            genes, blocks = resolve_genes(source["genes"], source["metadata"]), source["blocks"]
+            for start in range(0, len(blocks), BATCH_BLOCKS):
+                yield genes, blocks[start:start + BATCH_BLOCKS]
+            return
+
+        with open(source, "rb") as f:
+            magic = f.read(len(STREAM_MAGIC))
+            if magic == MAPPED_MAGIC:
+                with MappedStore(source) as store:
+                    genes = _LazyGenes(store)
+                    for start in range(0, len(store), BATCH_BLOCKS):
+                        yield genes, [{"gene": gene_index, "mutation": mutation}
+                                      for gene_index, mutation in store.iter_blocks(start, start + BATCH_BLOCKS)]
+                return
+            if magic == STREAM_MAGIC:
+                f.seek(0)
+                reader = DnaStreamReader(f)
+                genes = {}
+                for new_genes, blocks, reset in reader:
+                    if reset:
+                        genes = resolve_genes({}, reader.metadata)
+                    genes.update(new_genes)
+                    yield genes, blocks
+                return
+
+        yield from GenomeDecoder._iter_batches(StorageModel.load(source))
+
+    @staticmethod
+    def decode_blocks(genes, blocks: List[Dict]) -> str:
+        """
+        FR:
+        Décode un lot de blocs d'un seul tenant : les morceaux de tous les blocs
+        (tranches de gènes et caractères mutés) sont réunis par un unique `join`,
+        sans chaîne intermédiaire par bloc.
+
+        Args:
+           genes: Gènes indexés par la clé `gene` des blocs
+           blocks (list): Blocs {"gene", "mutation"} (MutationOps ou texte)
 
+        EN:
+        Decodes a batch of blocks in one go: the pieces of every block (gene slices
+        and mutated characters) are gathered by a single `join`, without one
+        intermediate string per block.
+
+        Args:
+          genes: Genes indexed by the `gene` key of the blocks
+          blocks (list): {"gene", "mutation"} blocks (MutationOps or text)
+        """
+        parts = []
+        append = parts.append
         for block in blocks:
             gene_seq = genes[block["gene"]]
             mutation = block["mutation"]
-            
+            if isinstance(mutation, MutationOps):
+                if mutation.kinds:
+                    mutation.apply_into(gene_seq, parts)
+                else:
+                    append(gene_seq)
+            else:
+                append(GenomeDecoder._decode_block(gene_seq, mutation))
+        return "".join(parts)
 
-            if not any(x.strip().startswith(("Mut_", "Ins_", "Del_")) for x in mutation.split(SEPARATOR)):
-                sequence_parts.append(gene_seq)
+    @staticmethod
+    def decode_to_file(source, output_path: str, buffer_size: int = 1 << 20, workers: int = 1,
+                       progress: Callable[[int], None] = None) -> int:
+        """
+        FR:
+        Décode `source` (voir iter_decode) directement dans un fichier texte, au travers
+        d'une écriture tamponnée de `buffer_size` octets. Avec `workers` > 1, le décodage
+        est réparti sur un pool de processus (voir _decode_parallel) ; les données sont
+        alors chargées entièrement, sauf si `source` est un fichier binaire indexé ou
+        v3 dont les workers lisent eux-mêmes les blocs (voir _decode_file_parallel).
+        `progress` reçoit le nombre de caractères écrits
+        depuis l'appel précédent.
 
+        Returns:
+           int: Nombre de caractères écrits
+
+        EN:
+        Decodes `source` (see iter_decode) straight into a text file, through a buffered
+        writer of `buffer_size` bytes. With `workers` > 1, decoding is spread over a
+        process pool (see _decode_parallel); the data is then fully loaded, unless
+        `source` is an indexed binary or v3 file whose blocks the workers read
+        themselves (see _decode_file_parallel). `progress` receives the number of
+        characters written since the previous call.
+
+        Returns:
+           int: Number of characters written
+        """
+        if workers > 1:
+            plan = None if isinstance(source, dict) else GenomeDecoder._file_ranges(source)
+            if plan is not None:
+                written = GenomeDecoder._decode_file_parallel(source, plan, output_path, workers, buffer_size)
             else:
-                # Traitement basique placeholder - à adapter selon ton format réel des mutations
+                data = source if isinstance(source, dict) else StorageModel.load(source)
+                written = GenomeDecoder._decode_parallel(data, output_path, workers)
+            if progress is not None:
+                progress(written)
+            return written
+
+        written = reported = 0
+        with open(output_path, "w", encoding="utf-8", buffering=buffer_size) as f:
+            for genes, blocks in GenomeDecoder._iter_batches(source):
+                part = GenomeDecoder.decode_blocks(genes, blocks)
+                f.write(part)
+                written += len(part)
+                if progress is not None and written - reported >= buffer_size:
+                    progress(written - reported)
+                    reported = written
+        if progress is not None and written > reported:
+            progress(written - reported)
+        return written
+
+    @staticmethod
+    def decode_range(filename: str, start: int, end: int) -> str:
+        """
+        FR:
+        Décode uniquement la région [start, end) (positions 0-indexées) d'un fichier .dna.
+        Pour un conteneur binaire indexé, seuls les groupes de blocs couvrant la région
+        sont lus ; sinon les blocs précédents sont parcourus par leur longueur (indels
+        compris) sans être reconstitués.
 
-                mutated_seq = GenomeDecoder.apply_mutation(gene_seq, mutation)
+        Args:
+           filename (str): Chemin vers le fichier .dna
+           start (int): Première position incluse
+           end (int): Dernière position exclue
+
+        Returns:
+           str: Séquence de la région (tronquée à la fin de la séquence)
+
+        EN:
+        Decodes only the region [start, end) (0-based positions) of a .dna file. For an
+        indexed binary container, only the block groups covering the region are read;
+        otherwise the preceding blocks are walked by their length (indels included)
+        without being rebuilt.
+
+        Args:
+           filename (str): Path to the .dna file
+           start (int): First included position
+           end (int): Last excluded position
+
+        Returns:
+           str: Sequence of the region (truncated at the end of the sequence)
+        """
+        if start < 0 or end < start:
+            raise ValueError("La région demandée est invalide.")
+
+        with open(filename, "rb") as f:
+            is_mapped = f.read(len(MAPPED_MAGIC)) == MAPPED_MAGIC
+        if is_mapped:
+            # Position de chaque bloc stockée : dichotomie, puis lecture des seuls blocs utiles
+            with MappedStore(filename) as store:
+                parts: List[str] = []
+                index = store.find_block(start)
+                offset = store.block_offset(index)
+                for gene_index, mutation in store.iter_blocks(index):
+                    if offset >= end:
+                        break
+                    part = GenomeDecoder._decode_block(store.gene(gene_index), mutation)
+                    parts.append(part[max(0, start - offset):end - offset])
+                    offset += len(part)
+                return "".join(parts)
+
+        region = StorageModel.load_region(filename, start, end)
+        if region is None:
+            data, offset = StorageModel.load(filename), 0
+        else:
+            data, offset = region
+
+        genes = data["genes"]
+        parts: List[str] = []
+        for block in data["blocks"]:
+            if offset >= end:
+                break
+            gene_seq = genes[block["gene"]]
+            length = GenomeDecoder.block_length(gene_seq, block["mutation"])
+            if offset + length > start:
+                part = GenomeDecoder._decode_block(gene_seq, block["mutation"])
+                parts.append(part[max(0, start - offset):end - offset])
+            offset += length
+        return "".join(parts)
+
+    @staticmethod
+    def _decode_parallel(data: Dict, output_path: str, workers: int) -> int:
+        """
+        FR:
+        Décodage parallèle sur des plages contiguës de RANGE_BLOCKS blocs :
+        1. le processus principal calcule la longueur de sortie de chaque plage (gènes
+           + indels, sans décoder), d'où sa position dans le fichier par somme cumulée ;
+        2. chaque worker décode ses plages et les écrit à leur position (os.pwrite).
+        Chaque plage n'est ainsi transmise qu'une fois aux workers. Si la sortie n'est pas purement ASCII (positions en caractères != octets) ou si
+        os.pwrite est indisponible, les plages décodées en parallèle sont écrites dans
+        l'ordre par le processus principal.
+
+        EN:
+        Parallel decoding over contiguous ranges of RANGE_BLOCKS blocks:
+        1. the main process computes the output length of every range (genes + indels,
+           without decoding), from which its file offset follows by prefix sum;
+        2. each worker decodes its ranges and writes them at their offset (os.pwrite).
+        Every range is thus sent to the workers only once. When the output is not pure ASCII (character offsets != byte offsets) or
+        os.pwrite is unavailable, the ranges decoded in parallel are written in order by
+        the main process.
+        """
+        genes, blocks = data["genes"], data["blocks"]
+        ranges = [blocks[i:i + RANGE_BLOCKS] for i in range(0, len(blocks), RANGE_BLOCKS)]
+        offsets = []
+        total = 0
+        ascii_only = all(gene_seq.isascii() for gene_seq in genes.values())
+        for blocks_range in ranges:
+            offsets.append(total)
+            length, ascii_range = _range_length(genes, blocks_range)
+            total += length
+            ascii_only = ascii_only and ascii_range
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(genes, GenomeDecoder._shared_sources(data["metadata"]))) as pool:
+            if not hasattr(os, "pwrite") or not ascii_only:
+                with open(output_path, "w", encoding="utf-8") as f:
+                    for text in pool.map(_decode_range, ranges):
+                        f.write(text)
+                return total
+
+            with open(output_path, "wb") as f:
+                f.truncate(total)
+            list(pool.map(_write_range, ranges, offsets, [output_path] * len(ranges)))
+        return total
+
+    @staticmethod
+    def _file_ranges(filename: str):
+        """
+        FR:
+        Découpe un fichier v3 (par RANGE_BLOCKS blocs) ou binaire indexé (par groupes
+        de l'index, environ RANGE_BLOCKS blocs) en plages que les workers lisent
+        eux-mêmes, avec la position de chacune dans la sortie, sans lire les blocs.
+
+        Returns:
+           (dict, bool, list, list) | None: Métadonnées, fichier v3 ou non, bornes
+           (début, fin) des plages (blocs pour v3, positions dans la séquence sinon)
+           et position de chaque plage ; None si le fichier n'est pas découpable ou
+           si os.pwrite est indisponible.
+
+        EN:
+        Splits a v3 file (by RANGE_BLOCKS blocks) or an indexed binary file (by index
+        groups, about RANGE_BLOCKS blocks) into ranges the workers read themselves,
+        with the output offset of each, without reading the blocks.
+
+        Returns:
+           (dict, bool, list, list) | None: Metadata, whether the file is v3, (start,
+           end) range bounds (blocks for v3, sequence offsets otherwise) and offset of
+           each range; None when the file cannot be split or os.pwrite is unavailable.
+        """
+        if not hasattr(os, "pwrite"):
+            return None
+        with open(filename, "rb") as f:
+            is_mapped = f.read(len(MAPPED_MAGIC)) == MAPPED_MAGIC
+        if is_mapped:
+            with MappedStore(filename) as store:
+                bounds = [(first, min(first + RANGE_BLOCKS, len(store))) for first in range(0, len(store), RANGE_BLOCKS)]
+                return store.metadata, True, bounds, [store.block_offset(first) for first, _ in bounds]
+
+        index = StorageModel.load_index(filename)
+        if index is None:
+            return None
+        metadata, entries = index
+        starts = [start for start, _ in entries[::max(1, RANGE_BLOCKS // metadata["block_index"])]]
+        return metadata, False, list(zip(starts, starts[1:] + [sys.maxsize])), starts
+
+    @staticmethod
+    def _decode_file_parallel(filename: str, plan: tuple, output_path: str, workers: int,
+                              buffer_size: int = 1 << 20) -> int:
+        """
+        FR:
+        Décodage parallèle d'un fichier découpé par _file_ranges : chaque worker lit les
+        blocs de ses plages dans le fichier, les décode et les écrit à leur position
+        (os.pwrite) ; le processus principal ne charge pas les blocs. Si une plage
+        n'est pas purement ASCII, le fichier est redécodé séquentiellement.
+
+        EN:
+        Parallel decoding of a file split by _file_ranges: each worker reads the blocks
+        of its ranges from the file, decodes them and writes them at their offset
+        (os.pwrite); the main process does not load the blocks. When a range is not
+        pure ASCII, the file is decoded again sequentially.
+        """
+        metadata, mapped, bounds, offsets = plan
+        count = len(bounds)
+        open(output_path, "wb").close()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=({}, GenomeDecoder._shared_sources(metadata))) as pool:
+            sizes = list(pool.map(_write_file_range, [filename] * count, [mapped] * count,
+                                  [first for first, _ in bounds], [last for _, last in bounds],
+                                  offsets, [output_path] * count))
+        if None in sizes:
+            return GenomeDecoder.decode_to_file(filename, output_path, buffer_size)
+        return sum(sizes)
+
+    @staticmethod
+    def _shared_sources(metadata: dict) -> list:
+        """
+        FR: Génome de référence et dictionnaire partagé chargés dans ce processus dont
+        dépendent les gènes de `metadata`, à transmettre aux workers : un processus
+        lancé par "spawn" ou "forkserver" n'hérite ni des objets chargés ni de
+        DICTIONARY_PATHS.
+        EN: Reference genome and shared dictionary loaded in this process that the genes
+        of `metadata` depend on, to be sent to the workers: a process started by
+        "spawn" or "forkserver" inherits neither the loaded objects nor
+        DICTIONARY_PATHS.
+        """
+        sources = []
+        if "reference" in metadata:
+            sources.append(ReferenceIndex.get(metadata["reference"]["sha256"]))
+        if "dictionary" in metadata:
+            sources.append(GeneDictionary.get(metadata["dictionary"]["sha256"]))
+        return sources
+
+    @staticmethod
+    def block_length(gene_seq: str, mutation: str) -> int:
+        """
+        FR: Longueur de la séquence d'un bloc une fois décodé (voir mutation_ops.block_length).
+        EN: Length of a block's sequence once decoded (see mutation_ops.block_length).
+        """
+        return block_length(gene_seq, mutation)
+
+    @staticmethod
+    def _decode_block(gene_seq: str, mutation: str) -> str:
+        """
+        FR: Séquence d'un bloc : le gène, muté si la description contient des mutations.
+        EN: Sequence of a block: the gene, mutated when the description holds mutations.
+        """
+        if isinstance(mutation, MutationOps):
+            return mutation.apply(gene_seq)
+        if not any(x.strip().startswith(("Mut_", "Ins_", "Del_")) for x in mutation.split(SEPARATOR)):
+            return gene_seq
+        return GenomeDecoder.apply_mutation(gene_seq, mutation)
 
-                sequence_parts.append(mutated_seq)
-        
-        return "".join(sequence_parts)
-    
     @staticmethod
     def apply_mutation(gene_seq: str, mutation: str) -> str:
         """
@@ -106,7 +501,7 @@ class GenomeDecoder:
         Applique une mutation simple à une séquence
         Args:
             gene_seq (str): Séquence d'origine
-            mutation (str): Description de la mutation
+            mutation (str | MutationOps): Description de la mutation
 
         Returns:
             str: Séquence mutée
@@ -116,57 +511,15 @@ class GenomeDecoder:
 
         Args:
           gene_seq (str): Original sequence
-          mutation (str): Mutation description
+          mutation (str | MutationOps): Mutation description
         
         Returns:
           str: Mutated sequence
         """
 
-        # À adapter selon le format réel de mutation. Exemple fictif:
-        # mutation = "sub_2_t" signifie "substituer" la base à l'indice 2 apr T"
-        
-        bases = list(gene_seq)
-
-        mutations = mutation.split(SEPARATOR)
-
-        offset = 0 # Pour suivre les décalages causés par insertions/suppressions
-        
-        for m in mutations:
-            if m == "-":
-                continue
-            elif m.startswith("Mut_"):
-                parts = m.split("_", maxsplit=2)
-                if len(parts) == 3:
-                    _, idx_str, new_base = parts
-                    try:
-                        idx = int(idx_str) + offset
-                        if 0 <= idx < len(bases):
-                            bases[idx] = new_base
-                    except ValueError:
-                        continue
-            elif m.startswith("Ins_"):
-                parts = m.split("_", maxsplit=2)
-                if len(parts) == 3:
-                    _, idx_str, char = parts
-                    try:
-                        idx = int(idx_str) + offset
-                        if 0 <= idx <= len(bases):
-                            bases.insert(idx, char)
-                            offset += 1
-                    except ValueError:
-                        continue
-            elif m.startswith("Del_"):
-                parts = m.split("_", maxsplit=1)
-                if len(parts) == 2:
-                    _, idx_str = parts
-                    try:
-                        idx = int(idx_str) + offset
-                        if 0 <= idx < len(bases):
-                            bases.pop(idx)
-                            offset -= 1
-                    except ValueError:
-                        continue
-        return "".join(bases)
+        if isinstance(mutation, MutationOps):
+            return mutation.apply(gene_seq)
+        return apply_legacy(gene_seq, mutation)
                
 
 
@@ -200,6 +553,107 @@ class GenomeDecoder:
         return GenomeDecoder.decode(data)
     
 
+class _LazyGenes:
+    """
+    FR: Gènes d'un fichier v3 lus à la première demande, indexés par numéro.
+    EN: Genes of a v3 file read on first request, indexed by number.
+    """
+
+    def __init__(self, store: MappedStore):
+        self._store = store
+        self._genes = [None] * (len(store.shared_ids) + store.gene_count)
+
+    def __getitem__(self, index: int) -> str:
+        if index >= len(self._genes):  # gène de référence
+            return self._store.gene(index)
+        gene_seq = self._genes[index]
+        if gene_seq is None:
+            gene_seq = self._genes[index] = self._store.gene(index)
+        return gene_seq
+
+
+def _init_worker(genes: Dict[str, str], sources: list = ()) -> None:
+    """
+    FR: Initialise un worker du décodage parallèle avec le dictionnaire de gènes, et
+    enregistre les sources partagées (voir GenomeDecoder._shared_sources).
+    EN: Initializes a parallel decoding worker with the gene dictionary, and registers
+    the shared sources (see GenomeDecoder._shared_sources).
+    """
+    global _worker_genes
+    for source in sources:
+        source.register()
+    _worker_genes = genes
+
+
+def _range_length(genes: Dict[str, str], blocks: List[Dict]):
+    """
+    FR: Retourne (longueur décodée, mutations purement ASCII) d'une plage de blocs,
+    sans la décoder.
+    EN: Returns (decoded length, pure ASCII mutations) of a range of blocks, without
+    decoding it.
+    """
+    length = 0
+    ascii_only = True
+    for block in blocks:
+        mutation = block["mutation"]
+        length += block_length(genes[block["gene"]], mutation)
+        text = mutation.chars if isinstance(mutation, MutationOps) else mutation
+        ascii_only = ascii_only and text.isascii()
+    return length, ascii_only
+
+
+def _decode_range(blocks: List[Dict]) -> str:
+    """
+    FR: Décode une plage de blocs.
+    EN: Decodes a range of blocks.
+    """
+    return GenomeDecoder.decode_blocks(_worker_genes, blocks)
+
+
+def _write_range(blocks: List[Dict], offset: int, output_path: str) -> None:
+    """
+    FR: Décode une plage de blocs et l'écrit à sa position dans le fichier de sortie.
+    EN: Decodes a range of blocks and writes it at its offset in the output file.
+    """
+    _pwrite(output_path, _decode_range(blocks).encode("ascii"), offset)
+
+
+def _write_file_range(filename: str, mapped: bool, first: int, last: int, offset: int, output_path: str):
+    """
+    FR: Lit une plage de _file_ranges dans le fichier, la décode et l'écrit à sa
+    position dans le fichier de sortie. Retourne le nombre de caractères écrits, ou
+    None (sans rien écrire) si la plage n'est pas purement ASCII.
+    EN: Reads a _file_ranges range from the file, decodes it and writes it at its
+    offset in the output file. Returns the number of characters written, or None
+    (writing nothing) when the range is not pure ASCII.
+    """
+    if mapped:
+        with MappedStore(filename) as store:
+            text = GenomeDecoder.decode_blocks(_LazyGenes(store), [{"gene": gene_index, "mutation": mutation}
+                                                                   for gene_index, mutation in store.iter_blocks(first, last)])
+    else:
+        data, _ = StorageModel.load_region(filename, first, last)
+        text = GenomeDecoder.decode_blocks(data["genes"], data["blocks"])
+    if not text.isascii():
+        return None
+    _pwrite(output_path, text.encode("ascii"), offset)
+    return len(text)
+
+
+def _pwrite(output_path: str, payload: bytes, offset: int) -> None:
+    """
+    FR: Écrit `payload` à la position `offset` du fichier de sortie existant.
+    EN: Writes `payload` at offset `offset` of the existing output file.
+    """
+    fd = os.open(output_path, os.O_WRONLY)
+    try:
+        written = 0
+        while written < len(payload):
+            written += os.pwrite(fd, payload[written:], offset + written)
+    finally:
+        os.close(fd)
+
+
 if __name__ == "__main__":
     # Démonstration basique
 
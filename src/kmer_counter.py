@@ -0,0 +1,155 @@
+# src/kmer_counter.py
+
+#------------------------------------------------------------------------------
+
+# Copyright (c) 2025 Rakotondravelo Tahina Mickaël
+# All rights reserved.
+#
+# This file is part of the GENOME_COMPRESSOR project.
+#
+# licensed under the MIT License. You may obtain a copy of the License at:
+# https://opensource.org/licences/MIT
+#------------------------------------------------------------------------------
+
+"""
+FR:
+Comptage de k-mers compactés sur 2 bits pour les séquences purement nucléotidiques
+(A/C/G/T). Chaque k-mer (k <= 32) est représenté par un entier 64 bits ; avec NumPy
+le comptage se fait par tri (`np.unique`), sinon par dictionnaire d'entiers.
+
+Auteur               : Rakotondravelo Tahina Mickaël
+
+
+EN:
+2-bit packed k-mer counting for pure nucleotide sequences (A/C/G/T). Each k-mer
+(k <= 32) is represented as a 64-bit integer; with NumPy counting is sort-based
+(`np.unique`), otherwise it uses a dictionary of integers.
+
+Author               : Rakotondravelo Tahina Mickaël
+"""
+
+from src.utils import NUCLEOTIDES, is_nucleotide_sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel / NumPy is optional
+    np = None
+
+
+MAX_PACKED_K = 32
+_CODES = {ord(base): code for code, base in enumerate(NUCLEOTIDES)}
+
+
+class PackedKmerCounter:
+    """
+    FR : Compteur de k-mers A/C/G/T encodés sur 2 bits par base.
+    EN : Counter of A/C/G/T k-mers encoded on 2 bits per base.
+    """
+
+    def __init__(self, k: int):
+        """
+        FR: Initialise le compteur pour des k-mers de longueur `k` (1 <= k <= 32).
+        EN: Initializes the counter for k-mers of length `k` (1 <= k <= 32).
+        """
+        if not 1 <= k <= MAX_PACKED_K:
+            raise ValueError(f"k doit être compris entre 1 et {MAX_PACKED_K}.")
+        self.k = k
+        self.mask = (1 << (2 * k)) - 1
+
+    @staticmethod
+    def accepts(data: str) -> bool:
+        """
+        FR: Indique si `data` ne contient que des bases A, C, G, T.
+        EN: Tells whether `data` only contains A, C, G, T bases.
+        """
+        return is_nucleotide_sequence(data)
+
+    def pack(self, kmer: str) -> int:
+        """
+        FR: Encode un k-mer en entier (2 bits par base).
+        EN: Packs a k-mer into an integer (2 bits per base).
+        """
+        value = 0
+        for base in kmer:
+            value = (value << 2) | _CODES[ord(base)]
+        return value
+
+    def unpack(self, value: int) -> str:
+        """
+        FR: Décode un entier en k-mer.
+        EN: Unpacks an integer back into a k-mer.
+        """
+        return "".join(NUCLEOTIDES[(value >> (2 * shift)) & 3] for shift in range(self.k - 1, -1, -1))
+
+    def count(self, data: str, min_count: int = 1, use_numpy: bool = None) -> dict:
+        """
+        FR:
+        Compte les k-mers d'une séquence A/C/G/T.
+
+        :param data: Séquence nucléotidique (voir `accepts`)
+        :param min_count: Fréquence minimale des k-mers retournés
+        :param use_numpy: Force (True) ou interdit (False) NumPy ; None = automatique
+        :return: Dictionnaire {k-mer: fréquence}, par ordre de première occurrence
+
+        EN:
+        Counts the k-mers of an A/C/G/T sequence.
+
+        :param data: Nucleotide sequence (see `accepts`)
+        :param min_count: Minimum frequency of the returned k-mers
+        :param use_numpy: Force (True) or forbid (False) NumPy; None = automatic
+        :return: Dictionary {k-mer: frequency}, in first-occurrence order
+        """
+        if len(data) < self.k:
+            return {}
+        if use_numpy is None:
+            use_numpy = np is not None
+        if use_numpy:
+            if np is None:
+                raise ImportError("NumPy n'est pas installé.")
+            return self._count_numpy(data, min_count)
+        return self._count_python(data, min_count)
+
+    def _count_python(self, data: str, min_count: int) -> dict:
+        """
+        FR: Fenêtre glissante sur un entier, comptage dans un dictionnaire d'entiers.
+        EN: Sliding window over an integer, counting in a dictionary of integers.
+        """
+        k, mask = self.k, self.mask
+        counts = {}
+        value = 0
+        for i, byte in enumerate(data.encode("ascii")):
+            value = ((value << 2) | _CODES[byte]) & mask
+            if i >= k - 1:
+                counts[value] = counts.get(value, 0) + 1
+
+        return {self.unpack(value): freq for value, freq in counts.items() if freq >= min_count}
+
+    def window_values(self, data: str):
+        """
+        FR: Tableau NumPy des k-mers compactés de toutes les fenêtres de `data` (len(data) >= k).
+        EN: NumPy array of the packed k-mers of every window of `data` (len(data) >= k).
+        """
+        k = self.k
+        table = np.zeros(256, dtype=np.uint64)
+        for byte, code in _CODES.items():
+            table[byte] = code
+        codes = table[np.frombuffer(data.encode("ascii"), dtype=np.uint8)]
+        windows = len(codes) - k + 1
+
+        values = np.zeros(windows, dtype=np.uint64)
+        two = np.uint64(2)
+        for j in range(k):
+            values = (values << two) | codes[j:j + windows]
+        return values
+
+    def _count_numpy(self, data: str, min_count: int) -> dict:
+        """
+        FR: Valeurs de toutes les fenêtres calculées en bloc, histogramme par tri.
+        EN: All window values computed in bulk, sort-based histogram.
+        """
+        k = self.k
+        values = self.window_values(data)
+        _, first, counts = np.unique(values, return_index=True, return_counts=True)
+        kept = np.flatnonzero(counts >= min_count)
+        kept = kept[np.argsort(first[kept], kind="stable")]
+        return {data[pos:pos + k]: freq for pos, freq in zip(first[kept].tolist(), counts[kept].tolist())}
@@ -0,0 +1,318 @@
+# src/mapped_store.py
+
+#------------------------------------------------------------------------------
+
+# Copyright (c) 2025 Rakotondravelo Tahina Mickaël
+# All rights reserved.
+#
+# This file is part of the GENOME_COMPRESSOR project.
+#
+# licensed under the MIT License. You may obtain a copy of the License at:
+# https://opensource.org/licences/MIT
+#------------------------------------------------------------------------------
+
+"""
+FR:
+Conteneur .dna à tables de largeur fixe (v3), lu par projection mémoire (mmap).
+
+- en-tête : signature b"DNA\x03", métadonnées JSON, puis les effectifs et tailles
+  des zones (taille fixe)
+- table des gènes et table des identifiants : position de fin (u64) de chaque
+  séquence / identifiant dans leur zone de données
+- table des blocs : un enregistrement de 20 octets par bloc (index du gène u32,
+  fin de la mutation u64, fin du bloc dans la séquence décodée u64) ; l'index du
+  gène compte d'abord les gènes du dictionnaire partagé (voir gene_dictionary),
+  puis ceux de la table ; au-delà, il désigne un gène de référence (voir
+  reference_index)
+- zones de données : séquences, identifiants, mutations (vide sans mutation) ;
+  au format d'opérations, chaque mutation est l'enregistrement binaire de ses
+  opérations (voir MutationOps.write_to), relu sans analyse de texte, sauf dans
+  les fichiers 3.0 qui les gardent sous leur forme texte
+
+L'ouverture ne lit que l'en-tête ; gènes et blocs sont lus à la demande, sous forme
+de vues `memoryview` sans copie, et seules les pages touchées sont chargées. La
+position de chaque bloc dans la séquence décodée permet l'accès direct à une région
+par recherche dichotomique.
+
+Auteur               : Rakotondravelo Tahina Mickaël
+
+
+EN:
+Fixed-width table .dna container (v3), read through memory mapping (mmap).
+
+- header: b"DNA\x03" signature, JSON metadata, then the counts and sizes of the
+  areas (fixed size)
+- gene table and id table: end offset (u64) of each sequence / identifier in its
+  data area
+- block table: one 20-byte record per block (gene index u32, mutation end u64,
+  block end in the decoded sequence u64); the gene index first counts the genes of
+  the shared dictionary (see gene_dictionary), then those of the table; past
+  them, it names a reference gene (see reference_index)
+- data areas: sequences, identifiers, mutations (empty without mutation); in
+  operation format, each mutation is the binary record of its operations (see
+  MutationOps.write_to), read back without text parsing, except in 3.0 files that
+  keep them in text form
+
+Opening only reads the header; genes and blocks are read on demand, as zero-copy
+`memoryview` views, and only the touched pages are loaded. The offset of each block
+in the decoded sequence allows direct access to a region by binary search.
+
+Author               : Rakotondravelo Tahina Mickaël
+"""
+
+import json
+import mmap
+import struct
+from typing import Iterator, List, Tuple
+
+from src.gene_dictionary import shared_ids
+from src.mutation_ops import MUTATION_FORMAT, MutationOps, block_length
+from src.reference_index import reference_id, reference_position, resolve_genes
+
+MAPPED_MAGIC = b"DNA\x03"
+TEXT_VERSION = "3.0"  # Version dont les mutations sont en texte / Version with text mutations
+
+_LENGTH = struct.Struct("<Q")
+_COUNTS = struct.Struct("<IQQQQ")  # gènes, blocs, zone gènes, zone identifiants, zone mutations
+_OFFSET = struct.Struct("<Q")
+_BLOCK = struct.Struct("<IQQ")  # gène, fin de mutation, fin du bloc décodé
+
+
+class MappedStore:
+    """
+    FR:
+    Lecteur paresseux d'un fichier .dna v3 projeté en mémoire. Les vues retournées
+    restent valides jusqu'à `close()`.
+
+    EN:
+    Lazy reader of a memory-mapped v3 .dna file. The returned views stay valid until
+    `close()`.
+    """
+
+    def __init__(self, filename: str):
+        """
+        FR: Projette le fichier et lit son en-tête.
+        EN: Maps the file and reads its header.
+
+        Raises:
+          ValueError: Si le fichier n'est pas un .dna v3 valide / If the file is not a valid v3 .dna.
+        """
+        with open(filename, "rb") as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:  # fichier vide
+                raise ValueError("Le fichier .dna est invalide ou corrompu.") from e
+        try:
+            if self._map[:len(MAPPED_MAGIC)] != MAPPED_MAGIC:
+                raise ValueError("Le fichier .dna est invalide ou corrompu.")
+            pos = len(MAPPED_MAGIC)
+            (length,) = _LENGTH.unpack_from(self._map, pos)
+            pos += _LENGTH.size
+            self.metadata = json.loads(self._map[pos:pos + length].decode("utf-8"))
+            pos += length
+            gene_count, block_count, gene_size, id_size, mutation_size = _COUNTS.unpack_from(self._map, pos)
+            pos += _COUNTS.size
+        except (struct.error, UnicodeDecodeError, json.JSONDecodeError) as e:
+            self._map.close()
+            raise ValueError("Le fichier .dna est invalide ou corrompu.") from e
+
+        self.gene_count = gene_count
+        self.block_count = block_count
+        self._gene_table = pos
+        self._id_table = self._gene_table + gene_count * _OFFSET.size
+        self._block_table = self._id_table + gene_count * _OFFSET.size
+        self._gene_heap = self._block_table + block_count * _BLOCK.size
+        self._id_heap = self._gene_heap + gene_size
+        self._mutation_heap = self._id_heap + id_size
+        if self._mutation_heap + mutation_size != len(self._map):
+            self._map.close()
+            raise ValueError("Le fichier .dna est invalide ou corrompu.")
+
+        self._view = memoryview(self._map)
+        self._gene_ids = None
+        self._references = resolve_genes({}, self.metadata)
+        self.shared_ids = shared_ids(self.metadata)
+        self._ops = self.metadata.get("mutation_format") == MUTATION_FORMAT
+        self._records = self._ops and self.metadata.get("format_version") != TEXT_VERSION
+
+    def __len__(self):
+        return self.block_count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        try:
+            self.close()
+        except BufferError:
+            # Vues encore référencées par l'exception en cours : ne pas la masquer
+            if exc_type is None:
+                raise
+
+    def close(self) -> None:
+        """
+        FR: Libère la projection (les vues encore référencées l'en empêchent).
+        EN: Releases the mapping (views still referenced prevent it).
+        """
+        self._view.release()
+        self._map.close()
+
+    def _span(self, table: int, heap: int, index: int) -> Tuple[int, int]:
+        start = _OFFSET.unpack_from(self._map, table + (index - 1) * _OFFSET.size)[0] if index else 0
+        end = _OFFSET.unpack_from(self._map, table + index * _OFFSET.size)[0]
+        return heap + start, heap + end
+
+    def gene_view(self, index: int) -> memoryview:
+        """
+        FR: Vue sans copie sur la séquence (UTF-8) du gène numéro `index`.
+        EN: Zero-copy view of the (UTF-8) sequence of gene number `index`.
+        """
+        start, end = self._span(self._gene_table, self._gene_heap, index)
+        return self._view[start:end]
+
+    def gene(self, index: int) -> str:
+        """
+        FR: Séquence du gène d'index `index` dans les blocs : dictionnaire partagé, puis
+        table (voir gene_view), puis référence.
+        EN: Sequence of the gene with block index `index`: shared dictionary, then table
+        (see gene_view), then reference.
+        """
+        shared = len(self.shared_ids)
+        if index < shared:
+            return self._references[self.shared_ids[index]]
+        index -= shared
+        if index >= self.gene_count:
+            return self._references[reference_id(index - self.gene_count)]
+        return str(self.gene_view(index), "utf-8")
+
+    def gene_ids(self) -> List[str]:
+        """
+        FR: Identifiants des gènes, dans l'ordre de la table (lus au premier appel).
+        EN: Gene identifiers, in table order (read on first call).
+        """
+        if self._gene_ids is None:
+            self._gene_ids = []
+            for index in range(self.gene_count):
+                start, end = self._span(self._id_table, self._id_heap, index)
+                self._gene_ids.append(str(self._view[start:end], "utf-8"))
+        return self._gene_ids
+
+    def _mutation_span(self, index: int) -> Tuple[int, int]:
+        start = _BLOCK.unpack_from(self._map, self._block_table + (index - 1) * _BLOCK.size)[1] if index else 0
+        end = _BLOCK.unpack_from(self._map, self._block_table + index * _BLOCK.size)[1]
+        return self._mutation_heap + start, self._mutation_heap + end
+
+    def mutation_view(self, index: int) -> memoryview:
+        """
+        FR: Vue sans copie sur la mutation du bloc `index` (vide si aucune) : texte, ou
+        enregistrement binaire des opérations.
+        EN: Zero-copy view of the mutation of block `index` (empty if none): text, or
+        binary record of the operations.
+        """
+        start, end = self._mutation_span(index)
+        return self._view[start:end]
+
+    def block(self, index: int):
+        """
+        FR: Retourne (index du gène, mutation) du bloc `index` : MutationOps si le fichier
+        est au format d'opérations, sinon texte ("-" sans mutation).
+        EN: Returns (gene index, mutation) of block `index`: MutationOps when the file is
+        in operation format, otherwise text ("-" without mutation).
+        """
+        if not 0 <= index < self.block_count:
+            raise IndexError(index)
+        gene_index = _BLOCK.unpack_from(self._map, self._block_table + index * _BLOCK.size)[0]
+        if self._records:
+            start, end = self._mutation_span(index)
+            if start == end:
+                return gene_index, MutationOps()
+            try:
+                ops, pos = MutationOps.read_from(self._map, start)
+                if pos != end:
+                    raise IndexError("enregistrement de mutation incohérent")
+            except (IndexError, UnicodeDecodeError) as e:
+                raise ValueError("Le fichier .dna est invalide ou corrompu.") from e
+            return gene_index, ops
+        # Vue libérée avant l'analyse : une erreur ne doit pas bloquer close()
+        with self.mutation_view(index) as view:
+            mutation = str(view, "utf-8") if len(view) else "-"
+        return gene_index, (MutationOps.from_string(mutation) if self._ops else mutation)
+
+    def iter_blocks(self, start: int = 0, stop: int = None) -> Iterator[tuple]:
+        """
+        FR: Parcourt les blocs [start, stop) sous la forme (index du gène, mutation).
+        EN: Iterates over blocks [start, stop) as (gene index, mutation).
+        """
+        stop = self.block_count if stop is None else min(stop, self.block_count)
+        for index in range(start, stop):
+            yield self.block(index)
+
+    def block_offset(self, index: int) -> int:
+        """
+        FR: Position du bloc `index` dans la séquence décodée (longueur totale si index = len).
+        EN: Offset of block `index` in the decoded sequence (total length if index = len).
+        """
+        if index == 0:
+            return 0
+        return _BLOCK.unpack_from(self._map, self._block_table + (index - 1) * _BLOCK.size)[2]
+
+    def find_block(self, position: int) -> int:
+        """
+        FR: Index du bloc contenant `position` de la séquence décodée (dichotomie).
+        EN: Index of the block holding `position` of the decoded sequence (binary search).
+        """
+        low, high = 0, self.block_count
+        while low < high:
+            middle = (low + high) // 2
+            if self.block_offset(middle + 1) <= position:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    @staticmethod
+    def encode(data: dict) -> bytes:
+        """
+        FR: Sérialise les données compressées dans le conteneur v3 à tables fixes.
+        EN: Serializes the compressed data into the fixed-table v3 container.
+        """
+        genes = resolve_genes(data["genes"], data["metadata"])
+        positions = {gene_id: index for index, gene_id in enumerate(shared_ids(data["metadata"]) + list(genes))}
+
+        gene_heap, id_heap, mutation_heap = bytearray(), bytearray(), bytearray()
+        gene_table, id_table, block_table = bytearray(), bytearray(), bytearray()
+        for gene_id, sequence in genes.items():
+            gene_heap += sequence.encode("utf-8")
+            gene_table += _OFFSET.pack(len(gene_heap))
+            id_heap += gene_id.encode("utf-8")
+            id_table += _OFFSET.pack(len(id_heap))
+
+        ops = data["metadata"].get("mutation_format") == MUTATION_FORMAT
+        output = 0
+        for block in data["blocks"]:
+            mutation = block["mutation"] or "-"
+            if ops and not isinstance(mutation, MutationOps):
+                mutation = MutationOps.from_string(mutation)
+            # Longueur lue sur les opérations : leur forme texte est ambiguë avec "|"
+            output += block_length(genes[block["gene"]], mutation)
+            if ops:
+                if mutation:
+                    mutation.write_to(mutation_heap)
+            else:
+                if isinstance(mutation, MutationOps):
+                    mutation = mutation.to_string()
+                if mutation != "-":
+                    mutation_heap += mutation.encode("utf-8")
+            gene_index = positions.get(block["gene"])
+            if gene_index is None:
+                gene_index = len(positions) + reference_position(block["gene"])
+            block_table += _BLOCK.pack(gene_index, len(mutation_heap), output)
+
+        metadata = json.dumps(data["metadata"]).encode("utf-8")
+        out = bytearray(MAPPED_MAGIC)
+        out += _LENGTH.pack(len(metadata))
+        out += metadata
+        out += _COUNTS.pack(len(genes), len(data["blocks"]), len(gene_heap), len(id_heap), len(mutation_heap))
+        for part in (gene_table, id_table, block_table, gene_heap, id_heap, mutation_heap):
+            out += part
+        return bytes(out)
@@ -11,6 +11,7 @@
 # https://opensource.org/licences/MIT
 #------------------------------------------------------------------------------
 
+from src.mutation_ops import OP_DEL, OP_INS, OP_MUT, MutationOps, apply_legacy
 
 SEPARATOR = "|" # Séparateur plus sûr que la virgule pour les mutations
 
@@ -23,6 +24,11 @@ class MutationEncoder:
     - Insertion    : Ins_i_X
     - Suppression  : Del_i
 
+    Par défaut les séquences sont comparées position par position. Avec `band` > 0,
+    elles sont alignées (distance d'édition, programmation dynamique limitée à une
+    bande de `band` diagonales de part et d'autre) : une base insérée ne coûte alors
+    qu'une insertion au lieu de décaler toutes les suivantes en substitutions.
+
     Auteur            : Rakotondravelo Tahina Mickaël
 
 
@@ -34,17 +40,20 @@ class MutationEncoder:
     - Insertion    : Ins_i_X
     - Deletion     : Del_i
 
+    By default sequences are compared position by position. With `band` > 0, they
+    are aligned (edit distance, dynamic programming restricted to a band of `band`
+    diagonals on either side): an inserted base then costs a single insertion instead
+    of shifting every following base into substitutions.
+
     Author               : Rakotondravelo Tahina Mickaël
     """ 
-    def __init__(self):
+    def __init__(self, band: int = 0):
         """
         
-        FR : Initialise un objet MutationEncoder.
-        EN : Initializes a MutationEncoder object.
+        FR : Initialise un objet MutationEncoder ; `band` > 0 active l'alignement en bande.
+        EN : Initializes a MutationEncoder object; `band` > 0 enables banded alignment.
         """
-        # Variables à définir selon la logique du projet
-        # Aucune donnée specifique à initialiser pour l'instant
-        pass
+        self.band = max(0, band)
 
     def encode_mutation(self, gene_sequence, reference_gene_sequence):
         """
@@ -98,6 +107,106 @@ class MutationEncoder:
                
           
 
+    def encode_ops(self, gene_sequence, reference_gene_sequence):
+        """
+        FR:
+        Encode les mutations sous forme structurée et creuse (voir MutationOps), sans
+        marqueur pour les positions identiques.
+
+        Retour:
+        - MutationOps: Opérations transformant la référence en `gene_sequence`.
+
+        EN:
+        Encodes the mutations in structured, sparse form (see MutationOps), without
+        placeholders for identical positions.
+
+        Returns:
+        - MutationOps: Operations turning the reference into `gene_sequence`.
+        """
+        if self.band and abs(len(gene_sequence) - len(reference_gene_sequence)) <= self.band:
+            rows = self._align(gene_sequence, reference_gene_sequence, self.band)
+            return self._traceback(gene_sequence, reference_gene_sequence, self.band, rows)
+        return MutationOps.diff(gene_sequence, reference_gene_sequence)
+
+    @staticmethod
+    def _align(gene_sequence, reference_gene_sequence, band, limit=None):
+        """
+        FR:
+        Distance d'édition en bande : ligne i = préfixe de la référence, cellule
+        j - i + band = préfixe de la séquence. Chaque ligne a une cellule de plus,
+        toujours infinie, qui sert de bord (index band * 2 + 1 et -1).
+
+        Retour:
+        - list: Lignes de la table, ou None dès qu'une ligne dépasse `limit`.
+
+        EN:
+        Banded edit distance: row i = reference prefix, cell j - i + band = sequence
+        prefix. Every row has one extra, always infinite cell used as the edge (index
+        band * 2 + 1 and -1).
+
+        Returns:
+        - list: Table rows, or None as soon as a row exceeds `limit`.
+        """
+        n = len(gene_sequence)
+        width = 2 * band + 1
+        infinite = n + len(reference_gene_sequence) + 1
+
+        row = [infinite] * (width + 1)
+        for j in range(min(band, n) + 1):
+            row[j + band] = j
+        rows = [row]
+        for i, base in enumerate(reference_gene_sequence, 1):
+            previous = row
+            row = [infinite] * (width + 1)
+            lowest = infinite
+            first = max(0, i - band)
+            k = first - i + band
+            for j in range(first, min(n, i + band) + 1):
+                best = previous[k + 1] + 1
+                if j:
+                    cost = previous[k] + (base != gene_sequence[j - 1])
+                    if cost < best:
+                        best = cost
+                    cost = row[k - 1] + 1
+                    if cost < best:
+                        best = cost
+                row[k] = best
+                if best < lowest:
+                    lowest = best
+                k += 1
+            if limit is not None and lowest > limit:
+                return None
+            rows.append(row)
+        return rows
+
+    @staticmethod
+    def _traceback(gene_sequence, reference_gene_sequence, band, rows):
+        """
+        FR: Remonte la table de _align ; opérations en coordonnées de la référence, dans
+        l'ordre canonique (substitutions préférées aux paires insertion/suppression).
+        EN: Walks back the _align table; operations in reference coordinates, in
+        canonical order (substitutions preferred over insertion/deletion pairs).
+        """
+        ops = []
+        i, j = len(reference_gene_sequence), len(gene_sequence)
+        while i or j:
+            k = j - i + band
+            cost = rows[i][k]
+            if i and j and rows[i - 1][k] + (reference_gene_sequence[i - 1] != gene_sequence[j - 1]) == cost:
+                if reference_gene_sequence[i - 1] != gene_sequence[j - 1]:
+                    ops.append((OP_MUT, i - 1, gene_sequence[j - 1]))
+                i -= 1
+                j -= 1
+            elif i and rows[i - 1][k + 1] + 1 == cost:
+                ops.append((OP_DEL, i - 1, ""))
+                i -= 1
+            else:
+                ops.append((OP_INS, i, gene_sequence[j - 1]))
+                j -= 1
+        ops.reverse()
+        return MutationOps([kind for kind, _, _ in ops], [position for _, position, _ in ops],
+                           "".join(char for _, _, char in ops))
+
     def compare_blocks(self, block1, block2):
         """
         FR:
@@ -130,7 +239,7 @@ class MutationEncoder:
 
         Paramètres:
         - original_sequence (str): La séquence de base (référence).
-        - mutation_sequence (str): La séquence de  mutations (ex: "Mut_2_a,Ins_3_,).
+        - mutation_sequence (str | MutationOps): La séquence de  mutations (ex: "Mut_2_a,Ins_3_,).
         pour remplacer le 1er caractere par 'c').
 
         Retour:
@@ -141,51 +250,155 @@ class MutationEncoder:
 
         Parameters:
         - original_sequence (str): Reference DNA sequence.
-        - mutation_sequence (str): Mutation sequence (e.g./ "Mut_2_a", "Ins_3_c").
+        - mutation_sequence (str | MutationOps): Mutation sequence (e.g./ "Mut_2_a", "Ins_3_c").
 
         Returns:
         - str: Modified DNA sequence
         """
-
-        sequence = list(original_sequence)
-        mutations = mutation_sequence.split(SEPARATOR)
-        
-
-        offset = 0  # Pour suivre le déplacement causé par insertions/suppressions
-
-        for m in mutations:
-            if m == "-":
-                continue
-            elif m.startswith("Mut_"):
-                try:
-                    _, idx_str, new_char = m.split("_", maxsplit=2)
-                    idx = int(idx_str) + offset
-                    if 0 <= idx < len(sequence):
-                        sequence[idx] = new_char
-                except ValueError:
-                    continue # Mutation mal formée, on ignore
-            elif m.startswith("Ins_"):
-                try:
-                    _, idx_str, char = m.split("_", maxsplit=2)
-                    idx = int(idx_str) + offset
-                    sequence.insert(idx, char)
-                    offset += 1
-                except ValueError:
-                    continue
-            elif m.startswith("Del_"):
-                try:
-                    _, idx_str = m.split("_", maxsplit=1)
-                    idx = int(idx_str) + offset
-                    if 0 <= idx < len(sequence):
-                        sequence.pop(idx)
-                        offset -= 1
-                except ValueError:
-                    continue
-        return "".join(sequence)
+        if isinstance(mutation_sequence, MutationOps):
+            return mutation_sequence.apply(original_sequence)
+        # Règle historique : une insertion hors limites est ajoutée (list.insert)
+        return apply_legacy(original_sequence, mutation_sequence, insert_anywhere=True)
                 
             
 
-    def find_closest_gene(self, new_sequence, known_genes, max_mutations=3):
+    @staticmethod
+    def pattern_masks(sequence):
+        """
+        FR: Masques de positions de chaque caractère de `sequence` (bit i = position i),
+        à calculer une fois par bloc pour edit_distance.
+        EN: Position masks of every character of `sequence` (bit i = position i), to be
+        computed once per block for edit_distance.
+        """
+        masks = {}
+        for i, char in enumerate(sequence):
+            masks[char] = masks.get(char, 0) | (1 << i)
+        return masks
+
+    @staticmethod
+    def edit_distance(gene_sequence, reference_gene_sequence, limit=None, masks=None):
+        """
+        FR:
+        Distance d'édition (Levenshtein, sans bande) par vecteurs de bits (Myers /
+        Hyyrö) : une colonne de la table par caractère de la référence, en une dizaine
+        d'opérations sur des entiers. Un bloc tient dans un mot machine aux tailles
+        usuelles ; les entiers Python couvrent les blocs plus longs.
+
+        Paramètres:
+        - masks (dict, optionnel): pattern_masks(gene_sequence), réutilisable
+        - limit (int, optionnel): Arrêt dès que la distance dépasse forcément `limit`
+
+        Retour:
+        - int: Distance d'édition (ou une valeur > limit si le seuil est dépassé).
+
+        EN:
+        Edit distance (Levenshtein, unbanded) with bit vectors (Myers / Hyyrö): one
+        column of the table per reference character, in about ten integer operations.
+        A block fits in a machine word at usual sizes; Python integers cover longer
+        blocks.
+
+        Parameters:
+        - masks (dict, optional): pattern_masks(gene_sequence), reusable
+        - limit (int, optional): Stops as soon as the distance must exceed `limit`
+
+        Returns:
+        - int: Edit distance (or a value > limit when the threshold is exceeded).
+        """
+        m = len(gene_sequence)
+        remaining = len(reference_gene_sequence)
+        if not m:
+            return remaining
+        if masks is None:
+            masks = MutationEncoder.pattern_masks(gene_sequence)
+
+        full = (1 << m) - 1
+        high = 1 << (m - 1)
+        vp, vn = full, 0
+        score = m
+        for char in reference_gene_sequence:
+            eq = masks.get(char, 0)
+            xv = eq | vn
+            xh = (((eq & vp) + vp) ^ vp) | eq
+            hp = vn | (~(xh | vp) & full)
+            hn = vp & xh
+            if hp & high:
+                score += 1
+            elif hn & high:
+                score -= 1
+            remaining -= 1
+            if limit is not None and score - remaining > limit:
+                return score - remaining
+            hp = ((hp << 1) | 1) & full
+            hn = (hn << 1) & full
+            vp = hn | (~(xv | hp) & full)
+            vn = hp & xv
+        return score
+
+    def mutation_distance(self, gene_sequence, reference_gene_sequence, limit=None, masks=None):
+        """
+        FR:
+        Compte les mutations entre deux séquences sans construire la chaîne encodée
+        (même décompte que encode_mutation : substitutions + écart de longueur ; en
+        mode alignement, distance d'édition dans la bande).
+        Le calcul s'arrête dès que le compte dépasse `limit`.
+
+        Paramètres:
+        - gene_sequence (str): La séquence d'ADN à encoder.
+        - reference_gene_sequence (str): La séquence de référence.
+        - limit (int, optionnel): Seuil au-delà duquel le calcul s'interrompt.
+        - masks (dict, optionnel): pattern_masks(gene_sequence), pour le préfiltre
+          edit_distance du mode alignement (la distance sans bande la minore).
+
+        Retour:
+        - int: Nombre de mutations (ou une valeur > limit si le seuil est dépassé).
+
+        EN:
+        Counts the mutations between two sequences without building the encoded
+        string (same count as encode_mutation: substitutions + length gap; in
+        alignment mode, edit distance within the band).
+        Computation stops as soon as the count exceeds `limit`.
+
+        Parameters:
+        - gene_sequence (str): DNA sequence to encode.
+        - reference_gene_sequence (str): Reference sequence.
+        - limit (int, optional): Threshold above which computation stops.
+        - masks (dict, optional): pattern_masks(gene_sequence), for the edit_distance
+          prefilter of alignment mode (the unbanded distance is a lower bound).
+
+        Returns:
+        - int: Mutation count (or a value > limit when the threshold is exceeded).
+        """
+        if gene_sequence == reference_gene_sequence:
+            return 0
+
+        distance = abs(len(gene_sequence) - len(reference_gene_sequence))
+        if self.band and distance <= self.band:
+            band = self.band if limit is None else min(self.band, limit)
+            if distance > band:
+                return distance
+            if limit is not None:
+                # Préfiltre : la table n'est construite que pour les gènes sous le seuil,
+                # et devient inutile si la bande ne peut pas écarter un tel alignement
+                bound = self.edit_distance(gene_sequence, reference_gene_sequence, limit, masks)
+                if bound > limit or band == limit:
+                    return bound
+            rows = self._align(gene_sequence, reference_gene_sequence, band, limit)
+            if rows is None:
+                return limit + 1
+            return rows[-1][len(gene_sequence) - len(reference_gene_sequence) + band]
+        if limit is None:
+            return distance + sum(1 for a, b in zip(gene_sequence, reference_gene_sequence) if a != b)
+        if distance > limit:
+            return distance
+
+        for a, b in zip(gene_sequence, reference_gene_sequence):
+            if a != b:
+                distance += 1
+                if distance > limit:
+                    return distance
+        return distance
+
+    def find_closest_gene(self, new_sequence, known_genes, max_mutations=3, index=None, mode="first"):
         """
         FR:
         Cherche dans les gènes connus celui qui est le plus proche (par mutation)
@@ -195,9 +408,12 @@ class MutationEncoder:
         - new_sequence (str): la bloc à encoder.
         - known_genes (dict): dictionnaire {gene_id: séquence}
         - max_mutation (int): seuil minimum de mutations autorisé.
+        - index (GeneIndex, optionnel): index des gènes ; seuls ses candidats sont examinés.
+        - mode (str): "first" retourne le premier gène sous le seuil, "best" celui
+          qui a le moins de mutations.
 
         Retour:
-        - Tuple (gene_id, encoded_mutation) si un gène proche est trouvé, sinon (None,None)
+        - Tuple (gene_id, MutationOps) si un gène proche est trouvé, sinon (None,None)
 
 
         EN:
@@ -207,18 +423,37 @@ class MutationEncoder:
         - new_sequence (str): Block to encode
         - known_genes (dict): Dictionary {gene_id: sequence}
         - max_mutations (int): Maximum allowed mutations.
+        - index (GeneIndex, optional): gene index; only its candidates are examined.
+        - mode (str): "first" returns the first gene under the threshold, "best" the
+          one with the fewest mutations.
         
 
         Returns:
-        - Tuple (gene_id, encoded_muation) or (None, None)
+        - Tuple (gene_id, MutationOps) or (None, None)
         """
-        for gene_id, gene_seq in known_genes.items():
-            mutation_str = self.encode_mutation(new_sequence, gene_seq)
-            mutations = mutation_str.split(SEPARATOR)
-            num_real_mutations = sum(1 for m in mutations if m != "-")
-            if num_real_mutations <= max_mutations:
-                return gene_id, mutation_str
-        return None, None
+        if mode not in ("first", "best"):
+            raise ValueError(f"Mode de recherche inconnu : {mode}")
+
+        if index is not None and max_mutations <= index.max_mutations:
+            # Alignement : un segment intact peut être décalé d'au plus max_mutations
+            gene_ids = index.candidates(new_sequence, max_mutations if self.band else 0)
+        else:
+            gene_ids = known_genes
+
+        best_id = None
+        limit = max_mutations
+        masks = self.pattern_masks(new_sequence) if self.band else None
+        for gene_id in gene_ids:
+            distance = self.mutation_distance(new_sequence, known_genes[gene_id], limit, masks)
+            if distance <= limit:
+                best_id = gene_id
+                if mode == "first" or distance == 0:
+                    break
+                limit = distance - 1
+
+        if best_id is None:
+            return None, None
+        return best_id, self.encode_ops(new_sequence, known_genes[best_id])
           
     def encode_mutations_in_sequence(self, sequence, reference_sequence):
         """
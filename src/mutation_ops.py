@@ -0,0 +1,468 @@
+# src/mutation_ops.py
+
+#------------------------------------------------------------------------------
+
+# Copyright (c) 2025 Rakotondravelo Tahina Mickaël
+# All rights reserved.
+#
+# This file is part of the GENOME_COMPRESSOR project.
+#
+# licensed under the MIT License. You may obtain a copy of the License at:
+# https://opensource.org/licences/MIT
+#------------------------------------------------------------------------------
+
+"""
+FR:
+Représentation compacte et structurée des mutations d'un bloc par rapport à son gène.
+
+Les opérations sont creuses (aucun marqueur pour les positions identiques) et rangées
+dans des tableaux `array` : type (MUT, INS, DEL), position dans le gène de référence,
+et un caractère par substitution ou insertion. Les positions sont exprimées dans les
+coordonnées du gène ; à position égale, les insertions (avant la base) précèdent la
+substitution ou la suppression de la base.
+
+La forme texte (Mut_i_X|Ins_i_X|Del_i) n'est plus qu'une sérialisation : une chaîne
+produite par `to_string` redonne le même résultat avec l'ancien décodeur. Chaque
+opération portant un seul caractère, `from_string` le lit par position : il peut
+valoir "|", "_" ou "-" sans échappement.
+
+Auteur               : Rakotondravelo Tahina Mickaël
+
+
+EN:
+Compact, structured representation of a block's mutations relative to its gene.
+
+Operations are sparse (no placeholder for identical positions) and stored in `array`
+arrays: kind (MUT, INS, DEL), position in the reference gene, and one character per
+substitution or insertion. Positions are expressed in gene coordinates; at the same
+position, insertions (before the base) come before the substitution or deletion of
+the base.
+
+The text form (Mut_i_X|Ins_i_X|Del_i) is now only a serialisation: a string produced
+by `to_string` gives the same result with the legacy decoder. Every operation
+carrying a single character, `from_string` reads it by position: it may be "|", "_"
+or "-" without escaping.
+
+Author               : Rakotondravelo Tahina Mickaël
+"""
+
+import re
+from array import array
+
+from src.utils import read_varint, write_bytes, write_varint
+
+OP_MUT = 0
+OP_INS = 1
+OP_DEL = 2
+
+MUTATION_FORMAT = "ops"  # Valeur de metadata["mutation_format"] / Value of metadata["mutation_format"]
+
+_NAMES = {OP_MUT: "Mut", OP_INS: "Ins", OP_DEL: "Del"}
+_CODES = {name: code for code, name in _NAMES.items()}
+# Jeton de la forme texte et son séparateur ; le caractère est lu par position
+# Text-form token and its separator; the character is read by position
+_TOKEN = re.compile(r"(?:(Mut|Ins)_([0-9]+)_(.)|Del_([0-9]+)|-)(\||\Z)", re.DOTALL)
+
+
+class MutationOps:
+    """
+    FR : Liste creuse et triée d'opérations de mutation (type, position, caractère).
+    EN : Sparse, sorted list of mutation operations (kind, position, character).
+    """
+
+    __slots__ = ("kinds", "positions", "chars")
+
+    def __init__(self, kinds=(), positions=(), chars: str = ""):
+        """
+        FR: `chars` contient un caractère par opération MUT ou INS, dans l'ordre.
+        EN: `chars` holds one character per MUT or INS operation, in order.
+        """
+        self.kinds = array("B", kinds)
+        self.positions = array("I", positions)
+        self.chars = chars
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __eq__(self, other):
+        if not isinstance(other, MutationOps):
+            return NotImplemented
+        return (self.kinds, self.positions, self.chars) == (other.kinds, other.positions, other.chars)
+
+    def __repr__(self):
+        return f"MutationOps({self.to_string()!r})"
+
+    def __getstate__(self):
+        return self.kinds.tobytes(), self.positions.tolist(), self.chars
+
+    def __setstate__(self, state):
+        kinds, positions, self.chars = state
+        self.kinds = array("B", kinds)
+        self.positions = array("I", positions)
+
+    def __iter__(self):
+        """
+        FR: Parcourt les opérations sous la forme (type, position, caractère ou "").
+        EN: Iterates over operations as (kind, position, character or "").
+        """
+        char_index = 0
+        for kind, position in zip(self.kinds, self.positions):
+            if kind == OP_DEL:
+                yield kind, position, ""
+            else:
+                yield kind, position, self.chars[char_index]
+                char_index += 1
+
+    @classmethod
+    def diff(cls, sequence: str, reference: str) -> "MutationOps":
+        """
+        FR: Opérations transformant `reference` en `sequence` : substitutions sur la
+        partie commune, puis suppressions ou insertions en fin de gène.
+        EN: Operations turning `reference` into `sequence`: substitutions over the
+        common part, then deletions or insertions at the end of the gene.
+        """
+        overlap = min(len(sequence), len(reference))
+        positions = [i for i in range(overlap) if sequence[i] != reference[i]]
+        chars = "".join(sequence[i] for i in positions)
+        kinds = [OP_MUT] * len(positions)
+
+        if len(reference) > overlap:
+            positions.extend(range(overlap, len(reference)))
+            kinds.extend([OP_DEL] * (len(reference) - overlap))
+        elif len(sequence) > overlap:
+            positions.extend([overlap] * (len(sequence) - overlap))
+            kinds.extend([OP_INS] * (len(sequence) - overlap))
+            chars += sequence[overlap:]
+        return cls(kinds, positions, chars)
+
+    @classmethod
+    def from_string(cls, mutation: str) -> "MutationOps":
+        """
+        FR: Relit une chaîne produite par `to_string` ("-" ou jetons Mut/Ins/Del).
+        EN: Parses a string produced by `to_string` ("-" or Mut/Ins/Del tokens).
+
+        Raises:
+          ValueError: Si un jeton est mal formé / If a token is malformed.
+        """
+        ops = cls()
+        chars = []
+        mutation = mutation or "-"
+        pos = 0
+        while True:
+            match = _TOKEN.match(mutation, pos)
+            if match is None:
+                raise ValueError(f"Mutation invalide : {mutation[pos:].split('|', 1)[0]}")
+            name, position, char, deleted, separator = match.groups()
+            if name is not None:
+                ops.kinds.append(_CODES[name])
+                ops.positions.append(int(position))
+                chars.append(char)
+            elif deleted is not None:
+                ops.kinds.append(OP_DEL)
+                ops.positions.append(int(deleted))
+            pos = match.end()
+            if not separator:
+                break
+        ops.chars = "".join(chars)
+        return ops
+
+    def to_string(self) -> str:
+        """
+        FR: Sérialisation texte héritée, sans marqueurs ("-" si aucune opération).
+        EN: Legacy text serialisation, without placeholders ("-" when there is no operation).
+        """
+        tokens = [f"Del_{position}" if kind == OP_DEL else f"{_NAMES[kind]}_{position}_{char}"
+                  for kind, position, char in self]
+        return "|".join(tokens) if tokens else "-"
+
+    def write_to(self, out: bytearray) -> None:
+        """
+        FR: Ajoute à `out` l'enregistrement binaire des opérations : leur nombre, puis
+        type, position et caractère (UTF-8) de chacune (conteneurs v2 et v3).
+        EN: Appends the binary record of the operations to `out`: their count, then
+        the kind, position and (UTF-8) character of each (v2 and v3 containers).
+        """
+        write_varint(out, len(self))
+        for kind, position, char in self:
+            out.append(kind)
+            write_varint(out, position)
+            if kind != OP_DEL:
+                write_bytes(out, char.encode("utf-8"))
+
+    @classmethod
+    def read_from(cls, buffer, pos: int = 0):
+        """
+        FR: Relit un enregistrement écrit par write_to ; retourne (opérations, position
+        suivante).
+        EN: Reads back a record written by write_to; returns (operations, next position).
+
+        Raises:
+          IndexError: Si l'enregistrement est tronqué ou contient une opération
+          inconnue / If the record is truncated or holds an unknown operation.
+        """
+        count, pos = read_varint(buffer, pos)
+        kinds, positions, chars = [], [], []
+        for _ in range(count):
+            kind = buffer[pos]
+            if kind > OP_DEL:
+                raise IndexError("opération de mutation inconnue")
+            # Position et taille du caractère tiennent presque toujours sur un octet
+            position = buffer[pos + 1]
+            if position < 0x80:
+                pos += 2
+            else:
+                position, pos = read_varint(buffer, pos + 1)
+            if kind != OP_DEL:
+                size = buffer[pos]
+                if size >= 0x80:
+                    raise IndexError("caractère de mutation invalide")
+                end = pos + 1 + size
+                if end > len(buffer):
+                    raise IndexError("enregistrement de mutation tronqué")
+                chars.append(str(buffer[pos + 1:end], "utf-8"))
+                pos = end
+            kinds.append(kind)
+            positions.append(position)
+        return cls(kinds, positions, "".join(chars)), pos
+
+    def is_sorted(self) -> bool:
+        """
+        FR: Indique si les opérations sont dans l'ordre canonique (position, insertions d'abord).
+        EN: Tells whether the operations are in canonical order (position, insertions first).
+        """
+        keys = [(position, kind != OP_INS) for kind, position in zip(self.kinds, self.positions)]
+        return all(a <= b for a, b in zip(keys, keys[1:]))
+
+    def sort(self) -> None:
+        """
+        FR: Range les opérations dans l'ordre canonique (tri stable, une seule fois).
+        EN: Puts the operations in canonical order (stable sort, done once).
+        """
+        ops = sorted(self, key=lambda op: (op[1], op[0] != OP_INS))
+        self.kinds = array("B", [kind for kind, _, _ in ops])
+        self.positions = array("I", [position for _, position, _ in ops])
+        self.chars = "".join(char for _, _, char in ops)
+
+    def output_length(self, reference_length: int) -> int:
+        """
+        FR: Longueur de la séquence obtenue en appliquant les opérations au gène.
+        EN: Length of the sequence obtained by applying the operations to the gene.
+        """
+        return reference_length + self.kinds.count(OP_INS) - self.kinds.count(OP_DEL)
+
+    def apply(self, reference: str) -> str:
+        """
+        FR: Applique les opérations à `reference` en une passe (copies de tranches entre
+        les points d'édition) ; des opérations non triées sont d'abord triées.
+        EN: Applies the operations to `reference` in one pass (slice copies between edit
+        points); unsorted operations are sorted first.
+        """
+        if not self.kinds:
+            return reference
+        parts = []
+        self.apply_into(reference, parts)
+        return "".join(parts)
+
+    def apply_into(self, reference: str, parts: list) -> None:
+        """
+        FR: Ajoute à `parts` les morceaux de la séquence mutée, dans l'ordre.
+        EN: Appends the pieces of the mutated sequence to `parts`, in order.
+        """
+        if not self.is_sorted():
+            self.sort()
+        append = parts.append
+        cursor = 0
+        char_index = 0
+        for kind, position in zip(self.kinds, self.positions):
+            if position > cursor:
+                append(reference[cursor:position])
+            if kind == OP_INS:
+                cursor = max(cursor, position)
+                append(self.chars[char_index])
+                char_index += 1
+            else:
+                cursor = position + 1
+                if kind == OP_MUT:
+                    append(self.chars[char_index])
+                    char_index += 1
+        append(reference[cursor:])
+
+    @staticmethod
+    def apply_batch(pairs) -> str:
+        """
+        FR:
+        Applique les mutations de nombreux blocs d'un coup et retourne leur
+        concaténation. Toutes les tranches sont copiées une seule fois dans le
+        tampon final (`str.join` en calcule la taille avant la copie).
+
+        :param pairs: Itérable de (gène, MutationOps)
+
+        EN:
+        Applies the mutations of many blocks at once and returns their concatenation.
+        Every slice is copied once into the final buffer (`str.join` sizes it before
+        copying).
+
+        :param pairs: Iterable of (gene, MutationOps)
+        """
+        parts = []
+        append = parts.append
+        for reference, ops in pairs:
+            if ops.kinds:
+                ops.apply_into(reference, parts)
+            else:
+                append(reference)
+        return "".join(parts)
+
+
+def apply_legacy(reference: str, mutation: str, insert_anywhere: bool = False) -> str:
+    """
+    FR:
+    Applique une mutation texte héritée (Mut_i_X|Ins_i_X|Del_i, indices décalés par
+    les indels précédents) en temps linéaire : tant que les jetons avancent dans la
+    séquence, le résultat est construit en une passe par tranches. Des jetons qui
+    reviennent en arrière retombent sur l'application pas à pas (list.insert/pop).
+
+    :param insert_anywhere: Règle de MutationEncoder : une insertion hors limites est
+        faite quand même (list.insert) au lieu d'être ignorée (règle de GenomeDecoder)
+
+    EN:
+    Applies a legacy text mutation (Mut_i_X|Ins_i_X|Del_i, indices shifted by the
+    previous indels) in linear time: as long as the tokens move forward in the
+    sequence, the result is built in one pass of slices. Tokens going backwards fall
+    back to step-by-step application (list.insert/pop).
+
+    :param insert_anywhere: MutationEncoder rule: an out-of-range insertion is still
+        made (list.insert) instead of being ignored (GenomeDecoder rule)
+    """
+    parts = []
+    cursor = 0   # prochaine base du gène à recopier / next gene base to copy
+    done = 0     # éléments déjà produits / elements already produced
+    offset = 0
+    size = len(reference)
+
+    for token in mutation.split("|"):
+        kind, idx, char = _parse_legacy(token)
+        if kind is None:
+            continue
+        idx += offset
+        length = done + size - cursor
+        if idx < done:
+            return _apply_legacy_steps(reference, mutation, insert_anywhere)
+
+        if kind == OP_INS:
+            if idx > length:
+                if not insert_anywhere:
+                    continue
+                idx = length
+        elif idx >= length:
+            continue
+
+        if idx > done:
+            parts.append(reference[cursor:cursor + idx - done])
+            cursor += idx - done
+            done = idx
+        if kind == OP_MUT:
+            parts.append(char)
+            cursor += 1
+            done += 1
+        elif kind == OP_INS:
+            parts.append(char)
+            done += 1
+            offset += 1
+        else:
+            cursor += 1
+            offset -= 1
+
+    parts.append(reference[cursor:])
+    return "".join(parts)
+
+
+def block_length(reference: str, mutation) -> int:
+    """
+    FR:
+    Longueur d'un bloc une fois décodé, calculée à partir des indels sans construire
+    la séquence (mêmes règles que GenomeDecoder.apply_mutation pour le texte hérité).
+
+    EN:
+    Length of a block once decoded, computed from the indels without building the
+    sequence (same rules as GenomeDecoder.apply_mutation for legacy text).
+    """
+    if isinstance(mutation, MutationOps):
+        return mutation.output_length(len(reference))
+    if mutation == "-" or not any(x.strip().startswith(("Mut_", "Ins_", "Del_")) for x in mutation.split("|")):
+        return len(reference)
+
+    size = len(reference)
+    offset = 0
+    for m in mutation.split("|"):
+        if m.startswith("Mut_"):
+            parts = m.split("_", maxsplit=2)
+            if len(parts) == 3 and len(parts[2]) != 1:
+                # Substitution par plusieurs caractères : on applique réellement
+                return len(apply_legacy(reference, mutation))
+        elif m.startswith("Ins_"):
+            parts = m.split("_", maxsplit=2)
+            if len(parts) == 3:
+                if len(parts[2]) != 1:
+                    return len(apply_legacy(reference, mutation))
+                try:
+                    idx = int(parts[1]) + offset
+                except ValueError:
+                    continue
+                if 0 <= idx <= size:
+                    size += 1
+                    offset += 1
+        elif m.startswith("Del_"):
+            parts = m.split("_", maxsplit=1)
+            if len(parts) == 2:
+                try:
+                    idx = int(parts[1]) + offset
+                except ValueError:
+                    continue
+                if 0 <= idx < size:
+                    size -= 1
+                    offset -= 1
+    return size
+
+
+def _parse_legacy(token: str):
+    """
+    FR: Découpe un jeton hérité ; (None, 0, "") s'il est ignoré par les anciens décodeurs.
+    EN: Splits a legacy token; (None, 0, "") when the legacy decoders ignore it.
+    """
+    kind = _CODES.get(token[:3]) if token[3:4] == "_" else None
+    if kind is None:
+        return None, 0, ""
+    parts = token.split("_", 1 if kind == OP_DEL else 2)
+    if len(parts) != (2 if kind == OP_DEL else 3):
+        return None, 0, ""
+    try:
+        idx = int(parts[1])
+    except ValueError:
+        return None, 0, ""
+    return kind, idx, ("" if kind == OP_DEL else parts[2])
+
+
+def _apply_legacy_steps(reference: str, mutation: str, insert_anywhere: bool) -> str:
+    """
+    FR: Application pas à pas, identique aux anciens décodeurs (cas non monotones).
+    EN: Step-by-step application, identical to the legacy decoders (non-monotonic cases).
+    """
+    bases = list(reference)
+    offset = 0
+    for token in mutation.split("|"):
+        kind, idx, char = _parse_legacy(token)
+        if kind is None:
+            continue
+        idx += offset
+        if kind == OP_MUT:
+            if 0 <= idx < len(bases):
+                bases[idx] = char
+        elif kind == OP_INS:
+            if insert_anywhere or 0 <= idx <= len(bases):
+                bases.insert(idx, char)
+                offset += 1
+        elif 0 <= idx < len(bases):
+            bases.pop(idx)
+            offset -= 1
+    return "".join(bases)
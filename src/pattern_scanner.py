@@ -13,9 +13,12 @@
 """
 FR:
 Détecte les motifs fréquents dans une chaîne selon une longueur minimale/maximale
-et une fréquence minimale. Prend en charge deux méthodes :
+et une fréquence minimale. Prend en charge quatre méthodes :
 - 'naive' (défaut, robuste pour toutes longueurs)
 - 'rabin-karp' (plus rapide mais nécessite min_length == max_length)
+- 'packed' (k-mers A/C/G/T compactés sur 2 bits, longueur fixe <= 32 ; repli
+  vers 'rabin-karp' pour les autres alphabets)
+- 'suffix-array' (toutes longueurs, mémoire quasi linéaire, adaptée aux grands génomes)
 
 si method=None, sélection automatique basée sur les paramètres.
 
@@ -25,10 +28,13 @@ Auteur                   :  Rakotondravelo Tahina Mickaël
 
 EN:
 Detects frequent patterns in a string besed on a minimum/maximum length and a 
-minimum frequency. Supports two methods:
+minimum frequency. Supports four methods:
 
 - 'naive' (default, robust for all lengths)
 - 'rabin-karp' (faster but requires min_length == max_length)
+- 'packed' (2-bit packed A/C/G/T k-mers, fixed length <= 32; falls back to
+  'rabin-karp' for other alphabets)
+- 'suffix-array' (all lengths, near-linear memory, suited to large genomes)
 
 If method=None, automatic method selection is applied.
 
@@ -40,6 +46,9 @@ Author                   : Rakotondravelo Tahina Mickaël
 
 from collections import defaultdict
 
+from src.kmer_counter import MAX_PACKED_K, PackedKmerCounter, np
+from src.rolling_hash import RollingHash
+
 class PatternScanner:
     def __init__(self, min_length=3, max_length=15, min_frequency=2,method=None):
         self.min_length = min_length
@@ -48,14 +57,19 @@ class PatternScanner:
         
         if method is None:
             # Sélection automatique
-            self.method = "rabin-karp" if min_length == max_length else "naive"
+            if min_length == max_length:
+                self.method = "packed" if 1 <= min_length <= MAX_PACKED_K else "rabin-karp"
+            else:
+                self.method = "naive"
 
         else:
             method = method.lower()
-            assert method in ["naive", "rabin-karp"], "Méthode non prise en charge."
+            assert method in ["naive", "rabin-karp", "packed", "suffix-array"], "Méthode non prise en charge."
 
             if method == "rabin-karp" and min_length != max_length:
                 raise ValueError("Rabin-karp nécessite min_length == max_length.")
+            if method == "packed" and (min_length != max_length or min_length > MAX_PACKED_K):
+                raise ValueError(f"packed nécessite min_length == max_length <= {MAX_PACKED_K}.")
             self.method = method
     
     def scan(self, data):
@@ -71,13 +85,18 @@ class PatternScanner:
         :return    : Dictionary {pattern: frequency}
         """
 
-        if self.method == "rabin-karp":
+        if self.method == "packed" and PackedKmerCounter.accepts(data):
+            return self._scan_packed(data)
+
+        if self.method in ("rabin-karp", "packed"):
             try:
                 return self._scan_rabin_karp(data)
             except Exception as e:
                 print(f"[Alerte] Échec de Rabin-Karp ({type(e).__name__} : {e}), bascule vers 'naive'.")
 
                 return self._scan_naive(data)
+        elif self.method == "suffix-array":
+            return self._scan_suffix_array(data)
         else:
             return self._scan_naive(data)
         
@@ -106,43 +125,171 @@ class PatternScanner:
     def _scan_rabin_karp(self, data):
         """
         FR: Méthode Rabin-Karp optimisée pour une longueur fixe de motifs.
+        Les k-mers sont comptés directement par empreinte (modulo de Mersenne 2^61 - 1),
+        voir `RollingHash`.
         EN: Optimized Rabin-Karp method for fixed-length pattern scanning.
+        k-mers are counted directly by fingerprint (Mersenne modulus 2^61 - 1),
+        see `RollingHash`.
         """
-        base = 256
-        prime = 101
-        length = self.min_length
-        n = len(data)
-        patterns = defaultdict(int)
+        patterns = RollingHash(self.min_length).count(data, min_count=self.min_frequency)
 
-        if n < length:
-            return {}
-        
-        h = pow(base, length - 1, prime)
-        current_hash = 0
-        hashes = defaultdict(list)
-
-        # Hash initial
-        for i in range(length):
-            current_hash = (base * current_hash + ord(data[i])) % prime
-        hashes[current_hash].append(0)
-
-        for i in range(1, n -length +1):
-            current_hash = (base * (current_hash - ord(data[i - 1]) * h) + ord(data[i + length - 1])) % prime
-            current_hash = (current_hash + prime) % prime 
-            hashes[current_hash].append(i)
-
-        for positions in hashes.values():
-            substrs_count = defaultdict(int)
-            for pos in positions:
-                substrs = data[pos:pos + length]
-                substrs_count[substrs] += 1
-            for k, v in substrs_count.items():
-                if v >= self.min_frequency:
-                    patterns[k] += v
+        return dict(sorted(patterns.items(), key=lambda x: -x[1]))
 
+    def _scan_packed(self, data):
+        """
+        FR: Comptage de k-mers A/C/G/T compactés sur 2 bits (voir `PackedKmerCounter`).
+        EN: 2-bit packed A/C/G/T k-mer counting (see `PackedKmerCounter`).
+        """
+        patterns = PackedKmerCounter(self.min_length).count(data, min_count=self.min_frequency)
 
         return dict(sorted(patterns.items(), key=lambda x: -x[1]))
-    
+
+    def _scan_suffix_array(self, data):
+        """
+        FR: Méthode par tableau de suffixes pour toutes les longueurs de motifs.
+
+        Les suffixes ne sont triés que sur leurs max_length premiers caractères
+        (doublement de préfixe, vectorisé avec NumPy s'il est installé), puis les
+        intervalles LCP donnent directement la fréquence de chaque motif, sans
+        matérialiser toutes les sous-chaînes. À longueur fixe, les k-mers sont
+        simplement comptés par paquets (moteur 'packed' pour A/C/G/T). Le résultat
+        est identique à celui de la méthode naïve, ordre compris.
+
+        EN: Suffix-array method for all pattern lengths.
+
+        Suffixes are only sorted on their first max_length characters (prefix
+        doubling, vectorised with NumPy when installed), then the LCP intervals
+        directly give the frequency of each pattern, without materialising every
+        substring. At a fixed length, k-mers are simply bucketed ('packed' engine
+        for A/C/G/T). The result is identical to the naive method, ordering
+        included.
+        """
+        n = len(data)
+        depth = self.max_length
+        if n < self.min_length or depth < self.min_length:
+            return {}
+        if self.min_length == depth:
+            if depth <= MAX_PACKED_K and PackedKmerCounter.accepts(data):
+                return self._scan_packed(data)
+            return self._scan_naive(data)
+
+        if np is not None:
+            sa, lcp = self._suffix_lcp_numpy(data, depth)
+        else:
+            sa, lcp = self._suffix_lcp_python(data, depth)
+
+        # Parcours des intervalles LCP (longueur, début, première position)
+        found = []
+        append = found.append
+        min_length, min_frequency = self.min_length, self.min_frequency
+
+        stack = [[0, 0, n]]
+        for i in range(1, n + 1):
+            current = lcp[i]
+            left = i - 1
+            first = sa[i - 1]
+            if min_frequency <= 1:
+                for size in range(max(max(lcp[i - 1], current) + 1, min_length), min(n - first, depth) + 1):
+                    append((1, size, first))
+            while stack[-1][0] > current:
+                top, left, top_first = stack.pop()
+                if top_first < first:
+                    first = top_first
+                count = i - left
+                if count >= min_frequency:
+                    for size in range(max(max(stack[-1][0], current) + 1, min_length), top + 1):
+                        append((count, size, first))
+            if stack[-1][0] < current:
+                stack.append([current, left, first])
+            elif first < stack[-1][2]:
+                stack[-1][2] = first
+
+        # Même ordre que la méthode naïve : fréquence, puis taille, puis première occurrence
+        found.sort(key=lambda f: (-f[0], f[1], f[2]))
+        return {data[first:first + size]: count for count, size, first in found}
+
+    @staticmethod
+    def _suffix_lcp_python(data, depth):
+        """
+        FR: Tableau des suffixes triés sur `depth` caractères et LCP de leurs voisins
+        (plafonné à `depth`, lcp[0] = lcp[n] = 0), en Python pur.
+        EN: Array of the suffixes sorted on `depth` characters and LCP of their
+        neighbours (capped at `depth`, lcp[0] = lcp[n] = 0), in pure Python.
+        """
+        n = len(data)
+
+        # Etape 1 : tri des suffixes par doublement de préfixe (rangs par niveau)
+        rank = [ord(c) for c in data]
+        levels = [rank]
+        sa = sorted(range(n), key=rank.__getitem__)
+        span = 1
+        while span < depth:
+            width = max(rank) + 2
+            keys = [rank[i] * width + rank[i + span] + 1 for i in range(n - span)]
+            keys.extend(rank[i] * width for i in range(n - span, n))
+            sa.sort(key=keys.__getitem__)
+            new_rank = [0] * n
+            current = 0
+            previous = keys[sa[0]]
+            for i in sa:
+                if keys[i] != previous:
+                    current += 1
+                    previous = keys[i]
+                new_rank[i] = current
+            rank = new_rank
+            levels.append(rank)
+            span *= 2
+            if current == n - 1:
+                break
+
+        # Etape 2 : LCP entre suffixes voisins (par sauts binaires, plafonné à depth)
+        lcp = [0] * (n + 1)
+        for r in range(1, n):
+            a, b = sa[r - 1], sa[r]
+            length = 0
+            for level in range(len(levels) - 1, -1, -1):
+                if a + length < n and b + length < n and levels[level][a + length] == levels[level][b + length]:
+                    length += 1 << level
+            lcp[r] = min(length, depth)
+        return sa, lcp
+
+    @staticmethod
+    def _suffix_lcp_numpy(data, depth):
+        """
+        FR: Même calcul que _suffix_lcp_python, chaque niveau de doublement (tri,
+        rangs, sauts du LCP) étant fait sur des tableaux NumPy.
+        EN: Same computation as _suffix_lcp_python, every doubling level (sort, ranks,
+        LCP jumps) being done on NumPy arrays.
+        """
+        n = len(data)
+        codes = np.frombuffer(data.encode("utf-32-le"), dtype=np.uint32)
+        rank = np.unique(codes, return_inverse=True)[1].astype(np.int64).reshape(n)
+        levels = [rank]
+        sa = np.argsort(rank, kind="stable")
+        span = 1
+        while span < depth:
+            following = np.zeros(n, dtype=np.int64)
+            following[:n - span] = rank[span:] + 1
+            keys = rank * (int(rank.max()) + 2) + following
+            sa = np.argsort(keys, kind="stable")
+            ordered = keys[sa]
+            rank = np.empty(n, dtype=np.int64)
+            rank[sa[0]] = 0
+            rank[sa[1:]] = np.cumsum(ordered[1:] != ordered[:-1])
+            levels.append(rank)
+            span *= 2
+            if rank[sa[-1]] == n - 1:
+                break
+
+        a, b = sa[:-1], sa[1:]
+        length = np.zeros(n - 1, dtype=np.int64)
+        for level in range(len(levels) - 1, -1, -1):
+            pa, pb = a + length, b + length
+            same = (pa < n) & (pb < n)
+            same[same] = levels[level][pa[same]] == levels[level][pb[same]]
+            length[same] += 1 << level
+        return sa.tolist(), [0] + np.minimum(length, depth).tolist() + [0]
+
     def split_into_blocks(self, sequence):
         """
         FR: Découpe la séquence en blocs de taille min_length (ou block_size).
@@ -0,0 +1,290 @@
+# src/reference_index.py
+
+#------------------------------------------------------------------------------
+
+# Copyright (c) 2025 Rakotondravelo Tahina Mickaël
+# All rights reserved.
+#
+# This file is part of the GENOME_COMPRESSOR project.
+#
+# licensed under the MIT License. You may obtain a copy of the License at:
+# https://opensource.org/licences/MIT
+#------------------------------------------------------------------------------
+
+"""
+FR:
+Génome de référence pré-indexé pour la compression par référence. Les positions de
+toutes les fenêtres de k bases sont triées par k-mer : une recherche est une
+dichotomie, et l'index se sauvegarde tel quel (tableau d'entiers u32) dans un
+fichier de référence, rechargé sans reconstruction.
+
+Un bloc encodé contre la référence désigne le gène virtuel "R<position>" : la
+fenêtre de `block_size` bases qui commence à cette position. Ces gènes ne sont
+jamais écrits dans les fichiers .dna, qui notent seulement l'empreinte SHA-256 de
+la référence (metadata["reference"]) ; au décodage, la référence est retrouvée
+parmi celles chargées dans le processus (voir ReferenceIndex.get). SharedGenes
+résout de la même façon les gènes "D<i>" d'un dictionnaire partagé (voir
+gene_dictionary).
+
+Auteur               : Rakotondravelo Tahina Mickaël
+
+
+EN:
+Pre-indexed reference genome for reference-based compression. The positions of
+every k-base window are sorted by k-mer: a lookup is a binary search, and the index
+is saved as is (array of u32 integers) in a reference file, loaded back without
+being rebuilt.
+
+A block encoded against the reference names the virtual gene "R<position>": the
+window of `block_size` bases starting at that position. These genes are never
+written to .dna files, which only record the SHA-256 digest of the reference
+(metadata["reference"]); at decoding time, the reference is found among those
+loaded in the process (see ReferenceIndex.get). SharedGenes resolves the "D<i>"
+genes of a shared dictionary (see gene_dictionary) the same way.
+
+Author               : Rakotondravelo Tahina Mickaël
+"""
+
+import hashlib
+import sys
+from array import array
+from typing import Dict, List
+
+from src.gene_dictionary import GeneDictionary
+from src.kmer_counter import MAX_PACKED_K, PackedKmerCounter, np
+from src.utils import is_nucleotide_sequence, read_bytes, read_varint, write_bytes, write_varint
+
+REFERENCE_MAGIC = b"DNAR"
+REFERENCE_K = 12  # Longueur des k-mers indexés / Length of the indexed k-mers
+REFERENCE_CANDIDATES = 8  # Positions retenues par k-mer du bloc / Positions kept per block k-mer
+
+_loaded: Dict[str, "ReferenceIndex"] = {}  # Références chargées, par empreinte / Loaded references, by digest
+
+
+def reference_id(position: int) -> str:
+    """
+    FR: Identifiant du gène virtuel commençant à `position` dans la référence.
+    EN: Identifier of the virtual gene starting at `position` in the reference.
+    """
+    return f"R{position}"
+
+
+def reference_position(gene_id: str) -> int:
+    """
+    FR: Position désignée par un identifiant "R<position>" (KeyError sinon).
+    EN: Position named by an "R<position>" identifier (KeyError otherwise).
+    """
+    if gene_id[:1] != "R" or not gene_id[1:].isdigit():
+        raise KeyError(gene_id)
+    return int(gene_id[1:])
+
+
+class ReferenceIndex:
+    """
+    FR : Séquence de référence et positions de ses k-mers triées par k-mer.
+    EN : Reference sequence and the positions of its k-mers sorted by k-mer.
+    """
+
+    def __init__(self, sequence: str, k: int = REFERENCE_K, positions: array = None):
+        """
+        FR: Indexe `sequence` (ou reprend `positions` déjà triées) et l'enregistre
+        dans le processus sous son empreinte.
+        EN: Indexes `sequence` (or takes already sorted `positions`) and registers it
+        in the process under its digest.
+        """
+        if not 1 <= k <= MAX_PACKED_K:
+            raise ValueError(f"k doit être compris entre 1 et {MAX_PACKED_K}.")
+        self.sequence = sequence
+        self.k = k
+        self.digest = hashlib.sha256(sequence.encode("utf-8")).hexdigest()
+        self.positions = self._sort_positions(sequence, k) if positions is None else positions
+        self.register()
+
+    def register(self) -> None:
+        """
+        FR: Enregistre la référence dans le processus sous son empreinte (voir get) ;
+        utile pour une copie reçue par un autre processus.
+        EN: Registers the reference in the process under its digest (see get); useful
+        for a copy received by another process.
+        """
+        _loaded[self.digest] = self
+
+    @staticmethod
+    def _sort_positions(sequence: str, k: int) -> array:
+        """
+        FR: Positions des fenêtres triées par k-mer, puis par position (tri par entiers
+        compactés avec NumPy pour une séquence A/C/G/T).
+        EN: Window positions sorted by k-mer, then by position (sort over packed integers
+        with NumPy for an A/C/G/T sequence).
+        """
+        windows = max(0, len(sequence) - k + 1)
+        if np is not None and windows and is_nucleotide_sequence(sequence):
+            order = np.argsort(PackedKmerCounter(k).window_values(sequence), kind="stable")
+            return array("I", order.astype(np.uint32).tobytes())
+        return array("I", sorted(range(windows), key=lambda p: sequence[p:p + k]))
+
+    def __len__(self):
+        return len(self.sequence)
+
+    def metadata(self) -> dict:
+        """
+        FR: Description de la référence notée dans les fichiers .dna.
+        EN: Reference description recorded in .dna files.
+        """
+        return {"sha256": self.digest, "length": len(self.sequence)}
+
+    def window(self, position: int, length: int) -> str:
+        """
+        FR: Séquence du gène virtuel de `length` bases commençant à `position`.
+        EN: Sequence of the virtual gene of `length` bases starting at `position`.
+        """
+        return self.sequence[position:position + length]
+
+    def lookup(self, kmer: str) -> int:
+        """
+        FR: Rang du premier k-mer >= `kmer` dans `positions` (dichotomie).
+        EN: Rank of the first k-mer >= `kmer` in `positions` (binary search).
+        """
+        sequence, positions, k = self.sequence, self.positions, self.k
+        low, high = 0, len(positions)
+        while low < high:
+            middle = (low + high) // 2
+            position = positions[middle]
+            if sequence[position:position + k] < kmer:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def candidates(self, block: str, limit: int = REFERENCE_CANDIDATES) -> List[int]:
+        """
+        FR:
+        Positions de départ plausibles de `block` : celles où l'un de ses k-mers
+        disjoints apparaît tel quel (au plus `limit` par k-mer). Par le principe des
+        tiroirs, un alignement à moins de len(block) // k substitutions n'est pas
+        manqué tant que ses k-mers ne sont pas trop répétés.
+
+        EN:
+        Plausible start positions of `block`: those where one of its disjoint k-mers
+        appears verbatim (at most `limit` per k-mer). By the pigeonhole principle, an
+        alignment with fewer than len(block) // k substitutions is not missed as long
+        as its k-mers are not too repetitive.
+        """
+        sequence, positions, k = self.sequence, self.positions, self.k
+        last = len(sequence) - len(block)
+        found = []
+        for offset in range(0, len(block) - k + 1, k):
+            kmer = block[offset:offset + k]
+            rank = self.lookup(kmer)
+            for position in positions[rank:rank + limit]:
+                if sequence[position:position + k] != kmer:
+                    break
+                start = position - offset
+                if 0 <= start <= last and start not in found:
+                    found.append(start)
+        return found
+
+    def save(self, filename: str) -> None:
+        """
+        FR: Écrit la référence et son index trié (u32 petit-boutiste) dans `filename`.
+        EN: Writes the reference and its sorted index (little-endian u32) to `filename`.
+        """
+        positions = self.positions
+        if sys.byteorder != "little":
+            positions = array("I", positions)
+            positions.byteswap()
+        out = bytearray(REFERENCE_MAGIC)
+        write_varint(out, self.k)
+        write_bytes(out, self.sequence.encode("utf-8"))
+        write_bytes(out, positions.tobytes())
+        with open(filename, "wb") as f:
+            f.write(out)
+
+    @staticmethod
+    def load(filename: str) -> "ReferenceIndex":
+        """
+        FR: Relit un fichier écrit par `save` (sans retrier) et enregistre la référence.
+        EN: Reads back a file written by `save` (without sorting again) and registers
+        the reference.
+
+        Raises:
+          ValueError: Si le fichier est invalide / If the file is invalid.
+        """
+        with open(filename, "rb") as f:
+            buffer = f.read()
+        if not buffer.startswith(REFERENCE_MAGIC):
+            raise ValueError("Le fichier de référence est invalide ou corrompu.")
+        try:
+            k, pos = read_varint(buffer, len(REFERENCE_MAGIC))
+            sequence, pos = read_bytes(buffer, pos)
+            raw_positions, pos = read_bytes(buffer, pos)
+            sequence = sequence.decode("utf-8")
+            positions = array("I", raw_positions)
+        except (IndexError, UnicodeDecodeError, ValueError) as e:
+            raise ValueError("Le fichier de référence est invalide ou corrompu.") from e
+        if sys.byteorder != "little":
+            positions.byteswap()
+        if pos != len(buffer) or len(positions) != max(0, len(sequence) - k + 1):
+            raise ValueError("Le fichier de référence est invalide ou corrompu.")
+        return ReferenceIndex(sequence, k, positions)
+
+    @staticmethod
+    def get(digest: str) -> "ReferenceIndex":
+        """
+        FR: Référence chargée dans le processus sous l'empreinte `digest`.
+        EN: Reference loaded in the process under the `digest` digest.
+
+        Raises:
+          ValueError: Si elle n'est pas chargée / If it is not loaded.
+        """
+        reference = _loaded.get(digest)
+        if reference is None:
+            raise ValueError(f"Génome de référence non chargé : {digest}")
+        return reference
+
+
+class SharedGenes(dict):
+    """
+    FR:
+    Dictionnaire de gènes dont les identifiants absents sont résolus hors du
+    fichier : "D<i>" dans le dictionnaire partagé, "R<position>" dans la référence
+    (fenêtres de `block_size` bases), chargés à la première demande. Seuls les
+    gènes explicites sont parcourus, et donc sérialisés.
+
+    EN:
+    Gene dictionary whose missing identifiers are resolved outside the file: "D<i>"
+    in the shared dictionary, "R<position>" in the reference (windows of
+    `block_size` bases), loaded on first request. Only the explicit genes are
+    iterated over, hence serialised.
+    """
+
+    def __init__(self, genes: dict, metadata: dict):
+        super().__init__(genes)
+        self.reference = metadata.get("reference", {}).get("sha256")
+        self.dictionary = metadata.get("dictionary", {}).get("sha256")
+        self.block_size = metadata.get("block_size")
+        self._reference = self._dictionary = None
+
+    def __missing__(self, gene_id: str) -> str:
+        if gene_id[:1] == "D" and self.dictionary is not None:
+            if self._dictionary is None:
+                self._dictionary = GeneDictionary.get(self.dictionary)
+            return self._dictionary.genes[gene_id]
+        position = reference_position(gene_id)
+        if self.reference is None:
+            raise KeyError(gene_id)
+        if self._reference is None:
+            self._reference = ReferenceIndex.get(self.reference)
+        return self._reference.window(position, self.block_size)
+
+
+def resolve_genes(genes, metadata: dict):
+    """
+    FR: Enveloppe `genes` dans un SharedGenes si `metadata` désigne une référence ou
+    un dictionnaire partagé.
+    EN: Wraps `genes` in a SharedGenes when `metadata` names a reference or a shared
+    dictionary.
+    """
+    if isinstance(genes, SharedGenes) or ("reference" not in metadata and "dictionary" not in metadata):
+        return genes
+    return SharedGenes(genes, metadata)
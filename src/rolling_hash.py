@@ -0,0 +1,203 @@
+# src/rolling_hash.py
+
+#------------------------------------------------------------------------------
+
+# Copyright (c) 2025 Rakotondravelo Tahina Mickaël
+# All rights reserved.
+#
+# This file is part of the GENOME_COMPRESSOR project.
+#
+# licensed under the MIT License. You may obtain a copy of the License at:
+# https://opensource.org/licences/MIT
+#------------------------------------------------------------------------------
+
+"""
+FR:
+Moteur de hachage glissant (Rabin-Karp) pour le comptage de k-mers de longueur fixe.
+
+- Modulo de Mersenne 2^61 - 1 : les collisions deviennent négligeables, chaque
+  fenêtre est comptée directement par son empreinte.
+- Une empreinte déjà vue est confirmée par `str.startswith` (sans copie) ; seules
+  les vraies collisions retombent sur un comptage par sous-chaîne.
+- Si NumPy est installé, toutes les empreintes sont calculées de façon vectorisée
+  (même modulo 2^61 - 1, produits découpés en mots de 31 bits) puis vérifiées en
+  bloc.
+
+Auteur               : Rakotondravelo Tahina Mickaël
+
+
+EN:
+Rolling-hash (Rabin-Karp) engine for fixed-length k-mer counting.
+
+- Mersenne modulus 2^61 - 1: collisions become negligible, each window is
+  counted directly by its fingerprint.
+- A fingerprint already seen is confirmed with `str.startswith` (no copy); only
+  genuine collisions fall back to counting by substring.
+- When NumPy is installed, all fingerprints are computed in a vectorised way
+  (same 2^61 - 1 modulus, products split into 31-bit limbs) and verified in
+  bulk.
+
+Author               : Rakotondravelo Tahina Mickaël
+"""
+
+from collections import defaultdict
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel / NumPy is optional
+    np = None
+
+
+MERSENNE_61 = (1 << 61) - 1
+DEFAULT_BASE = 0x5BD1E995
+NUMPY_MIN_WINDOWS = 4096  # En dessous, la version Python pure est plus rapide
+_LIMB = 31  # Base < 2^31 : les produits partiels tiennent sur 64 bits / partial products fit in 64 bits
+
+
+class RollingHash:
+    """
+    FR:
+    Empreintes glissantes de fenêtres de longueur fixe et comptage des k-mers.
+
+    EN:
+    Rolling fingerprints of fixed-length windows and k-mer counting.
+    """
+
+    def __init__(self, length: int, base: int = DEFAULT_BASE, modulus: int = MERSENNE_61):
+        """
+        FR: Initialise le moteur pour des fenêtres de `length` caractères.
+        EN: Initializes the engine for windows of `length` characters.
+        """
+        if length < 1:
+            raise ValueError("La longueur de fenêtre doit être >= 1.")
+        self.length = length
+        self.base = base
+        self.modulus = modulus
+        self._high = pow(base, length - 1, modulus)
+
+    def hashes(self, data: str):
+        """
+        FR: Génère l'empreinte de chaque fenêtre de `data`, dans l'ordre des positions.
+        EN: Yields the fingerprint of every window of `data`, in position order.
+        """
+        length, base, modulus, high = self.length, self.base, self.modulus, self._high
+        if len(data) < length:
+            return
+
+        current = 0
+        for i in range(length):
+            current = (current * base + ord(data[i])) % modulus
+        yield current
+
+        for i in range(length, len(data)):
+            current = ((current - ord(data[i - length]) * high) * base + ord(data[i])) % modulus
+            yield current
+
+    def count(self, data: str, min_count: int = 1, use_numpy: bool = None) -> dict:
+        """
+        FR:
+        Compte toutes les fenêtres de `data`.
+
+        :param data: Chaîne à analyser
+        :param min_count: Fréquence minimale des k-mers retournés
+        :param use_numpy: Force (True) ou interdit (False) NumPy ; None = automatique
+        :return: Dictionnaire {k-mer: fréquence}, par ordre de première occurrence
+
+        EN:
+        Counts every window of `data`.
+
+        :param data: Input string
+        :param min_count: Minimum frequency of the returned k-mers
+        :param use_numpy: Force (True) or forbid (False) NumPy; None = automatic
+        :return: Dictionary {k-mer: frequency}, in first-occurrence order
+        """
+        windows = len(data) - self.length + 1
+        if windows <= 0:
+            return {}
+        vectorisable = self.modulus == MERSENNE_61 and self.base < (1 << _LIMB)
+        if use_numpy is None:
+            use_numpy = np is not None and vectorisable and windows >= NUMPY_MIN_WINDOWS
+        if use_numpy:
+            if np is None:
+                raise ImportError("NumPy n'est pas installé.")
+            if not vectorisable:
+                raise ValueError(f"NumPy nécessite le modulo 2^61 - 1 et une base < 2^{_LIMB}.")
+            return self._count_numpy(data, min_count)
+        return self._count_python(data, min_count)
+
+    def _count_python(self, data: str, min_count: int) -> dict:
+        """
+        FR: Comptage par empreinte, vérification sans copie via `str.startswith`.
+        EN: Counting by fingerprint, copy-free verification through `str.startswith`.
+        """
+        length = self.length
+        seen = {}  # {empreinte: [k-mer représentatif, fréquence]}
+        collisions = defaultdict(int)
+
+        for pos, h in enumerate(self.hashes(data)):
+            entry = seen.get(h)
+            if entry is None:
+                seen[h] = [data[pos:pos + length], 1]
+            elif data.startswith(entry[0], pos):
+                entry[1] += 1
+            else:
+                collisions[data[pos:pos + length]] += 1
+
+        # Toutes les fenêtres d'un même k-mer ont la même empreinte : un k-mer en
+        # collision n'est jamais un représentant, les deux comptages sont disjoints.
+        counts = {kmer: freq for kmer, freq in seen.values() if freq >= min_count}
+        counts.update((kmer, freq) for kmer, freq in collisions.items() if freq >= min_count)
+        return counts
+
+    def _count_numpy(self, data: str, min_count: int) -> dict:
+        """
+        FR: Empreintes vectorisées modulo 2^61 - 1 (identiques à `hashes`), puis
+        vérification en bloc contre le premier représentant de chaque empreinte.
+        EN: Vectorised fingerprints modulo 2^61 - 1 (identical to `hashes`), then bulk
+        verification against the first representative of each fingerprint.
+        """
+        length = self.length
+        codes = np.frombuffer(data.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+        windows = len(codes) - length + 1
+
+        hashes = np.zeros(windows, dtype=np.uint64)
+        for j in range(length):
+            hashes = self._mul_add_numpy(hashes, codes[j:j + windows])
+
+        _, first, inverse = np.unique(hashes, return_index=True, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        representative = first[inverse]
+        same = np.ones(windows, dtype=bool)
+        for j in range(length):
+            same &= codes[representative + j] == codes[j:j + windows]
+
+        verified = np.bincount(inverse[same], minlength=len(first))
+        kept = np.flatnonzero(verified >= min_count)
+        kept = kept[np.argsort(first[kept], kind="stable")]
+        counts = {data[pos:pos + length]: freq for pos, freq in zip(first[kept].tolist(), verified[kept].tolist())}
+
+        collisions = defaultdict(int)
+        for pos in np.flatnonzero(~same).tolist():
+            collisions[data[pos:pos + length]] += 1
+        counts.update((kmer, freq) for kmer, freq in collisions.items() if freq >= min_count)
+        return counts
+
+    def _mul_add_numpy(self, hashes, codes):
+        """
+        FR:
+        (hashes * base + codes) mod 2^61 - 1 sur des uint64, sans débordement :
+        h = haut * 2^31 + bas, et x * 2^31 se réduit en (x >> 30) + (x mod 2^30) * 2^31
+        puisque 2^61 = 1 (mod 2^61 - 1). Chaque terme reste < 2^62.
+
+        EN:
+        (hashes * base + codes) mod 2^61 - 1 over uint64, without overflow:
+        h = high * 2^31 + low, and x * 2^31 reduces to (x >> 30) + (x mod 2^30) * 2^31
+        since 2^61 = 1 (mod 2^61 - 1). Every term stays < 2^62.
+        """
+        base, modulus = np.uint64(self.base), np.uint64(MERSENNE_61)
+        high = (hashes >> np.uint64(_LIMB)) * base
+        low = (hashes & np.uint64((1 << _LIMB) - 1)) * base
+        shifted = (high >> np.uint64(61 - _LIMB)) + ((high & np.uint64((1 << (61 - _LIMB)) - 1)) << np.uint64(_LIMB))
+        total = shifted + low + codes
+        total = (total & modulus) + (total >> np.uint64(61))
+        return np.where(total >= modulus, total - modulus, total)
@@ -15,22 +15,91 @@
 
 FR:
 Module responsable de la sérialisation et désérialisation des fichier .dna
-dans un format JSON versionné et portable.
+dans un format JSON versionné et portable (v1), ou dans un conteneur binaire
+compact (v2) :
+
+- en-tête : signature b"DNA\x02" puis métadonnées JSON
+- table des gènes : identifiants et séquences (2 bits/base si A/C/G/T)
+- flux des blocs : index du gène de chaque bloc (varint)
+- flux des mutations : opérations Mut/Ins/Del typées, sans marqueurs "-"
+- les flux sont découpés en groupes de INDEX_STEP blocs, suivis d'un index
+  (position de chaque groupe dans la séquence et dans le fichier) pour l'accès
+  direct à une région (voir load_region)
+- les deux flux peuvent être compressés par un codec entropique (voir
+  EntropyCoder), choisi par fichier et noté dans metadata["stream_codec"]
+
+Conteneur à tables de largeur fixe (v3, signature b"DNA\x03") : lu par projection
+mémoire, gènes et blocs accessibles à la demande (voir MappedStore).
+
+Variante en flux (v2.1, signature b"DNAS") : les mêmes sections découpées en
+trames, écrites au fil de la lecture de l'entrée, pour compresser des entrées de
+taille arbitraire avec une mémoire bornée (voir DnaStreamWriter / DnaStreamReader).
+
+Le format est détecté automatiquement à la lecture.
 
 Auteur                : Rakotondravelo Tahina Mickaël
 
 
 EN:
 Module respnsible for serialization and deserialization of .dna files using a versioned,
-structured, and portable JSON format.
+structured, and portable JSON format (v1), or a compact binary container (v2):
+
+- header: b"DNA\x02" signature followed by JSON metadata
+- gene table: identifiers and sequences (2 bits/base when A/C/G/T)
+- block stream: gene index of each block (varint)
+- mutation stream: typed Mut/Ins/Del operations, without "-" placeholders
+- the streams are cut into groups of INDEX_STEP blocks, followed by an index
+  (offset of each group in the sequence and in the file) for random access to a
+  region (see load_region)
+- both streams may be compressed by an entropy codec (see EntropyCoder),
+  selected per file and recorded in metadata["stream_codec"]
+
+Fixed-width table container (v3, b"DNA\x03" signature): read through memory
+mapping, genes and blocks accessed on demand (see MappedStore).
+
+Streaming variant (v2.1, b"DNAS" signature): the same sections cut into frames,
+written as the input is read, so that arbitrarily large inputs can be compressed
+with bounded memory (see DnaStreamWriter / DnaStreamReader).
+
+The format is detected automatically when loading.
 
 Author                : Rakotondravelo Tahina Mickaël
 """
 
+import bisect
 import json
+import lzma
+import mmap
+import zlib
 from typing import Any
 from datetime import datetime
 
+from src.entropy_coder import EntropyCoder
+from src.mapped_store import MAPPED_MAGIC, MappedStore
+from src.mutation_encoder import SEPARATOR
+from src.mutation_ops import MUTATION_FORMAT, OP_DEL, OP_INS, OP_MUT, MutationOps, block_length
+from src.gene_dictionary import shared_ids
+from src.reference_index import reference_id, reference_position, resolve_genes
+from src.utils import (
+    is_nucleotide_sequence, pack_bases, unpack_bases,
+    read_bytes, read_varint, write_bytes, write_varint,
+)
+
+BINARY_MAGIC = b"DNA\x02"
+STREAM_MAGIC = b"DNAS"
+
+INDEX_STEP = 16384  # Blocs par groupe indexé / Blocks per indexed group
+
+FRAME_END = 0
+FRAME_BLOCKS = 1
+
+GENE_TEXT = 0
+GENE_PACKED = 1
+
+OP_RAW = 3  # Jeton non reconnu, conservé tel quel / Unrecognised token, kept verbatim
+_OP_CODES = {"Mut": OP_MUT, "Ins": OP_INS, "Del": OP_DEL}
+_OP_NAMES = {code: name for name, code in _OP_CODES.items()}
+
 class StorageModel:
     """
     FR:
@@ -46,12 +115,16 @@ class StorageModel:
     """
 
     version = "1.0"
+    binary_version = "2.0"
+    stream_version = "2.1"
+    mapped_version = "3.1"
     generator_name = "GENOME_COMPRESSOR"
     generator_version = "1.0.0"
     author = "Rakotondravelo Tahina Mickael"
 
     @staticmethod
-    def save(data: dict, filename: str, source_filename: str = "") -> None:
+    def save(data: dict, filename: str, source_filename: str = "", binary: bool = False,
+             codec: str = "none", mapped: bool = False) -> None:
         """
         FR:
         Enregistre les données compressées dans un fichier .dna au format JSON.
@@ -61,6 +134,12 @@ class StorageModel:
 
            filename (str): Nom du fichier de sortie (avec extension .dna)
 
+           binary (bool): Utiliser le conteneur binaire v2 au lieu du JSON v1.
+
+           codec (str): Codec entropique des flux binaires ("none", "zlib", "lzma", "rans").
+
+           mapped (bool): Utiliser le conteneur v3 à tables fixes, lisible par mmap (voir MappedStore).
+
         Raises:
            ValueError: Si les données ne contiennent pas les clés attendues.
 
@@ -70,6 +149,12 @@ class StorageModel:
           data (dict): Compressed data containing 'genes', 'blocks', and 'metadata'.
 
           filename (str):Output file name (with .dna extension)
+
+          binary (bool): Use the v2 binary container instead of v1 JSON.
+
+          codec (str): Entropy codec of the binary streams ("none", "zlib", "lzma", "rans").
+
+          mapped (bool): Use the v3 fixed-table container, readable through mmap (see MappedStore).
         
         Raises:
            ValueError : If data does not contain the required keys.
@@ -80,8 +165,42 @@ class StorageModel:
             raise ValueError("Le fichier .dna doit contenir les clés : 'genes', 'blocks', 'metadata'.")
         
 
-        metadata = data["metadata"]
-        metadata["format_version"] = StorageModel.version
+        if mapped:
+            format_version = StorageModel.mapped_version
+        else:
+            format_version = StorageModel.binary_version if binary else StorageModel.version
+        StorageModel._stamp(data["metadata"], format_version, source_filename)
+
+        if mapped:
+            with open(filename, "wb") as f:
+                f.write(MappedStore.encode(data))
+            return
+
+        if binary:
+            with open(filename, "wb") as f:
+                f.write(StorageModel.encode_binary(data, codec=codec))
+            return
+
+        with open(filename, "w") as f:
+            json.dump(data, f, indent=3, default=StorageModel.json_default)
+
+    @staticmethod
+    def json_default(value):
+        """
+        FR: Sérialise les MutationOps sous leur forme texte dans le JSON v1.
+        EN: Serializes MutationOps in their text form in v1 JSON.
+        """
+        if isinstance(value, MutationOps):
+            return value.to_string()
+        raise TypeError(f"Type non sérialisable : {type(value).__name__}")
+
+    @staticmethod
+    def _stamp(metadata: dict, format_version: str, source_filename: str = "") -> None:
+        """
+        FR: Ajoute la version du format et les informations du générateur aux métadonnées.
+        EN: Adds the format version and generator information to the metadata.
+        """
+        metadata["format_version"] = format_version
         metadata["created_at"] = datetime.now().isoformat()
         metadata["author"] = StorageModel.author
         metadata["generator"] = StorageModel.generator_name
@@ -89,11 +208,6 @@ class StorageModel:
 
         if source_filename:
             metadata["source_filename"] = source_filename
-        
-        
-
-        with open(filename, "w") as f:
-            json.dump(data, f, indent=3)
 
     @staticmethod
     def load(filename: str) -> dict:
@@ -122,15 +236,582 @@ class StorageModel:
           ValueError: If the file is invalid or corrupted      
         """
 
-        with open(filename, "r") as f:
-            data = json.load(f)
+        with open(filename, "rb") as f:
+            magic = f.read(len(BINARY_MAGIC))
+
+        if magic == BINARY_MAGIC:
+            with open(filename, "rb") as f:
+                data = StorageModel.decode_binary(f.read())
+        elif magic == MAPPED_MAGIC:
+            with MappedStore(filename) as store:
+                gene_ids = store.gene_ids()
+                names = store.shared_ids + gene_ids
+                data = {
+                    "genes": {gene_id: str(store.gene_view(i), "utf-8") for i, gene_id in enumerate(gene_ids)},
+                    "blocks": [{"gene": names[g] if g < len(names) else reference_id(g - len(names)),
+                                "mutation": m} for g, m in store.iter_blocks()],
+                    "metadata": store.metadata,
+                }
+        elif magic == STREAM_MAGIC:
+            # Les trames se fusionnent ; un identifiant réutilisé après éviction reçoit
+            # un nom unique "<id>~<n>" pour que chaque séquence reste adressable
+            data = {"genes": {}, "blocks": [], "metadata": {}}
+            names = {}
+            with open(filename, "rb") as f:
+                reader = DnaStreamReader(f)
+                for genes, blocks, _ in reader:
+                    for gene_id, sequence in genes.items():
+                        name = gene_id
+                        while name in data["genes"]:
+                            name = f"{gene_id}~{len(data['genes'])}"
+                        names[gene_id] = name
+                        data["genes"][name] = sequence
+                    # Gènes partagés ("D<i>") et de référence ("R<p>") : hors des trames
+                    data["blocks"].extend({"gene": names.get(block["gene"], block["gene"]),
+                                           "mutation": block["mutation"]} for block in blocks)
+                data["metadata"] = dict(reader.metadata, **reader.trailer)
+        else:
+            with open(filename, "r") as f:
+                data = json.load(f)
 
         required_keys = {"genes", "blocks", "metadata"}
         if not required_keys.issubset(data.keys()):
             raise ValueError("Le fichier .dna est invalide ou corrompu.")
-        
+
+        if data["metadata"].get("mutation_format") == MUTATION_FORMAT:
+            try:
+                for block in data["blocks"]:
+                    if not isinstance(block["mutation"], MutationOps):
+                        block["mutation"] = MutationOps.from_string(block["mutation"])
+            except (TypeError, KeyError) as e:
+                raise ValueError("Le fichier .dna est invalide ou corrompu.") from e
+
+        data["genes"] = resolve_genes(data["genes"], data["metadata"])
         return data
-    
+
+    @staticmethod
+    def encode_binary(data: dict, codec: str = "none", index_step: int = INDEX_STEP) -> bytes:
+        """
+        FR:
+        Sérialise les données compressées dans le conteneur binaire v2.
+
+        Args:
+           data (dict): Données compressées contenant 'genes', 'blocks' et 'metadata'.
+           codec (str): Codec entropique appliqué aux flux de blocs et de mutations.
+           index_step (int): Blocs par groupe indexé (0 = un seul flux, sans index).
+
+        Returns:
+           bytes: Contenu du fichier .dna v2.
+
+        EN:
+        Serializes the compressed data into the v2 binary container.
+
+        Args:
+           data (dict): Compressed data containing 'genes', 'blocks' and 'metadata'.
+           codec (str): Entropy codec applied to the block and mutation streams.
+           index_step (int): Blocks per indexed group (0 = single stream, no index).
+
+        Returns:
+           bytes: Content of the v2 .dna file.
+        """
+        # Codec et index d'un fichier relu ne sont pas reportés : seuls ceux de cet encodage comptent
+        metadata = {key: value for key, value in data["metadata"].items()
+                    if key not in ("stream_codec", "block_index")}
+        if codec != "none":
+            metadata["stream_codec"] = codec
+        if index_step:
+            metadata["block_index"] = index_step
+
+        out = bytearray(BINARY_MAGIC)
+        write_bytes(out, json.dumps(metadata).encode("utf-8"))
+
+        positions = StorageModel._shared_positions(metadata)
+        StorageModel._write_genes(out, data["genes"], positions)
+        if not index_step:
+            StorageModel._write_blocks(out, data["blocks"], positions, codec)
+            return bytes(out)
+
+        genes, blocks = resolve_genes(data["genes"], metadata), data["blocks"]
+        entries = []
+        offset = 0
+        write_varint(out, -(-len(blocks) // index_step))
+        for first in range(0, len(blocks), index_step):
+            group = blocks[first:first + index_step]
+            entries.append((offset, len(out)))
+            StorageModel._write_blocks(out, group, positions, codec)
+            offset += sum(block_length(genes[b["gene"]], b["mutation"] or "-") for b in group)
+
+        index_pos = len(out)
+        write_varint(out, len(entries))
+        for start, position in entries:
+            write_varint(out, start)
+            write_varint(out, position)
+        out += index_pos.to_bytes(8, "little")
+        return bytes(out)
+
+    @staticmethod
+    def decode_binary(buffer: bytes) -> dict:
+        """
+        FR:
+        Désérialise un conteneur binaire v2. Les mutations sont restituées au format
+        texte (Mut_i_X|Ins_i_X|Del_i), "-" pour un bloc sans mutation.
+
+        Raises:
+          ValueError: Si le contenu est tronqué ou corrompu.
+
+        EN:
+        Deserializes a v2 binary container. Mutations are returned in text form
+        (Mut_i_X|Ins_i_X|Del_i), "-" for a block without mutation.
+
+        Raises:
+          ValueError: If the content is truncated or corrupted.
+        """
+        if not buffer.startswith(BINARY_MAGIC):
+            raise ValueError("Le fichier .dna est invalide ou corrompu.")
+        try:
+            raw_metadata, pos = read_bytes(buffer, len(BINARY_MAGIC))
+            metadata = json.loads(raw_metadata.decode("utf-8"))
+
+            gene_ids = shared_ids(metadata)
+            codec = metadata.get("stream_codec", "none")
+            ops = metadata.get("mutation_format") == MUTATION_FORMAT
+            references = "reference" in metadata
+            genes, pos = StorageModel._read_genes(buffer, pos, gene_ids)
+            if not metadata.get("block_index"):
+                blocks, pos = StorageModel._read_blocks(buffer, pos, gene_ids, codec, ops, references)
+            else:
+                blocks = []
+                group_count, pos = read_varint(buffer, pos)
+                for _ in range(group_count):
+                    group, pos = StorageModel._read_blocks(buffer, pos, gene_ids, codec, ops, references)
+                    blocks.extend(group)
+                StorageModel._read_index(buffer, pos)
+        except (IndexError, UnicodeDecodeError, zlib.error, lzma.LZMAError) as e:
+            raise ValueError("Le fichier .dna est invalide ou corrompu.") from e
+
+        return {"genes": genes, "blocks": blocks, "metadata": metadata}
+
+    @staticmethod
+    def _read_index(buffer, pos: int = None) -> list:
+        """
+        FR:
+        Lit l'index des groupes de blocs : [(position dans la séquence, position dans
+        le fichier)]. `pos`, si fourni, doit coïncider avec la position annoncée en fin
+        de fichier.
+
+        EN:
+        Reads the block group index: [(offset in the sequence, offset in the file)].
+        `pos`, when given, must match the offset announced at the end of the file.
+        """
+        if len(buffer) < 8:
+            raise IndexError("index des blocs absent")
+        index_pos = int.from_bytes(buffer[len(buffer) - 8:], "little")
+        if pos is not None and pos != index_pos:
+            raise IndexError("index des blocs incohérent")
+        count, pos = read_varint(buffer, index_pos)
+        entries = []
+        for _ in range(count):
+            start, pos = read_varint(buffer, pos)
+            position, pos = read_varint(buffer, pos)
+            entries.append((start, position))
+        if pos != len(buffer) - 8:
+            raise IndexError("index des blocs incohérent")
+        return entries
+
+    @staticmethod
+    def load_index(filename: str):
+        """
+        FR:
+        Lit les métadonnées et l'index des groupes de blocs d'un conteneur binaire
+        indexé, sans lire les gènes ni les blocs.
+
+        Returns:
+           (dict, list) | None: Métadonnées et entrées de l'index (voir _read_index) ;
+           None si le fichier n'est pas un conteneur binaire indexé.
+
+        Raises:
+          ValueError: Si le contenu est tronqué ou corrompu.
+
+        EN:
+        Reads the metadata and the block group index of an indexed binary container,
+        without reading the genes or the blocks.
+
+        Returns:
+           (dict, list) | None: Metadata and index entries (see _read_index); None when
+           the file is not an indexed binary container.
+
+        Raises:
+          ValueError: If the content is truncated or corrupted.
+        """
+        with open(filename, "rb") as f:
+            if f.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                try:
+                    raw_metadata, _ = read_bytes(buffer, len(BINARY_MAGIC))
+                    metadata = json.loads(raw_metadata.decode("utf-8"))
+                    if not metadata.get("block_index"):
+                        return None
+                    return metadata, StorageModel._read_index(buffer)
+                except (IndexError, UnicodeDecodeError) as e:
+                    raise ValueError("Le fichier .dna est invalide ou corrompu.") from e
+
+    @staticmethod
+    def load_region(filename: str, start: int, end: int):
+        """
+        FR:
+        Charge uniquement les groupes de blocs couvrant les positions [start, end) d'un
+        conteneur binaire indexé, via un mmap du fichier (la table des gènes est lue,
+        pas les autres groupes).
+
+        Returns:
+           (dict, int) | None: Données réduites aux blocs couvrants et position dans la
+           séquence de leur premier bloc ; None si le fichier n'est pas indexé.
+
+        Raises:
+          ValueError: Si le contenu est tronqué ou corrompu.
+
+        EN:
+        Loads only the block groups covering positions [start, end) of an indexed binary
+        container, through an mmap of the file (the gene table is read, not the other
+        groups).
+
+        Returns:
+           (dict, int) | None: Data reduced to the covering blocks and the sequence
+           offset of their first block; None when the file is not indexed.
+
+        Raises:
+          ValueError: If the content is truncated or corrupted.
+        """
+        with open(filename, "rb") as f:
+            if f.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                try:
+                    raw_metadata, pos = read_bytes(buffer, len(BINARY_MAGIC))
+                    metadata = json.loads(raw_metadata.decode("utf-8"))
+                    if not metadata.get("block_index"):
+                        return None
+                    gene_ids = shared_ids(metadata)
+                    genes, _ = StorageModel._read_genes(buffer, pos, gene_ids)
+                    entries = StorageModel._read_index(buffer)
+
+                    first = max(0, bisect.bisect_right([s for s, _ in entries], start) - 1)
+                    blocks = []
+                    for group_start, position in entries[first:]:
+                        if group_start >= end and blocks:
+                            break
+                        group, _ = StorageModel._read_blocks(buffer, position, gene_ids,
+                                                             metadata.get("stream_codec", "none"),
+                                                             metadata.get("mutation_format") == MUTATION_FORMAT,
+                                                             "reference" in metadata)
+                        blocks.extend(group)
+                except (IndexError, UnicodeDecodeError, zlib.error, lzma.LZMAError) as e:
+                    raise ValueError("Le fichier .dna est invalide ou corrompu.") from e
+
+        offset = entries[first][0] if entries else 0
+        return {"genes": resolve_genes(genes, metadata), "blocks": blocks, "metadata": metadata}, offset
+
+    @staticmethod
+    def _shared_positions(metadata: dict) -> dict:
+        """
+        FR: Index des gènes du dictionnaire partagé, préfixe implicite de la table des gènes.
+        EN: Indexes of the shared dictionary genes, implicit prefix of the gene table.
+        """
+        return {gene_id: index for index, gene_id in enumerate(shared_ids(metadata))}
+
+    @staticmethod
+    def _write_genes(out: bytearray, genes: dict, positions: dict) -> None:
+        """
+        FR: Écrit une table de gènes ; `positions` reçoit l'index de chaque nouveau gène
+        (un identifiant déjà connu garde son index : sa séquence est remplacée).
+        EN: Writes a gene table; `positions` receives the index of every new gene (an
+        already known identifier keeps its index: its sequence is replaced).
+        """
+        write_varint(out, len(genes))
+        for gene_id, sequence in genes.items():
+            positions.setdefault(gene_id, len(positions))
+            write_bytes(out, gene_id.encode("utf-8"))
+            if sequence and is_nucleotide_sequence(sequence):
+                out.append(GENE_PACKED)
+                write_varint(out, len(sequence))
+                out += pack_bases(sequence)
+            else:
+                out.append(GENE_TEXT)
+                write_bytes(out, sequence.encode("utf-8"))
+
+    @staticmethod
+    def _read_genes(buffer, pos: int, gene_ids: list, slots: dict = None):
+        """
+        FR: Lit une table de gènes ; les identifiants sont ajoutés à `gene_ids`, sauf
+        ceux déjà présents dans `slots` ({identifiant: index}, tenu à jour), qui
+        remplacent la séquence de leur index.
+        EN: Reads a gene table; identifiers are appended to `gene_ids`, except those
+        already present in `slots` ({identifier: index}, kept up to date), which
+        replace the sequence at their index.
+        """
+        genes = {}
+        gene_count, pos = read_varint(buffer, pos)
+        for _ in range(gene_count):
+            raw_id, pos = read_bytes(buffer, pos)
+            gene_id = raw_id.decode("utf-8")
+            kind = buffer[pos]
+            pos += 1
+            if kind == GENE_PACKED:
+                length, pos = read_varint(buffer, pos)
+                size = (length + 3) // 4
+                genes[gene_id] = unpack_bases(buffer[pos:pos + size], length)
+                pos += size
+            else:
+                raw_sequence, pos = read_bytes(buffer, pos)
+                genes[gene_id] = raw_sequence.decode("utf-8")
+            if slots is None:
+                gene_ids.append(gene_id)
+            elif gene_id not in slots:
+                slots[gene_id] = len(gene_ids)
+                gene_ids.append(gene_id)
+        return genes, pos
+
+    @staticmethod
+    def _write_blocks(out: bytearray, blocks: list, positions: dict, codec: str) -> None:
+        """
+        FR: Écrit le flux des blocs et le flux des mutations, chacun codé par `codec`. Un
+        gène de référence "R<p>" (voir reference_index) est noté len(positions) + p.
+        EN: Writes the block stream and the mutation stream, each encoded with `codec`. A
+        reference gene "R<p>" (see reference_index) is written as len(positions) + p.
+        """
+        block_stream = bytearray()
+        mutation_stream = bytearray()
+        write_varint(block_stream, len(blocks))
+        for block in blocks:
+            gene_index = positions.get(block["gene"])
+            if gene_index is None:
+                gene_index = len(positions) + reference_position(block["gene"])
+            write_varint(block_stream, gene_index)
+            StorageModel._write_mutation(mutation_stream, block["mutation"])
+
+        write_bytes(out, EntropyCoder.encode(block_stream, codec))
+        write_bytes(out, EntropyCoder.encode(mutation_stream, codec))
+
+    @staticmethod
+    def _read_blocks(buffer, pos: int, gene_ids: list, codec: str, ops: bool = False, references: bool = False):
+        """
+        FR: Relit les flux écrits par _write_blocks ; retourne (blocs, position). Avec
+        `ops`, les mutations sont restituées en MutationOps ; avec `references`, un
+        index au-delà de la table des gènes désigne un gène de référence.
+        EN: Reads back the streams written by _write_blocks; returns (blocks, position).
+        With `ops`, mutations are returned as MutationOps; with `references`, an index
+        past the gene table names a reference gene.
+        """
+        read_mutation = MutationOps.read_from if ops else StorageModel._read_mutation
+        block_stream, pos = read_bytes(buffer, pos)
+        block_stream = EntropyCoder.decode(block_stream, codec)
+        mutation_stream, pos = read_bytes(buffer, pos)
+        mutation_stream = EntropyCoder.decode(mutation_stream, codec)
+
+        blocks = []
+        block_count, block_pos = read_varint(block_stream, 0)
+        mutation_pos = 0
+        gene_count = len(gene_ids) if references else None
+        for _ in range(block_count):
+            gene_index, block_pos = read_varint(block_stream, block_pos)
+            mutation, mutation_pos = read_mutation(mutation_stream, mutation_pos)
+            if references and gene_index >= gene_count:
+                blocks.append({"gene": reference_id(gene_index - gene_count), "mutation": mutation})
+            else:
+                blocks.append({"gene": gene_ids[gene_index], "mutation": mutation})
+        return blocks, pos
+
+    @staticmethod
+    def _write_mutation(out: bytearray, mutation) -> None:
+        """
+        FR: Écrit les opérations d'une mutation (MutationOps, ou texte dont les "-" sont omis).
+        EN: Writes the operations of a mutation (MutationOps, or text whose "-" placeholders are omitted).
+        """
+        if isinstance(mutation, MutationOps):
+            mutation.write_to(out)
+            return
+
+        tokens = [t for t in (mutation or "-").split(SEPARATOR) if t != "-"]
+        write_varint(out, len(tokens))
+        for token in tokens:
+            parts = token.split("_", 2)
+            code = _OP_CODES.get(parts[0])
+            if code == OP_DEL and len(parts) == 2 and parts[1].isdigit():
+                out.append(OP_DEL)
+                write_varint(out, int(parts[1]))
+            elif code in (OP_MUT, OP_INS) and len(parts) == 3 and parts[1].isdigit():
+                out.append(code)
+                write_varint(out, int(parts[1]))
+                write_bytes(out, parts[2].encode("utf-8"))
+            else:
+                out.append(OP_RAW)
+                write_bytes(out, token.encode("utf-8"))
+
+    @staticmethod
+    def _read_mutation(buffer, pos: int):
+        """
+        FR: Relit les opérations écrites par _write_mutation ; retourne (mutation, position).
+        EN: Reads back operations written by _write_mutation; returns (mutation, position).
+        """
+        count, pos = read_varint(buffer, pos)
+        tokens = []
+        for _ in range(count):
+            code = buffer[pos]
+            pos += 1
+            if code == OP_RAW:
+                raw, pos = read_bytes(buffer, pos)
+                tokens.append(raw.decode("utf-8"))
+                continue
+            index, pos = read_varint(buffer, pos)
+            if code == OP_DEL:
+                tokens.append(f"Del_{index}")
+            else:
+                char, pos = read_bytes(buffer, pos)
+                tokens.append(f"{_OP_NAMES[code]}_{index}_{char.decode('utf-8')}")
+        return (SEPARATOR.join(tokens) if tokens else "-"), pos
+
+
+class DnaStreamWriter:
+    """
+    FR:
+    Écriture d'un fichier .dna en flux (v2.1) : en-tête, puis une trame par lot de
+    blocs, puis une trame de fin portant les métadonnées connues en fin de flux.
+    Chaque trame contient les nouveaux gènes du lot puis ses blocs, qui référencent
+    les gènes par leur index depuis la dernière réinitialisation du dictionnaire.
+    Un identifiant déjà envoyé puis réutilisé (gène évincé) garde son index ; sa
+    nouvelle séquence vaut à partir de la trame qui la porte.
+
+    EN:
+    Streaming .dna writer (v2.1): header, then one frame per batch of blocks, then an
+    end frame carrying the metadata only known at the end of the stream. Each frame
+    holds the new genes of the batch followed by its blocks, which refer to genes by
+    their index since the last dictionary reset. An identifier already sent then
+    reused (evicted gene) keeps its index; its new sequence applies from the frame
+    carrying it.
+    """
+
+    def __init__(self, writer, metadata: dict, codec: str = "none"):
+        """
+        FR: Écrit l'en-tête dans `writer` (fichier binaire).
+        EN: Writes the header to `writer` (binary file).
+        """
+        self.writer = writer
+        self.codec = codec
+        self.metadata = dict(metadata)
+        if codec != "none":
+            self.metadata["stream_codec"] = codec
+        StorageModel._stamp(self.metadata, StorageModel.stream_version)
+        self._positions = StorageModel._shared_positions(self.metadata)
+
+        header = bytearray(STREAM_MAGIC)
+        write_bytes(header, json.dumps(self.metadata).encode("utf-8"))
+        writer.write(header)
+
+    def write_frame(self, genes: dict, blocks: list, reset: bool = False) -> None:
+        """
+        FR: Écrit une trame ; `reset` vide le dictionnaire de gènes avant `genes`.
+        EN: Writes a frame; `reset` empties the gene dictionary before `genes`.
+        """
+        if reset:
+            self._positions = StorageModel._shared_positions(self.metadata)
+        payload = bytearray([1 if reset else 0])
+        StorageModel._write_genes(payload, genes, self._positions)
+        StorageModel._write_blocks(payload, blocks, self._positions, self.codec)
+
+        frame = bytearray([FRAME_BLOCKS])
+        write_bytes(frame, payload)
+        self.writer.write(frame)
+
+    def close(self, trailer: dict) -> None:
+        """
+        FR: Écrit la trame de fin (métadonnées finales, ex. original_length).
+        EN: Writes the end frame (final metadata, e.g. original_length).
+        """
+        frame = bytearray([FRAME_END])
+        write_bytes(frame, json.dumps(trailer).encode("utf-8"))
+        self.writer.write(frame)
+
+
+class DnaStreamReader:
+    """
+    FR:
+    Lecture trame par trame d'un fichier .dna en flux. L'itération produit
+    (nouveaux gènes, blocs, réinitialisation) ; `trailer` est disponible une fois
+    la trame de fin atteinte.
+
+    EN:
+    Frame-by-frame reader of a streaming .dna file. Iterating yields
+    (new genes, blocks, reset); `trailer` is available once the end frame is reached.
+
+    Raises:
+      ValueError: Si le flux est tronqué ou corrompu / If the stream is truncated or corrupted.
+    """
+
+    def __init__(self, reader):
+        """
+        FR: Lit l'en-tête depuis `reader` (fichier binaire).
+        EN: Reads the header from `reader` (binary file).
+        """
+        self.reader = reader
+        self.trailer = None
+        if reader.read(len(STREAM_MAGIC)) != STREAM_MAGIC:
+            raise ValueError("Le fichier .dna est invalide ou corrompu.")
+        try:
+            self.metadata = json.loads(self._read_chunk().decode("utf-8"))
+        except UnicodeDecodeError as e:
+            raise ValueError("Le fichier .dna est invalide ou corrompu.") from e
+        self.codec = self.metadata.get("stream_codec", "none")
+        self.ops = self.metadata.get("mutation_format") == MUTATION_FORMAT
+        self.references = "reference" in self.metadata
+
+    def _read_chunk(self) -> bytes:
+        """
+        FR: Lit un bloc d'octets précédé de sa longueur (varint) depuis le fichier.
+        EN: Reads a length-prefixed (varint) byte string from the file.
+        """
+        length = 0
+        shift = 0
+        while True:
+            byte = self.reader.read(1)
+            if not byte:
+                raise ValueError("Le fichier .dna est invalide ou corrompu.")
+            length |= (byte[0] & 0x7F) << shift
+            if byte[0] < 0x80:
+                break
+            shift += 7
+        payload = self.reader.read(length)
+        if len(payload) != length:
+            raise ValueError("Le fichier .dna est invalide ou corrompu.")
+        return payload
+
+    def __iter__(self):
+        slots = StorageModel._shared_positions(self.metadata)
+        gene_ids = list(slots)
+        while True:
+            kind = self.reader.read(1)
+            if kind == bytes([FRAME_END]):
+                try:
+                    self.trailer = json.loads(self._read_chunk().decode("utf-8"))
+                except UnicodeDecodeError as e:
+                    raise ValueError("Le fichier .dna est invalide ou corrompu.") from e
+                return
+            if kind != bytes([FRAME_BLOCKS]):
+                raise ValueError("Le fichier .dna est invalide ou corrompu.")
+
+            payload = self._read_chunk()
+            try:
+                reset = payload[0] == 1
+                if reset:
+                    slots = StorageModel._shared_positions(self.metadata)
+                    gene_ids = list(slots)
+                genes, pos = StorageModel._read_genes(payload, 1, gene_ids, slots)
+                blocks, _ = StorageModel._read_blocks(payload, pos, gene_ids, self.codec, self.ops,
+                                                      self.references)
+            except (IndexError, UnicodeDecodeError, zlib.error, lzma.LZMAError) as e:
+                raise ValueError("Le fichier .dna est invalide ou corrompu.") from e
+            yield genes, blocks, reset
+
 
 if __name__ == "__main__":
     # Données de test unitaire
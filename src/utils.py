@@ -0,0 +1,113 @@
+# src/utils.py
+
+#------------------------------------------------------------------------------
+
+# Copyright (c) 2025 Rakotondravelo Tahina Mickaël
+# All rights reserved.
+#
+# This file is part of the GENOME_COMPRESSOR project.
+#
+# licensed under the MIT License. You may obtain a copy of the License at:
+# https://opensource.org/licences/MIT
+#------------------------------------------------------------------------------
+
+"""
+FR:
+Fonctions utilitaires partagées par les modules de sérialisation :
+- entiers à longueur variable (varint, LEB128 non signé)
+- compactage de séquences A/C/G/T sur 2 bits par base
+
+Auteur               : Rakotondravelo Tahina Mickaël
+
+
+EN:
+Utility functions shared by the serialization modules:
+- variable-length integers (varint, unsigned LEB128)
+- 2-bit per base packing of A/C/G/T sequences
+
+Author               : Rakotondravelo Tahina Mickaël
+"""
+
+from typing import Tuple
+
+NUCLEOTIDES = "ACGT"
+_BASE_CODES = bytes.maketrans(b"ACGT", b"\x00\x01\x02\x03")
+
+
+def write_varint(out: bytearray, value: int) -> None:
+    """
+    FR: Ajoute un entier positif encodé en varint à `out`.
+    EN: Appends a non-negative integer encoded as a varint to `out`.
+    """
+    if value < 0:
+        raise ValueError("Un varint doit être positif.")
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(buffer, pos: int) -> Tuple[int, int]:
+    """
+    FR: Lit un varint à la position `pos` ; retourne (valeur, position suivante).
+    EN: Reads a varint at position `pos`; returns (value, next position).
+    """
+    result = 0
+    shift = 0
+    while True:
+        byte = buffer[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def write_bytes(out: bytearray, payload: bytes) -> None:
+    """
+    FR: Ajoute un bloc d'octets précédé de sa longueur (varint).
+    EN: Appends a byte string prefixed with its length (varint).
+    """
+    write_varint(out, len(payload))
+    out += payload
+
+
+def read_bytes(buffer, pos: int) -> Tuple[bytes, int]:
+    """
+    FR: Lit un bloc d'octets précédé de sa longueur ; retourne (octets, position suivante).
+    EN: Reads a length-prefixed byte string; returns (bytes, next position).
+    """
+    length, pos = read_varint(buffer, pos)
+    return bytes(buffer[pos:pos + length]), pos + length
+
+
+def is_nucleotide_sequence(sequence: str) -> bool:
+    """
+    FR: Indique si la séquence ne contient que des bases A, C, G, T.
+    EN: Tells whether the sequence only contains A, C, G, T bases.
+    """
+    return sequence.isascii() and not sequence.encode("ascii").translate(None, b"ACGT")
+
+
+def pack_bases(sequence: str) -> bytes:
+    """
+    FR: Compacte une séquence A/C/G/T à raison de 4 bases par octet (poids fort en premier).
+    EN: Packs an A/C/G/T sequence at 4 bases per byte (most significant first).
+    """
+    codes = sequence.encode("ascii").translate(_BASE_CODES)
+    packed = bytearray((len(codes) + 3) // 4)
+    for i, code in enumerate(codes):
+        packed[i >> 2] |= code << (6 - 2 * (i & 3))
+    return bytes(packed)
+
+
+def unpack_bases(packed: bytes, length: int) -> str:
+    """
+    FR: Décompacte `length` bases depuis des octets produits par pack_bases.
+    EN: Unpacks `length` bases from bytes produced by pack_bases.
+    """
+    bases = []
+    for byte in packed:
+        bases.append(NUCLEOTIDES[byte >> 6] + NUCLEOTIDES[(byte >> 4) & 3]
+                     + NUCLEOTIDES[(byte >> 2) & 3] + NUCLEOTIDES[byte & 3])
+    return "".join(bases)[:length]
@@ -0,0 +1,108 @@
+# tests/test_entropy_coder.py
+
+#------------------------------------------------------------------------------
+
+# Copyright (c) 2025 Rakotondravelo Tahina Mickaël
+# All rights reserved.
+#
+# This file is part of the GENOME_COMPRESSOR project.
+#
+# licensed under the MIT License. You may obtain a copy of the License at:
+# https://opensource.org/licences/MIT
+#------------------------------------------------------------------------------
+
+"""
+FR:
+Tests unitaires pour le module entropy_coder.
+
+Ce fichier vérifie :
+- L'aller-retour de chaque codec
+- Le gain du codeur rANS sur un flux déséquilibré
+- L'application des codecs aux fichiers .dna binaires
+
+Auteur               : Rakotondravelo Tahina Mickaël
+
+
+EN:
+Unit tests for the entropy_coder module.
+
+This file verifies:
+- The roundtrip of every codec
+- The rANS coder gain on a skewed stream
+- Codec use in binary .dna files
+
+Author               : Rakotondravelo Tahina Mickaël
+"""
+
+import random
+
+import pytest
+from src.entropy_coder import CODECS, EntropyCoder, RansCoder
+from src.storage_model import StorageModel
+
+
+@pytest.mark.parametrize("codec", CODECS)
+@pytest.mark.parametrize("data", [b"", b"\x07" * 100, bytes(range(256)) * 3])
+def test_roundtrip(codec, data):
+    """
+    FR : Chaque codec restitue exactement les données, y compris vides ou à symbole unique.
+    EN : Every codec restores the data exactly, including empty or single-symbol data.
+    """
+    assert EntropyCoder.decode(EntropyCoder.encode(data, codec), codec) == data
+
+
+def test_rans_compresses_skewed_stream():
+    """
+    FR : Sur un flux très déséquilibré, rANS produit moins d'octets que l'entrée.
+    EN : On a highly skewed stream, rANS outputs fewer bytes than the input.
+    """
+    rng = random.Random(1)
+    data = bytes(rng.choices(range(4), weights=[90, 6, 3, 1], k=5000))
+    encoded = RansCoder.encode(data)
+    assert len(encoded) < len(data) // 3
+    assert RansCoder.decode(encoded) == data
+
+
+def test_unknown_codec():
+    """
+    FR : Un codec inconnu est refusé.
+    EN : An unknown codec is rejected.
+    """
+    with pytest.raises(ValueError):
+        EntropyCoder.encode(b"abc", "brotli")
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_binary_dna_with_codec(tmp_path, codec):
+    """
+    FR : Le codec est choisi par fichier et détecté à la lecture.
+    EN : The codec is selected per file and detected when loading.
+    """
+    data = {
+        "genes": {"G0": "ACGTACGT", "G1": "TTGACCAA"},
+        "blocks": [{"gene": f"G{i % 2}", "mutation": "-" if i % 3 else "Mut_1_A"} for i in range(50)],
+        "metadata": {"original_length": 400, "block_size": 8},
+    }
+    file_path = tmp_path / f"{codec}.dna"
+    StorageModel.save(data, str(file_path), binary=True, codec=codec)
+    loaded = StorageModel.load(str(file_path))
+    assert loaded["blocks"] == data["blocks"]
+    assert loaded["metadata"].get("stream_codec", "none") == codec
+
+
+def test_binary_dna_recoded_without_codec(tmp_path):
+    """
+    FR : Un fichier zlib relu puis réécrit sans codec ne garde pas l'ancien codec.
+    EN : A zlib file read back then rewritten without a codec does not keep the old codec.
+    """
+    data = {
+        "genes": {"G0": "ACGTACGT"},
+        "blocks": [{"gene": "G0", "mutation": "-" if i % 2 else "Mut_3_T"} for i in range(20)],
+        "metadata": {"original_length": 160, "block_size": 8},
+    }
+    StorageModel.save(data, str(tmp_path / "zlib.dna"), binary=True, codec="zlib")
+    StorageModel.save(StorageModel.load(str(tmp_path / "zlib.dna")), str(tmp_path / "none.dna"),
+                      binary=True, codec="none")
+    loaded = StorageModel.load(str(tmp_path / "none.dna"))
+    assert "stream_codec" not in loaded["metadata"]
+    assert loaded["blocks"] == data["blocks"]
@@ -0,0 +1,97 @@
+# tests/test_gene_dictionary.py
+
+#------------------------------------------------------------------------------
+
+# Copyright (c) 2025 Rakotondravelo Tahina Mickaël
+# All rights reserved.
+#
+# This file is part of the GENOME_COMPRESSOR project.
+#
+# licensed under the MIT License. You may obtain a copy of the License at:
+# https://opensource.org/licences/MIT
+#------------------------------------------------------------------------------
+
+"""
+FR:
+Tests unitaires pour le module gene_dictionary.
+
+Ce fichier vérifie :
+- La sauvegarde / relecture d'un dictionnaire et son empreinte
+- La lecture unique d'un fichier par processus
+- La recherche par empreinte dans DICTIONARY_PATHS
+- La résolution des gènes "D<i>"
+
+Auteur               : Rakotondravelo Tahina Mickaël
+
+
+EN:
+Unit tests for the gene_dictionary module.
+
+This file verifies:
+- Saving / reading back a dictionary and its digest
+- Reading a file once per process
+- Lookup by digest in DICTIONARY_PATHS
+- Resolution of "D<i>" genes
+
+Author               : Rakotondravelo Tahina Mickaël
+"""
+
+import pytest
+from src import gene_dictionary
+from src.gene_dictionary import GeneDictionary, shared_ids
+from src.reference_index import SharedGenes, resolve_genes
+
+
+def test_save_and_load(tmp_path):
+    """
+    FR : Le dictionnaire relu a les mêmes gènes et la même empreinte, et n'est lu qu'une fois.
+    EN : The reloaded dictionary has the same genes and digest, and is read only once.
+    """
+    dictionary = GeneDictionary(["ACGTAC", "TTTTGG", "ACGN"])
+    assert dictionary.genes == {"D0": "ACGTAC", "D1": "TTTTGG", "D2": "ACGN"}
+    dictionary.save(str(tmp_path / "genes.dnadict"))
+    gene_dictionary._loaded.clear()
+
+    loaded = GeneDictionary.load(str(tmp_path / "genes.dnadict"))
+    assert (loaded.genes, loaded.digest) == (dictionary.genes, dictionary.digest)
+    assert GeneDictionary.load(str(tmp_path / "genes.dnadict")) is loaded
+    assert GeneDictionary(["TTTTGG", "ACGTAC"]).digest != dictionary.digest
+
+    (tmp_path / "bad.dnadict").write_bytes(b"DNAD\x02\x01\x10")
+    with pytest.raises(ValueError):
+        GeneDictionary.load(str(tmp_path / "bad.dnadict"))
+
+
+def test_get_searches_dictionary_paths(tmp_path, monkeypatch):
+    """
+    FR : Un dictionnaire absent est cherché sous "<empreinte>.dnadict" dans DICTIONARY_PATHS.
+    EN : A missing dictionary is looked up as "<digest>.dnadict" in DICTIONARY_PATHS.
+    """
+    dictionary = GeneDictionary(["AAAACCCC", "GGGGTTTT"])
+    dictionary.save_to(str(tmp_path))
+    gene_dictionary._loaded.clear()
+    with pytest.raises(ValueError):
+        GeneDictionary.get(dictionary.digest)
+
+    monkeypatch.setattr(gene_dictionary, "DICTIONARY_PATHS", [str(tmp_path)])
+    assert GeneDictionary.get(dictionary.digest).genes == dictionary.genes
+
+
+def test_dictionary_genes_resolution():
+    """
+    FR : Les gènes "D<i>" forment le préfixe implicite de la table et sont lus dans le
+    dictionnaire sans être stockés.
+    EN : "D<i>" genes form the implicit prefix of the table and are read from the
+    dictionary without being stored.
+    """
+    dictionary = GeneDictionary(["ACGT", "CCGG"])
+    metadata = {"dictionary": dictionary.metadata()}
+    assert shared_ids(metadata) == ["D0", "D1"]
+    assert shared_ids({}) == []
+
+    genes = resolve_genes({"G_dyn_0": "TTTT"}, metadata)
+    assert isinstance(genes, SharedGenes)
+    assert (genes["D1"], genes["G_dyn_0"]) == ("CCGG", "TTTT")
+    assert dict(genes) == {"G_dyn_0": "TTTT"}
+    with pytest.raises(KeyError):
+        genes["D2"]
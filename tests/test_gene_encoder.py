@@ -115,3 +115,30 @@ def test_decode_dna():
     decode = encoder.decode_dna(dna)
     assert decode == motif
 
+
+def test_encode_decode_bytes_tables():
+
+    """
+    FR:
+    Vérifie que les tables d'octets donnent le même ADN que la conversion bit à bit,
+    acceptent bytes et memoryview, et rejettent une séquence invalide.
+
+    EN:
+    Checks that the byte tables give the same DNA as the bit-by-bit conversion,
+    accept bytes and memoryview, and reject an invalid sequence.
+    """
+    encoder = GeneEncoder()
+    data = bytes(range(256))
+    bases = GeneEncoder.encode_bytes(memoryview(data))
+    bit_by_bit = encoder._binary_to_dna("".join(encoder._char_to_binary(chr(b)) for b in data))
+    assert bases.decode("ascii") == bit_by_bit
+    assert GeneEncoder.decode_bytes(memoryview(bases)) == data
+    assert GeneEncoder.encode_bytes(b"") == GeneEncoder.decode_bytes(b"") == b""
+
+    for invalid in (b"ACG", b"ACGN"):
+        with pytest.raises(ValueError):
+            GeneEncoder.decode_bytes(invalid)
+
+    # Hors Latin-1 : conversion bit à bit conservée / beyond Latin-1: bit-by-bit kept
+    assert encoder.encode_motif("é") == encoder.encode_bytes(b"\xe9").decode("ascii")
+    assert encoder.encode_motif("\u0200") == "GAAAA"
@@ -0,0 +1,191 @@
+# tests/test_gene_index.py
+
+#------------------------------------------------------------------------------
+
+# Copyright (c) 2025 Rakotondravelo Tahina Mickaël
+# All rights reserved.
+#
+# This file is part of the GENOME_COMPRESSOR project.
+#
+# licensed under the MIT License. You may obtain a copy of the License at:
+# https://opensource.org/licences/MIT
+#------------------------------------------------------------------------------
+
+"""
+FR:
+Tests unitaires pour le module gene_index.
+
+Ce fichier vérifie :
+- Qu'aucun gène à distance <= max_mutations n'est omis des candidats
+- Que les gènes trop éloignés sont écartés
+- Que l'ordre d'insertion des gènes est conservé
+
+Auteur               : Rakotondravelo Tahina Mickaël
+
+
+EN:
+Unit tests for the gene_index module.
+
+This file verifies:
+- That no gene within max_mutations is missing from the candidates
+- That distant genes are filtered out
+- That gene insertion order is preserved
+
+Author               : Rakotondravelo Tahina Mickaël
+"""
+
+import random
+
+import pytest
+from src import gene_index
+from src.gene_index import GeneIndex, GeneMatrix
+from src.mutation_encoder import MutationEncoder, SEPARATOR
+
+
+def mutation_count(sequence, gene):
+    return sum(1 for m in MutationEncoder().encode_mutation(sequence, gene).split(SEPARATOR) if m != "-")
+
+
+def test_candidates_never_miss_a_close_gene():
+    """
+    FR : Tout gène à <= max_mutations mutations figure parmi les candidats.
+    EN : Every gene within max_mutations mutations is among the candidates.
+    """
+    rng = random.Random(7)
+    index = GeneIndex(max_mutations=2)
+    genes = {}
+    for i in range(200):
+        gene = "".join(rng.choice("ACGT") for _ in range(rng.randint(6, 9)))
+        genes[f"G{i}"] = gene
+        index.add(f"G{i}", gene)
+
+    for _ in range(200):
+        query = "".join(rng.choice("ACGT") for _ in range(8))
+        candidates = set(index.candidates(query))
+        for gene_id, gene in genes.items():
+            if mutation_count(query, gene) <= 2:
+                assert gene_id in candidates
+
+
+def test_min_segment_keeps_lookup_selective():
+    """
+    FR : Avec des segments d'au moins 4 bases, les candidats sont une petite partie des
+    gènes, et tout gène à <= len // 4 - 1 mutations reste trouvé.
+    EN : With segments of at least 4 bases, candidates are a small share of the genes,
+    and every gene within len // 4 - 1 mutations is still found.
+    """
+    rng = random.Random(9)
+    index = GeneIndex(max_mutations=6, min_segment=4)
+    genes = {}
+    for i in range(2000):
+        gene = "".join(rng.choice("ACGT") for _ in range(12))
+        genes[f"G{i}"] = gene
+        index.add(f"G{i}", gene)
+
+    total = 0
+    for _ in range(100):
+        query = "".join(rng.choice("ACGT") for _ in range(12))
+        candidates = set(index.candidates(query))
+        total += len(candidates)
+        for gene_id, gene in genes.items():
+            if mutation_count(query, gene) <= 2:
+                assert gene_id in candidates
+    assert total < 0.05 * 100 * len(genes)
+
+def test_candidates_filter_and_order():
+    """
+    FR : Les gènes sans segment commun sont écartés, l'ordre d'insertion est conservé.
+    EN : Genes without a shared segment are dropped, insertion order is kept.
+    """
+    index = GeneIndex(max_mutations=1)
+    index.add("G0", "TTTTTTTT")
+    index.add("G1", "ACGTACGA")
+    index.add("G2", "ACGTACGT")
+    assert index.candidates("ACGTACGT") == ["G1", "G2"]
+
+
+def test_find_closest_gene_with_index():
+    """
+    FR : find_closest_gene retourne le même résultat avec ou sans index.
+    EN : find_closest_gene returns the same result with or without an index.
+    """
+    genes = {"G0": "TTTTTTTT", "G1": "ACGTACGA", "G2": "ACGTACGT"}
+    index = GeneIndex(max_mutations=2)
+    for gene_id, gene in genes.items():
+        index.add(gene_id, gene)
+    encoder = MutationEncoder()
+    assert encoder.find_closest_gene("ACGTACGT", genes, 2, index=index) == \
+        encoder.find_closest_gene("ACGTACGT", genes, 2)
+
+
+@pytest.mark.skipif(gene_index.np is None, reason="NumPy non installé")
+def test_gene_matrix_matches_pigeonhole():
+    """
+    FR : GeneMatrix retourne exactement les gènes sous le seuil, malgré l'agrandissement.
+    EN : GeneMatrix returns exactly the genes under the threshold, despite growth.
+    """
+    rng = random.Random(3)
+    matrix = GeneMatrix(max_mutations=2)
+    genes = {}
+    for i in range(100):
+        gene = "".join(rng.choice("ACGT") for _ in range(rng.randint(7, 9)))
+        genes[f"G{i}"] = gene
+        matrix.add(f"G{i}", gene)
+
+    for _ in range(50):
+        query = "".join(rng.choice("ACGT") for _ in range(8))
+        expected = [g for g, seq in genes.items() if mutation_count(query, seq) <= 2]
+        assert matrix.candidates(query) == expected
+
+
+def test_shifted_candidates_never_miss_an_aligned_gene():
+    """
+    FR : Avec un décalage, tout gène à <= max_mutations éditions figure parmi les candidats.
+    EN : With a shift, every gene within max_mutations edits is among the candidates.
+    """
+    rng = random.Random(11)
+    index = GeneIndex(max_mutations=2)
+    aligner = MutationEncoder(band=2)
+    genes = {}
+    for i in range(200):
+        gene = "".join(rng.choice("ACGT") for _ in range(rng.randint(7, 9)))
+        genes[f"G{i}"] = gene
+        index.add(f"G{i}", gene)
+
+    for _ in range(200):
+        query = "".join(rng.choice("ACGT") for _ in range(8))
+        candidates = set(index.candidates(query, shift=2))
+        for gene_id, gene in genes.items():
+            if aligner.mutation_distance(query, gene, 2) <= 2:
+                assert gene_id in candidates
+
+
+@pytest.mark.parametrize("index_class", [GeneIndex, GeneMatrix])
+def test_remove_forgets_evicted_genes(index_class):
+    """
+    FR : Un gène retiré n'est plus candidat ; les autres gardent leur ordre d'insertion.
+    EN : A removed gene is no longer a candidate; the others keep their insertion order.
+    """
+    if index_class is GeneMatrix and gene_index.np is None:
+        pytest.skip("NumPy non installé")
+    rng = random.Random(5)
+    index = index_class(max_mutations=2)
+    genes = {}
+    for i in range(60):
+        gene = "".join(rng.choice("ACGT") for _ in range(8))
+        genes[f"G{i}"] = gene
+        index.add(f"G{i}", gene)
+        index.candidates(gene)  # construit les tables avant les retraits
+    for i in range(0, 60, 3):
+        index.remove(f"G{i}")
+        del genes[f"G{i}"]
+    index.add("G60", genes["G1"])
+    genes["G60"] = genes["G1"]
+    order = list(genes)
+
+    for _ in range(50):
+        query = "".join(rng.choice("ACGT") for _ in range(8))
+        candidates = index.candidates(query)
+        assert set(candidates) <= set(genes)
+        assert candidates == sorted(candidates, key=order.index)
+        assert {g for g, seq in genes.items() if mutation_count(query, seq) <= 2} <= set(candidates)
@@ -38,8 +38,19 @@ Author                  : Rakotondravelo Tahina Mickaël
 """
 
 
+import functools
+import io
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor
 import pytest
+from src import genome_compressor
+from src.gene_encoder import GeneEncoder
 from src.genome_compressor import GenomeCompressor
+from src.genome_decoder import GenomeDecoder
+from src.mutation_ops import MutationOps
+from src.reference_index import ReferenceIndex
+from src.storage_model import DnaStreamReader, StorageModel
 
 def test_compress_structure():
     """
@@ -68,7 +79,7 @@ def test_compress_block_size():
     Vérifie que chaque bloc compressé contient un clé 'gene' et une mutation valide.
 
     EN:
-    Checks that each compressed block containts a 'gene' key and a valid mutation string.
+    Checks that each compressed block containts a 'gene' key and a valid mutation (MutationOps).
     """
     seq = "ACGTACGTACGTACGTACGTACGTACGTACGT"
     block_size = 8
@@ -78,7 +89,7 @@ def test_compress_block_size():
     for block in result["blocks"]:
         assert "gene" in block 
         assert "mutation" in block
-        assert isinstance(block["mutation"], str) or block["mutation"] is None
+        assert isinstance(block["mutation"], MutationOps)
 
 def test_compress_non_empty_genes():
     """
@@ -118,4 +129,329 @@ def test_save_to_dna(tmp_path):
     assert '"genes":' in content
     assert '"blocks":' in content
     assert '"metadata":' in content
-    
\ No newline at end of file
+    
+
+def test_compress_stream_roundtrip(tmp_path):
+    """
+    FR:
+    Vérifie que la compression en flux (petits morceaux, dictionnaire borné) se décode
+    vers la séquence d'origine, blancs de bord exclus.
+
+    EN:
+    Checks that streaming compression (small chunks, bounded dictionary) decodes back
+    to the original sequence, edge whitespace excluded.
+    """
+    random.seed(3)
+    seq = "".join(random.choice("ACGT") for _ in range(3000))
+    output_file = tmp_path / "stream.dna"
+    compressor = GenomeCompressor(block_size=8)
+    with open(output_file, "wb") as f:
+        length = compressor.compress_stream(io.StringIO("\n" + seq + "\n"), f, chunk_size=100, max_genes=20)
+
+    assert length == len(seq)
+    loaded = StorageModel.load(str(output_file))
+    assert loaded["metadata"]["original_length"] == len(seq)
+    assert GenomeDecoder.decode(loaded) == seq
+
+
+def test_compress_stream_rejects_tiny_dictionary():
+    """
+    FR: Vérifie qu'un dictionnaire plus petit que les gènes initiaux est refusé.
+    EN: Checks that a dictionary smaller than the seed genes is rejected.
+    """
+    with pytest.raises(ValueError):
+        GenomeCompressor(block_size=4).compress_stream(io.StringIO("ACGT"), io.BytesIO(), max_genes=5)
+
+
+@pytest.mark.parametrize("eviction", ["lru", "lfu", "reset"])
+def test_compress_bounded_dictionary(eviction):
+    """
+    FR: Vérifie qu'avec `max_genes`, le dictionnaire de recherche reste borné et que
+    tous les gènes (évincés compris) restent dans la sortie, qui se décode.
+
+    EN: Checks that with `max_genes` the search dictionary stays bounded and that
+    every gene (evicted ones included) stays in the output, which decodes.
+    """
+    random.seed(8)
+    seq = "".join(random.choice("ACGT") for _ in range(4000))
+    compressor = GenomeCompressor(block_size=8, max_genes=16, eviction=eviction)
+    sizes = []
+    encode_blocks = compressor._encode_blocks
+
+    def tracked(blocks, start, genes, *args, **kwargs):
+        result = encode_blocks(blocks, start, genes, *args, **kwargs)
+        sizes.append(len(genes))
+        return result
+
+    compressor._encode_blocks = tracked
+    compressed = compressor.compress(seq)
+
+    assert max(sizes) <= 16
+    assert len(compressed["genes"]) > 16
+    assert compressed["metadata"]["max_genes"] == 16
+    assert compressed["metadata"]["gene_eviction"] == eviction
+    assert GenomeDecoder.decode(compressed) == seq
+
+
+def test_compress_stream_reuses_evicted_ids(tmp_path):
+    """
+    FR: Vérifie qu'en flux, les identifiants évincés sont réutilisés sans trame de
+    réinitialisation, et que tous les lecteurs décodent le résultat.
+
+    EN: Checks that when streaming, evicted identifiers are reused without any reset
+    frame, and that every reader decodes the result.
+    """
+    random.seed(9)
+    seq = "".join(random.choice("ACGT") for _ in range(3000))
+    output_file = tmp_path / "stream.dna"
+    with open(output_file, "wb") as f:
+        GenomeCompressor(block_size=8, eviction="lfu").compress_stream(io.StringIO(seq), f, chunk_size=200,
+                                                                       max_genes=20)
+
+    with open(output_file, "rb") as f:
+        frames = list(DnaStreamReader(f))
+    assert [reset for _, _, reset in frames].count(True) == 1
+    sent = [gene_id for genes, _, _ in frames for gene_id in genes]
+    assert len(sent) > len(set(sent))
+    assert "".join(GenomeDecoder.iter_decode(str(output_file))) == seq
+    assert GenomeDecoder.decode(StorageModel.load(str(output_file))) == seq
+
+
+def test_compress_rejects_unknown_eviction():
+    """
+    FR: Vérifie qu'une politique d'éviction inconnue est refusée.
+    EN: Checks that an unknown eviction policy is rejected.
+    """
+    with pytest.raises(ValueError):
+        GenomeCompressor(eviction="fifo")
+
+
+@pytest.mark.parametrize("binary, mapped", [(False, False), (True, False), (False, True)])
+def test_compress_separator_characters(tmp_path, binary, mapped):
+    """
+    FR: Vérifie qu'une entrée contenant "|", "_" et "-" se relit depuis chaque format.
+    EN: Checks that an input holding "|", "_" and "-" reads back from every format.
+    """
+    seq = "ACGTACGT" * 3 + "ACG|ACGT" + "ACGTACGT" + "AC_TA-GT"
+    compressor = GenomeCompressor(block_size=8, gene_alphabet="raw")
+    output_file = str(tmp_path / "special.dna")
+    StorageModel.save(compressor.compress(seq), output_file, binary=binary, mapped=mapped)
+    assert GenomeDecoder.decode(StorageModel.load(output_file)) == seq
+    assert GenomeDecoder.decode_range(output_file, 20, 50) == seq[20:50]
+
+    stream_file = tmp_path / "special_stream.dna"
+    with open(stream_file, "wb") as f:
+        compressor.compress_stream(io.StringIO(seq), f)
+    assert "".join(GenomeDecoder.iter_decode(str(stream_file))) == seq
+
+
+@pytest.mark.parametrize("binary, mapped", [(False, False), (True, False), (False, True)])
+def test_compress_against_reference(tmp_path, binary, mapped):
+    """
+    FR: Vérifie qu'avec un génome de référence, les blocs proches deviennent des gènes
+    "R<position>" non stockés, et que le fichier se décode (région comprise).
+
+    EN: Checks that with a reference genome, close blocks become unstored
+    "R<position>" genes, and that the file decodes (region included).
+    """
+    random.seed(10)
+    reference = "".join(random.choice("ACGT") for _ in range(5000))
+    sample = list(reference)
+    for i in range(0, len(sample), 37):
+        sample[i] = random.choice("ACGT")
+    sample = "".join(sample[:2000]) + "GGGCCC" + "".join(sample[2000:]) + "T" * 40
+    compressor = GenomeCompressor(block_size=24, reference=ReferenceIndex(reference, k=8))
+    compressed = compressor.compress(sample)
+
+    assert compressed["metadata"]["reference"]["length"] == len(reference)
+    assert sum(block["gene"].startswith("R") for block in compressed["blocks"]) > 0.9 * len(compressed["blocks"])
+    assert len(compressed["genes"]) < 5
+    assert GenomeDecoder.decode(compressed) == sample
+
+    output_file = str(tmp_path / "sample.dna")
+    StorageModel.save(compressed, output_file, binary=binary, mapped=mapped)
+    assert GenomeDecoder.decode(StorageModel.load(output_file)) == sample
+    assert "".join(GenomeDecoder.iter_decode(output_file)) == sample
+    assert GenomeDecoder.decode_range(output_file, 1990, 2030) == sample[1990:2030]
+
+    # Blocs plus courts que k : l'index de la référence ne serait jamais consulté
+    with pytest.raises(ValueError):
+        GenomeCompressor(block_size=6, reference=ReferenceIndex(reference, k=8))
+
+
+@pytest.mark.parametrize("binary, mapped", [(False, False), (True, False), (False, True)])
+def test_compress_with_trained_dictionary(tmp_path, binary, mapped):
+    """
+    FR: Vérifie qu'un dictionnaire entraîné sur des échantillons proches est partagé :
+    ses gènes "D<i>" ne sont pas stockés, et le fichier se décode (flux compris).
+
+    EN: Checks that a dictionary trained on close samples is shared: its "D<i>" genes
+    are not stored, and the file decodes (stream included).
+    """
+    random.seed(11)
+    base = "".join(random.choice("ACGT") for _ in range(3000))
+
+    def variant():
+        sample = list(base)
+        for i in range(0, len(sample), 50):
+            sample[i] = random.choice("ACGT")
+        return "".join(sample)
+
+    dictionary = GenomeCompressor(block_size=8).train_dictionary([variant(), variant()], size=64)
+    assert len(dictionary) <= 64
+    sample = variant() + "GGGGCCCCAT"
+    compressor = GenomeCompressor(block_size=8, dictionary=dictionary)
+    compressed = compressor.compress(sample)
+
+    assert compressed["metadata"]["dictionary"] == dictionary.metadata()
+    assert not any(gene_id.startswith("D") for gene_id in compressed["genes"])
+    assert any(block["gene"].startswith("D") for block in compressed["blocks"])
+    assert GenomeDecoder.decode(compressed) == sample
+
+    output_file = str(tmp_path / "sample.dna")
+    StorageModel.save(compressed, output_file, binary=binary, mapped=mapped)
+    assert GenomeDecoder.decode(StorageModel.load(output_file)) == sample
+    assert GenomeDecoder.decode_range(output_file, 95, 130) == sample[95:130]
+
+    stream_file = tmp_path / "stream.dna"
+    with open(stream_file, "wb") as f:
+        compressor.compress_stream(io.StringIO(sample), f, chunk_size=300, max_genes=80)
+    assert "".join(GenomeDecoder.iter_decode(str(stream_file))) == sample
+    assert GenomeDecoder.decode(StorageModel.load(str(stream_file))) == sample
+
+    with pytest.raises(ValueError):
+        GenomeCompressor(block_size=8, dictionary=dictionary, max_genes=len(dictionary))
+
+
+def test_compress_progress_hook():
+    """
+    FR: Vérifie que le suivi de progression reçoit au total le nombre de blocs encodés.
+    EN: Checks that the progress hook receives the total number of encoded blocks.
+    """
+    seq = "ACGTTGCA" * 1100 + "ACG"
+    updates = []
+    result = GenomeCompressor(block_size=4).compress(seq, progress=updates.append)
+
+    assert sum(updates) == len(result["blocks"]) == 2201
+    assert len(updates) > 1
+
+
+def test_compress_parallel_segments(monkeypatch):
+    """
+    FR:
+    Vérifie la compression parallèle : table des segments, identifiants préfixés par
+    segment et décodage identique à la séquence d'origine.
+
+    EN:
+    Checks parallel compression: segment table, per-segment gene id prefixes and
+    decoding back to the original sequence.
+    """
+    monkeypatch.setattr(genome_compressor, "MIN_SEGMENT_SIZE", 64)
+    random.seed(5)
+    seq = "".join(random.choice("ACGT") for _ in range(1000))
+    result = GenomeCompressor(block_size=8, workers=3).compress(seq)
+
+    segments = result["metadata"]["segments"]
+    assert [s["offset"] for s in segments] == [0, 336, 672]
+    assert sum(s["length"] for s in segments) == len(seq)
+    assert sum(s["blocks"] for s in segments) == len(result["blocks"])
+    assert all(gene_id.startswith(("S0_", "S1_", "S2_")) for gene_id in result["genes"])
+    assert GenomeDecoder.decode(result) == seq
+
+
+def test_compress_parallel_shared_reference_spawn(monkeypatch):
+    """
+    FR: Vérifie que des workers lancés par "spawn" reçoivent la référence par leur
+    initialisation (et non avec chaque segment), et que les métadonnées parallèles
+    indiquent le dictionnaire borné comme en séquentiel.
+    EN: Checks that workers started by "spawn" receive the reference through their
+    initializer (not with every segment), and that the parallel metadata records the
+    bounded dictionary as the sequential path does.
+    """
+    monkeypatch.setattr(genome_compressor, "MIN_SEGMENT_SIZE", 256)
+    monkeypatch.setattr(genome_compressor, "ProcessPoolExecutor",
+                        functools.partial(ProcessPoolExecutor, mp_context=multiprocessing.get_context("spawn")))
+    rng = random.Random(8)
+    reference = "".join(rng.choice("ACGT") for _ in range(2000))
+    seq = reference[:1200].replace("ACG", "ACT")
+    compressor = GenomeCompressor(block_size=12, workers=3, max_genes=32,
+                                  reference=ReferenceIndex(reference, k=12))
+    result = compressor.compress(seq)
+
+    metadata = result["metadata"]
+    assert len(metadata["segments"]) == 3
+    assert metadata["max_genes"] == 32 and metadata["gene_eviction"] == "lru"
+    assert "reference" in metadata
+    assert GenomeDecoder.decode(result) == seq
+
+
+def test_compress_banded_alignment():
+    """
+    FR: Vérifie qu'avec l'alignement en bande, des copies décalées par des indels
+    réutilisent les gènes existants, et que le décodage reste exact.
+    EN: Checks that with banded alignment, copies shifted by indels reuse existing
+    genes, and that decoding stays exact.
+    """
+    random.seed(3)
+    motif = "".join(random.choice("ACGT") for _ in range(160))
+    copies = [motif]
+    for _ in range(7):
+        copy = list(motif)
+        for _ in range(4):
+            position = random.randrange(len(copy))
+            if random.random() < 0.5:
+                copy.insert(position, random.choice("ACGT"))
+            else:
+                copy.pop(position)
+        copies.append("".join(copy))
+    seq = "".join(copies)
+
+    plain = GenomeCompressor(block_size=16).compress(seq)
+    aligned = GenomeCompressor(block_size=16, band=2).compress(seq)
+    assert len(aligned["genes"]) < len(plain["genes"])
+    assert GenomeDecoder.decode(aligned) == seq
+
+
+def test_compress_raw_gene_alphabet(tmp_path):
+    """
+    FR: Vérifie qu'en alphabet brut les gènes initiaux sont les motifs eux-mêmes, que
+    les blocs y font référence et que le format est indiqué dans les métadonnées.
+    EN: Checks that with the raw alphabet the seed genes are the motifs themselves,
+    that blocks reference them and that the form is recorded in the metadata.
+    """
+    seq = "ACGTTGCA" * 40 + "ACGTTGCT" * 5
+    dna = GenomeCompressor(block_size=8).compress(seq)
+    raw = GenomeCompressor(block_size=8, gene_alphabet="raw").compress(seq)
+
+    assert raw["genes"]["G0"] == "ACGTTGCA"
+    assert dna["genes"]["G0"] == GeneEncoder().encode_motif("ACGTTGCA")
+    assert {block["gene"] for block in raw["blocks"]} == {"G0"}
+    assert len(raw["genes"]) <= len(dna["genes"]) - 1
+    assert raw["metadata"]["gene_alphabet"] == "raw"
+
+    path = tmp_path / "raw.dna"
+    StorageModel.save(raw, str(path), binary=True)
+    assert GenomeDecoder.decode(StorageModel.load(str(path))) == seq
+
+    with pytest.raises(ValueError):
+        GenomeCompressor(gene_alphabet="utf8")
+
+
+def test_compress_exact_matches_skip_search(monkeypatch):
+    """
+    FR: Vérifie que les blocs identiques à un gène sont résolus sans recherche approchée,
+    avec une mutation vide.
+    EN: Checks that blocks identical to a gene are resolved without approximate search,
+    with an empty mutation.
+    """
+    compressor = GenomeCompressor(block_size=8, gene_alphabet="raw")
+    searched = []
+    find = compressor.mutation_encoder.find_closest_gene
+    monkeypatch.setattr(compressor.mutation_encoder, "find_closest_gene",
+                        lambda block, *args, **kwargs: searched.append(block) or find(block, *args, **kwargs))
+    seq = "ACGTTGCA" * 20 + "TTTTTTTT" + "ACGTTGCA" * 5 + "TTTTTTTT"
+    result = compressor.compress(seq)
+
+    assert searched == ["TTTTTTTT"]
+    assert all(block["mutation"] == MutationOps() for block in result["blocks"])
+    assert GenomeDecoder.decode(result) == seq
@@ -20,6 +20,8 @@ Ce fichier vérifie la capacité du décodeur à :
 - Reconstruire une séquence à partir d'un fichier .dna
 - Appliquer correctement différents types de mutations (substitution, insertion, suppression)
 - Gérer les cas sans mutation ou avec mutation invalides
+- Décoder bloc par bloc vers un fichier (y compris le format en flux)
+- Extraire une région sans tout décoder
 
 Auteur              : Rakotondravelo Tahina Mickaël
 
@@ -32,13 +34,25 @@ This file verifies the decoder's ability to:
 - Reconstruct a sequence from a .dna file
 - Correctly apply different types of mutation (substitution, insertion, deletion)
 - Handle cases without mutation or with invalid mutation
+- Decode block by block into a file (including the streaming format)
+- Extract a region without decoding everything
 
 
 Author               : Rakotondravelo Tahina Mickaël
 """
 
+import functools
+import io
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor
+
 import pytest
+from src.genome_compressor import GenomeCompressor
+from src import genome_decoder
 from src.genome_decoder import GenomeDecoder
+from src.mutation_ops import OP_DEL, OP_INS, MutationOps
+from src.reference_index import ReferenceIndex
 from src.storage_model import StorageModel
 
 @pytest.fixture
@@ -131,5 +145,174 @@ def test_decode_with_invalide_mutation():
     assert result == "ACGT" # L'instruction est ignoree
 
 
+def test_iter_decode_and_decode_to_file(tmp_path, sample_dna_data):
+    """
+    FR: Vérifie le décodage bloc par bloc et l'écriture directe dans un fichier.
+    EN: Checks block-by-block decoding and direct writing to a file.
+    """
+    sample_dna_data["blocks"] = [{"gene": "G0", "mutation": "-"}, {"gene": "G0", "mutation": "Mut_0_T"}]
+    assert list(GenomeDecoder.iter_decode(sample_dna_data)) == ["ACGTACGT", "TCGTACGT"]
+
+    dna_path = tmp_path / "data.dna"
+    StorageModel.save(sample_dna_data, str(dna_path), binary=True)
+    output_path = tmp_path / "out.txt"
+    written = GenomeDecoder.decode_to_file(str(dna_path), str(output_path))
+    assert written == 16
+    assert output_path.read_text() == "ACGTACGTTCGTACGT"
+
+
+def test_iter_decode_stream_file(tmp_path):
+    """
+    FR: Vérifie le décodage d'un fichier en flux dont le dictionnaire est réinitialisé.
+    EN: Checks decoding of a streaming file whose dictionary is reset.
+    """
+    seq = "ACGTTGCA" * 40 + "GGGGCCCC" * 40
+    dna_path = tmp_path / "stream.dna"
+    with open(dna_path, "wb") as f:
+        GenomeCompressor(block_size=8).compress_stream(io.StringIO(seq), f, chunk_size=64, max_genes=6)
+
+    assert "".join(GenomeDecoder.iter_decode(str(dna_path))) == seq
+    assert GenomeDecoder.decode_from_file(str(dna_path)) == seq
+
+
 if __name__ == "__main__":
     pytest.main()
+
+
+def test_block_length_matches_decoding():
+    """
+    FR: Vérifie que la longueur calculée depuis les indels égale celle du bloc décodé.
+    EN: Checks that the length computed from indels equals that of the decoded block.
+    """
+    for mutation in ["-", "Mut_1_T", "Ins_2_T", "Ins_9_T", "Del_0|Del_0", "Ins_4_A|Ins_5_C",
+                     "Del_7|Ins_0_G", "Mut_1_AB", "Mut_X_Y"]:
+        assert GenomeDecoder.block_length("ACGT", mutation) == len(GenomeDecoder._decode_block("ACGT", mutation))
+
+
+def test_decode_to_file_parallel(tmp_path, monkeypatch):
+    """
+    FR: Vérifie le décodage parallèle (écriture positionnée, puis repli non ASCII).
+    EN: Checks parallel decoding (positioned writes, then the non-ASCII fallback).
+    """
+    monkeypatch.setattr(genome_decoder, "RANGE_BLOCKS", 16)
+    seq = "ACGTTGCAAC" * 30 + "GGATCC" * 20
+    data = GenomeCompressor(block_size=8).compress(seq)
+    output_path = tmp_path / "out.txt"
+
+    assert GenomeDecoder.decode_to_file(data, str(output_path), workers=2) == len(seq)
+    assert output_path.read_text() == seq
+
+    data["genes"]["G_accent"] = "é"
+    data["blocks"].append({"gene": "G_accent", "mutation": "-"})
+    GenomeDecoder.decode_to_file(data, str(output_path), workers=2)
+    assert output_path.read_text(encoding="utf-8") == seq + "é"
+
+
+@pytest.mark.parametrize("container", ["indexed", "mapped"])
+def test_decode_to_file_parallel_from_file(tmp_path, monkeypatch, container):
+    """
+    FR: Vérifie le décodage parallèle d'un fichier binaire indexé ou v3, dont les
+    workers lisent eux-mêmes les blocs sans chargement par le processus principal,
+    puis le repli séquentiel pour une sortie non ASCII.
+    EN: Checks parallel decoding of an indexed binary or v3 file, whose workers read
+    the blocks themselves without a load by the main process, then the sequential
+    fallback for a non-ASCII output.
+    """
+    monkeypatch.setattr(genome_decoder, "RANGE_BLOCKS", 16)
+    seq = "ACGTTGCAAC" * 30 + "GGATCTTC" * 20
+    data = GenomeCompressor(block_size=8, gene_alphabet="raw").compress(seq)
+    input_path = str(tmp_path / "sample.dna")
+    output_path = tmp_path / "out.txt"
+
+    def save(data):
+        if container == "mapped":
+            StorageModel.save(data, input_path, mapped=True)
+        else:
+            with open(input_path, "wb") as f:
+                f.write(StorageModel.encode_binary(data, index_step=8))
+
+    save(data)
+    monkeypatch.setattr(StorageModel, "load", lambda filename: pytest.fail("fichier chargé en entier"))
+    assert GenomeDecoder.decode_to_file(input_path, str(output_path), workers=2) == len(seq)
+    assert output_path.read_text() == seq
+    monkeypatch.undo()
+
+    data["genes"]["G_accent"] = "é"
+    data["blocks"].insert(3, {"gene": "G_accent", "mutation": "-"})
+    save(data)
+    expected = seq[:24] + "é" + seq[24:]
+    assert GenomeDecoder.decode_to_file(input_path, str(output_path), workers=2) == len(expected)
+    assert output_path.read_text(encoding="utf-8") == expected
+
+
+@pytest.mark.parametrize("shared", ["reference", "dictionary"])
+def test_decode_to_file_parallel_spawn(tmp_path, monkeypatch, shared):
+    """
+    FR: Vérifie que des workers lancés par "spawn" (sans l'état du processus parent)
+    décodent un fichier compressé par référence ou avec un dictionnaire partagé.
+    EN: Checks that workers started by "spawn" (without the parent process state)
+    decode a file compressed against a reference or with a shared dictionary.
+    """
+    monkeypatch.setattr(genome_decoder, "RANGE_BLOCKS", 16)
+    monkeypatch.setattr(genome_decoder, "ProcessPoolExecutor",
+                        functools.partial(ProcessPoolExecutor, mp_context=multiprocessing.get_context("spawn")))
+    rng = random.Random(5)
+    reference = "".join(rng.choice("ACGT") for _ in range(2000))
+    seq = reference[:1000].replace("ACG", "ACT") + "GGGGCCCCTTTT"
+    if shared == "reference":
+        compressor = GenomeCompressor(block_size=12, reference=ReferenceIndex(reference, k=12))
+    else:
+        dictionary = GenomeCompressor(block_size=12).train_dictionary([reference], size=64)
+        compressor = GenomeCompressor(block_size=12, dictionary=dictionary)
+    data = compressor.compress(seq)
+    assert shared in data["metadata"]
+    input_path = str(tmp_path / "sample.dna")
+    StorageModel.save(data, input_path, binary=True)
+
+    output_path = tmp_path / "out.txt"
+    assert GenomeDecoder.decode_to_file(input_path, str(output_path), workers=2) == len(seq)
+    assert output_path.read_text() == seq
+
+def test_decode_range(tmp_path):
+    """
+    FR: Vérifie l'extraction d'une région, avec index (binaire) et sans index (JSON),
+    y compris à travers des blocs mutés par insertion ou suppression.
+    EN: Checks region extraction, with an index (binary) and without one (JSON),
+    including across blocks mutated by insertion or deletion.
+    """
+    data = {
+        "genes": {"G0": "ACGTACGT", "G1": "TTTTCCCC"},
+        "blocks": [
+            {"gene": "G0", "mutation": "-"},
+            {"gene": "G1", "mutation": "Ins_2_A"},
+            {"gene": "G0", "mutation": "Del_0|Del_0"},
+            {"gene": "G1", "mutation": "Mut_7_G"},
+            {"gene": "G0", "mutation": "-"},
+        ],
+        "metadata": {"original_length": 39, "block_size": 8},
+    }
+    full = GenomeDecoder.decode(data)
+    binary_path, json_path = tmp_path / "region.dna", tmp_path / "region_json.dna"
+    binary_path.write_bytes(StorageModel.encode_binary(data, codec="zlib", index_step=2))
+    StorageModel.save(data, str(json_path))
+
+    for path in (binary_path, json_path):
+        for start, end in [(0, 5), (7, 20), (16, 17), (30, 60), (0, 100), (50, 60)]:
+            assert GenomeDecoder.decode_range(str(path), start, end) == full[start:end]
+
+    with pytest.raises(ValueError):
+        GenomeDecoder.decode_range(str(binary_path), 5, 2)
+
+
+def test_decode_blocks_mixed_batch():
+    """
+    FR: Vérifie le décodage d'un lot mêlant MutationOps et mutations texte.
+    EN: Checks decoding a batch mixing MutationOps and text mutations.
+    """
+    genes = {"G0": "ACGT"}
+    blocks = [
+        {"gene": "G0", "mutation": MutationOps([OP_DEL, OP_INS], [2, 0], "T")},
+        {"gene": "G0", "mutation": "Ins_1_C"},
+        {"gene": "G0", "mutation": MutationOps()},
+    ]
+    assert GenomeDecoder.decode_blocks(genes, blocks) == "TACT" + "ACCGT" + "ACGT"
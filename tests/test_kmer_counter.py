@@ -0,0 +1,86 @@
+# tests/test_kmer_counter.py
+
+#------------------------------------------------------------------------------
+
+# Copyright (c) 2025 Rakotondravelo Tahina Mickaël
+# All rights reserved.
+#
+# This file is part of the GENOME_COMPRESSOR project.
+#
+# licensed under the MIT License. You may obtain a copy of the License at:
+# https://opensource.org/licences/MIT
+#------------------------------------------------------------------------------
+
+"""
+FR:
+Tests unitaires pour le module kmer_counter.
+
+Ce fichier vérifie :
+- La détection de l'alphabet A/C/G/T
+- L'encodage / décodage 2 bits des k-mers
+- Le comptage exact (Python pur et NumPy)
+
+Auteur               : Rakotondravelo Tahina Mickaël
+
+
+EN:
+Unit tests for the kmer_counter module.
+
+This file verifies:
+- A/C/G/T alphabet detection
+- 2-bit packing / unpacking of k-mers
+- Exact counting (pure Python and NumPy)
+
+Author               : Rakotondravelo Tahina Mickaël
+"""
+
+from collections import Counter
+
+import pytest
+from src import kmer_counter
+from src.kmer_counter import PackedKmerCounter
+
+SEQUENCE = "ACGTTGCAACGTACGTTTGACGTAAAA" * 4
+
+
+def naive_count(data, k):
+    return Counter(data[i:i + k] for i in range(len(data) - k + 1))
+
+
+def test_accepts_only_nucleotides():
+    """
+    FR : Seules les séquences A/C/G/T sont acceptées.
+    EN : Only A/C/G/T sequences are accepted.
+    """
+    assert PackedKmerCounter.accepts("ACGTTGCA")
+    assert not PackedKmerCounter.accepts("ACGN")
+    assert not PackedKmerCounter.accepts("bonjour")
+
+
+def test_pack_unpack_roundtrip():
+    """
+    FR : Un k-mer encodé sur 2 bits se décode à l'identique, y compris pour k = 32.
+    EN : A 2-bit packed k-mer unpacks identically, including for k = 32.
+    """
+    counter = PackedKmerCounter(32)
+    kmer = ("ACGT" * 8)[::-1]
+    assert counter.unpack(counter.pack(kmer)) == kmer
+
+
+def test_count_python_matches_naive():
+    """
+    FR : Le comptage Python pur correspond au comptage naïf.
+    EN : Pure Python counting matches naive counting.
+    """
+    assert PackedKmerCounter(5).count(SEQUENCE, use_numpy=False) == naive_count(SEQUENCE, 5)
+
+
+@pytest.mark.skipif(kmer_counter.np is None, reason="NumPy non installé")
+def test_count_numpy_matches_python():
+    """
+    FR : Le comptage NumPy donne les mêmes fréquences, dans le même ordre.
+    EN : NumPy counting gives the same frequencies, in the same order.
+    """
+    counter = PackedKmerCounter(6)
+    expected = counter.count(SEQUENCE, min_count=2, use_numpy=False)
+    assert list(counter.count(SEQUENCE, min_count=2, use_numpy=True).items()) == list(expected.items())
@@ -0,0 +1,210 @@
+# tests/test_mapped_store.py
+
+#------------------------------------------------------------------------------
+
+# Copyright (c) 2025 Rakotondravelo Tahina Mickaël
+# All rights reserved.
+#
+# This file is part of the GENOME_COMPRESSOR project.
+#
+# licensed under the MIT License. You may obtain a copy of the License at:
+# https://opensource.org/licences/MIT
+#------------------------------------------------------------------------------
+
+"""
+FR:
+Tests unitaires pour le module mapped_store.py (conteneur v3 lu par mmap).
+
+Ce fichier vérifie :
+- L'accès paresseux aux gènes et aux blocs, et les vues sans copie
+- La position des blocs dans la séquence décodée
+- Le chargement et le décodage via StorageModel / GenomeDecoder
+- Le rejet d'un fichier tronqué
+- Les enregistrements binaires des opérations, et la lecture des fichiers 3.0
+
+Auteur               : Rakotondravelo Tahina Mickaël
+
+
+EN:
+Unit tests for the mapped_store.py module (v3 container read through mmap).
+
+This file checks:
+- Lazy access to genes and blocks, and zero-copy views
+- Block offsets in the decoded sequence
+- Loading and decoding through StorageModel / GenomeDecoder
+- Rejection of a truncated file
+- Binary operation records, and reading 3.0 files
+
+Author               : Rakotondravelo Tahina Mickaël
+"""
+
+import json
+import struct
+import pytest
+from src.genome_decoder import GenomeDecoder
+from src.mapped_store import MAPPED_MAGIC, MappedStore
+from src.mutation_ops import MUTATION_FORMAT, OP_DEL, OP_INS, OP_MUT, MutationOps
+from src.storage_model import StorageModel
+
+
+@pytest.fixture
+def mapped_file(tmp_path):
+    """
+    FR: Fixture écrivant un fichier v3 et retournant (chemin, données).
+    EN: Fixture writing a v3 file and returning (path, data).
+    """
+    data = {
+        "genes": {"G0": "ACGTACGT", "G_dyn_1": "TTGGé"},
+        "blocks": [
+            {"gene": "G0", "mutation": "-"},
+            {"gene": "G_dyn_1", "mutation": "Ins_0_A"},
+            {"gene": "G0", "mutation": "Del_3|Mut_0_C"},
+        ],
+        "metadata": {"original_length": 21, "block_size": 8},
+    }
+    path = tmp_path / "mapped.dna"
+    StorageModel.save(data, str(path), mapped=True)
+    return path, data
+
+
+def test_lazy_access(mapped_file):
+    """
+    FR: Vérifie l'accès à la demande aux gènes, aux blocs et à leurs positions.
+    EN: Checks on-demand access to genes, blocks and their offsets.
+    """
+    path, _ = mapped_file
+    with MappedStore(str(path)) as store:
+        assert len(store) == 3
+        assert store.metadata["format_version"] == StorageModel.mapped_version
+        assert store.gene_ids() == ["G0", "G_dyn_1"]
+        assert bytes(store.gene_view(0)) == b"ACGTACGT"
+        assert store.gene(1) == "TTGGé"
+        assert store.block(0) == (0, "-")
+        assert store.block(2) == (0, "Del_3|Mut_0_C")
+        assert [store.block_offset(i) for i in range(4)] == [0, 8, 14, 21]
+        assert store.find_block(13) == 1
+        assert store.find_block(14) == 2
+        with pytest.raises(IndexError):
+            store.block(3)
+
+
+def test_load_and_decode(mapped_file):
+    """
+    FR: Vérifie le chargement complet, le décodage et l'extraction de régions.
+    EN: Checks full loading, decoding and region extraction.
+    """
+    path, data = mapped_file
+    expected = GenomeDecoder.decode(data)
+    loaded = StorageModel.load(str(path))
+    assert loaded["genes"] == data["genes"]
+    assert loaded["blocks"] == data["blocks"]
+    assert GenomeDecoder.decode_from_file(str(path)) == expected
+    assert "".join(GenomeDecoder.iter_decode(str(path))) == expected
+    for start, end in [(0, 3), (7, 15), (14, 30), (25, 30)]:
+        assert GenomeDecoder.decode_range(str(path), start, end) == expected[start:end]
+
+
+def test_pipe_substitution_offsets(tmp_path):
+    """
+    FR: Vérifie que les positions des blocs restent exactes quand un caractère muté
+    ou inséré est "|", ambigu dans la forme texte des mutations.
+    EN: Checks that block offsets stay exact when a mutated or inserted character is
+    "|", which is ambiguous in the text form of mutations.
+    """
+    data = {
+        "genes": {"G0": "ACGT"},
+        "blocks": [
+            {"gene": "G0", "mutation": MutationOps([OP_MUT, OP_INS], [1, 4], "||")},
+            {"gene": "G0", "mutation": MutationOps([OP_INS, OP_DEL], [0, 2], "|")},
+            {"gene": "G0", "mutation": MutationOps()},
+        ],
+        "metadata": {"original_length": 13, "block_size": 4, "mutation_format": MUTATION_FORMAT},
+    }
+    expected = GenomeDecoder.decode(data)
+    path = str(tmp_path / "pipes.dna")
+    StorageModel.save(data, path, mapped=True)
+
+    with MappedStore(path) as store:
+        assert [store.block_offset(i) for i in range(4)] == [0, 5, 9, 13]
+    assert GenomeDecoder.decode_range(path, 9, 13) == expected[9:] == "ACGT"
+    for start in range(len(expected)):
+        assert GenomeDecoder.decode_range(path, start, start + 3) == expected[start:start + 3]
+
+
+def test_truncated_file(mapped_file):
+    """
+    FR: Vérifie qu'un fichier v3 tronqué est signalé comme corrompu.
+    EN: Checks that a truncated v3 file is reported as corrupted.
+    """
+    path, _ = mapped_file
+    path.write_bytes(path.read_bytes()[:-2])
+    with pytest.raises(ValueError, match="invalide ou corrompu"):
+        MappedStore(str(path))
+
+
+def test_invalid_mutation_error_not_masked(tmp_path):
+    """
+    FR: Vérifie qu'une mutation texte invalide est refusée à l'écriture, et qu'un
+    enregistrement d'opérations corrompu remonte en ValueError sans être masqué par
+    la fermeture de la projection.
+    EN: Checks that an invalid text mutation is rejected on write, and that a
+    corrupted operation record surfaces as a ValueError without being masked by
+    closing the mapping.
+    """
+    data = {
+        "genes": {"G0": "ACGT"},
+        "blocks": [{"gene": "G0", "mutation": "Mut_X_Y"}],
+        "metadata": {"original_length": 4, "block_size": 4, "mutation_format": MUTATION_FORMAT},
+    }
+    path = tmp_path / "invalid.dna"
+    with pytest.raises(ValueError, match="Mutation invalide"):
+        StorageModel.save(data, str(path), mapped=True)
+
+    data["blocks"] = [{"gene": "G0", "mutation": MutationOps([OP_MUT], [1], "T")}]
+    StorageModel.save(data, str(path), mapped=True)
+    content = bytearray(path.read_bytes())
+    assert content[-5:] == b"\x01\x00\x01\x01T"  # nombre, type, position, caractère
+    content[-4] = 7
+    path.write_bytes(bytes(content))
+    with pytest.raises(ValueError, match="invalide ou corrompu"):
+        StorageModel.load(str(path))
+    with pytest.raises(ValueError, match="invalide ou corrompu"):
+        GenomeDecoder.decode_range(str(path), 0, 4)
+
+
+def test_operation_records(tmp_path):
+    """
+    FR: Vérifie que les mutations au format d'opérations sont stockées en
+    enregistrements binaires et relues telles quelles, et qu'un fichier 3.0 à
+    mutations texte reste lisible.
+    EN: Checks that operation-format mutations are stored as binary records and
+    read back as is, and that a 3.0 file with text mutations stays readable.
+    """
+    ops = MutationOps([OP_INS, OP_MUT, OP_DEL], [0, 1, 3], "|é")
+    data = {
+        "genes": {"G0": "ACGT"},
+        "blocks": [{"gene": "G0", "mutation": ops}, {"gene": "G0", "mutation": MutationOps()}],
+        "metadata": {"original_length": 8, "block_size": 4, "mutation_format": MUTATION_FORMAT},
+    }
+    path = str(tmp_path / "ops.dna")
+    StorageModel.save(data, path, mapped=True)
+    with MappedStore(path) as store:
+        record = bytearray()
+        ops.write_to(record)
+        assert bytes(store.mutation_view(0)) == bytes(record)
+        assert len(store.mutation_view(1)) == 0
+        assert store.block(0) == (0, ops)
+        assert store.block(1) == (0, MutationOps())
+    assert GenomeDecoder.decode_from_file(path) == "|AéG" + "ACGT"
+
+    # Fichier 3.0 : mêmes tables, mutations texte / 3.0 file: same tables, text mutations
+    legacy = MappedStore.encode({"genes": data["genes"], "metadata": {"block_size": 4},
+                                 "blocks": [{"gene": "G0", "mutation": ops.to_string()}, {"gene": "G0", "mutation": "-"}]})
+    length = struct.unpack_from("<Q", legacy, len(MAPPED_MAGIC))[0]
+    metadata = json.dumps(dict(data["metadata"], format_version="3.0")).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(MAPPED_MAGIC + struct.pack("<Q", len(metadata)) + metadata + legacy[len(MAPPED_MAGIC) + 8 + length:])
+    with MappedStore(path) as store:
+        assert store.metadata["format_version"] == "3.0"
+        assert store.block(0) == (0, ops)
+    assert GenomeDecoder.decode_from_file(path) == "|AéG" + "ACGT"
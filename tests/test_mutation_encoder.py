@@ -36,6 +36,7 @@ Author               : Rakotondravelo Tahina Mickaël
 
 import pytest
 
+from src.gene_index import GeneIndex
 from src.mutation_encoder import MutationEncoder
 
 @pytest.fixture
@@ -75,4 +76,64 @@ def test_decode_mutation(encoder):
     encoded_muation = "-|-|Mut_2_C|-|-|-|-|Mut_7_A"
     expected = "ACCTACGA"
     result = encoder.decode_mutation(original, encoded_muation)
-    assert result == expected
\ No newline at end of file
+    assert result == expected
+
+def test_mutation_distance(encoder):
+    seq, ref = "ACCTACGA", "ACGTACGT"
+    assert encoder.mutation_distance(seq, ref) == 2
+    assert encoder.mutation_distance(seq, ref, limit=1) > 1
+    assert encoder.mutation_distance("ACG", "ACGTT") == 2
+
+def test_find_closest_gene_best_mode(encoder):
+    genes = {"G0": "ACGTTTTT", "G1": "ACGTACGA", "G2": "ACGTACGT"}
+    assert encoder.find_closest_gene("ACGTACGT", genes, 4, mode="first")[0] == "G0"
+    gene_id, mutation = encoder.find_closest_gene("ACGTACGT", genes, 4, mode="best")
+    assert gene_id == "G2"
+    assert encoder.apply_mutation(genes[gene_id], mutation) == "ACGTACGT"
+
+def test_banded_alignment_absorbs_indels():
+    aligner = MutationEncoder(band=2)
+    ref = "ACGTACGTACGTACGT"
+    seq = ref[:5] + "T" + ref[5:-1]           # une base insérée, la dernière perdue
+    assert MutationEncoder().mutation_distance(seq, ref) > 2
+    assert aligner.mutation_distance(seq, ref) == 2
+    ops = aligner.encode_ops(seq, ref)
+    assert len(ops) == 2 and ops.is_sorted()
+    assert ops.apply(ref) == seq
+    assert aligner.apply_mutation(ref, ops.to_string()) == seq
+
+def test_banded_find_closest_gene_with_index():
+    genes = {"G0": "TTTTGGGGCCCCAAAA", "G1": "ACGTTGCAACGTTGCA"}
+    index = GeneIndex(max_mutations=3)
+    for gene_id, gene in genes.items():
+        index.add(gene_id, gene)
+    block = "ACGTGCAACGTTGCAA"                      # G1 avec une suppression et une insertion
+    assert MutationEncoder().find_closest_gene(block, genes, 3, index=index) == (None, None)
+    gene_id, ops = MutationEncoder(band=3).find_closest_gene(block, genes, 3, index=index)
+    assert gene_id == "G1" and len(ops) == 2
+    assert ops.apply(genes["G1"]) == block
+
+@pytest.mark.parametrize("seq, ref, expected", [
+    ("", "ACGT", 4),
+    ("ACGT", "", 4),
+    ("ACGT", "ACGT", 0),
+    ("kitten", "sitting", 3),
+    ("ACGTACGTACGT", "ACGACGTACGTT", 2),
+    ("A" * 70, "A" * 69 + "C", 1),   # plus long qu'un mot machine / longer than a word
+])
+def test_edit_distance_bit_vectors(seq, ref, expected):
+    assert MutationEncoder.edit_distance(seq, ref) == expected
+    masks = MutationEncoder.pattern_masks(seq)
+    assert MutationEncoder.edit_distance(seq, ref, limit=expected, masks=masks) == expected
+    if expected:
+        assert MutationEncoder.edit_distance(seq, ref, limit=expected - 1) > expected - 1
+
+def test_prefilter_skips_alignment_of_distant_genes(monkeypatch):
+    aligner = MutationEncoder(band=1)
+    tables = []
+    align = MutationEncoder._align
+    monkeypatch.setattr(MutationEncoder, "_align", staticmethod(lambda *args: tables.append(args) or align(*args)))
+    genes = {"G0": "TTTTTTTTTTTT", "G1": "GGGGCCCCGGGG", "G2": "ACGTACGTACGA"}
+    gene_id, ops = aligner.find_closest_gene("ACGTACGTACGT", genes, 3)
+    assert gene_id == "G2" and ops.apply(genes["G2"]) == "ACGTACGTACGT"
+    assert len(tables) == 2                      # G2 (distance) puis encode_ops
@@ -0,0 +1,163 @@
+# tests/test_mutation_ops.py
+
+#------------------------------------------------------------------------------
+
+# Copyright (c) 2025 Rakotondravelo Tahina Mickaël
+# All rights reserved.
+#
+# This file is part of the GENOME_COMPRESSOR project.
+#
+# licensed under the MIT License. You may obtain a copy of the License at:
+# https://opensource.org/licences/MIT
+#------------------------------------------------------------------------------
+
+"""
+FR:
+Tests unitaires pour le module mutation_ops.py.
+
+Ce fichier vérifie :
+- Le calcul creux des opérations entre deux séquences
+- L'application des opérations et la longueur obtenue
+- La sérialisation texte et sa compatibilité avec l'ancien décodeur
+- L'aller-retour par les conteneurs binaire et JSON
+- L'application linéaire d'opérations non triées, par lots et des chaînes héritées
+
+Auteur               : Rakotondravelo Tahina Mickaël
+
+
+EN:
+Unit tests for the mutation_ops.py module.
+
+This file checks:
+- Sparse computation of the operations between two sequences
+- Application of the operations and the resulting length
+- Text serialisation and its compatibility with the legacy decoder
+- Roundtrip through the binary and JSON containers
+- Linear-time application of unsorted operations, batches and legacy strings
+
+Author               : Rakotondravelo Tahina Mickaël
+"""
+
+import pickle
+import pytest
+from src.genome_decoder import GenomeDecoder
+from src.mutation_ops import OP_DEL, OP_INS, OP_MUT, MutationOps, apply_legacy
+from src.storage_model import StorageModel
+
+
+def test_diff_is_sparse():
+    """
+    FR: Vérifie que seules les différences sont encodées (aucun marqueur).
+    EN: Checks that only differences are encoded (no placeholder).
+    """
+    ops = MutationOps.diff("ACCTACGA", "ACGTACGT")
+    assert list(ops) == [(OP_MUT, 2, "C"), (OP_MUT, 7, "A")]
+    assert ops.to_string() == "Mut_2_C|Mut_7_A"
+    assert len(MutationOps.diff("ACGT", "ACGT")) == 0
+
+
+@pytest.mark.parametrize("sequence, reference", [
+    ("ACGTAC", "ACGT"),
+    ("AC", "ACGT"),
+    ("TTGTAA", "ACGT"),
+    ("", "ACG"),
+    ("ACG", ""),
+])
+def test_apply_and_legacy_string(sequence, reference):
+    """
+    FR: Vérifie l'application, la longueur, et que la forme texte donne le même
+    résultat avec l'ancien décodeur (insertions multiples en fin comprises).
+    EN: Checks application, length, and that the text form gives the same result with
+    the legacy decoder (multiple trailing insertions included).
+    """
+    ops = MutationOps.diff(sequence, reference)
+    assert ops.apply(reference) == sequence
+    assert ops.output_length(len(reference)) == len(sequence)
+    assert GenomeDecoder.apply_mutation(reference, ops.to_string()) == sequence
+    assert MutationOps.from_string(ops.to_string()) == ops
+    assert pickle.loads(pickle.dumps(ops)) == ops
+
+
+def test_from_string_rejects_malformed():
+    """
+    FR: Vérifie le rejet d'un jeton mal formé.
+    EN: Checks that a malformed token is rejected.
+    """
+    for mutation in ["Mut_X_Y", "sub_2_T", "Del_1_A", "Ins_3_AB"]:
+        with pytest.raises(ValueError):
+            MutationOps.from_string(mutation)
+
+
+def test_storage_roundtrip(tmp_path):
+    """
+    FR: Vérifie que les MutationOps traversent les conteneurs binaire et JSON.
+    EN: Checks that MutationOps go through the binary and JSON containers.
+    """
+    ops = MutationOps([OP_INS, OP_MUT, OP_DEL], [0, 1, 3], "GT")
+    data = {
+        "genes": {"G0": "ACGT"},
+        "blocks": [{"gene": "G0", "mutation": ops}, {"gene": "G0", "mutation": MutationOps()}],
+        "metadata": {"original_length": 8, "block_size": 4, "mutation_format": "ops"},
+    }
+    for binary in (True, False):
+        path = tmp_path / f"ops_{binary}.dna"
+        StorageModel.save(data, str(path), binary=binary)
+        loaded = StorageModel.load(str(path))
+        assert [b["mutation"] for b in loaded["blocks"]] == [ops, MutationOps()]
+        assert GenomeDecoder.decode(loaded) == "GATGACGT"
+
+
+def test_separator_characters_roundtrip(tmp_path):
+    """
+    FR: Vérifie que "|", "_" et "-" comme caractères mutés ou insérés traversent tous
+    les conteneurs (la forme texte les lit par position).
+    EN: Checks that "|", "_" and "-" as mutated or inserted characters go through every
+    container (the text form reads them by position).
+    """
+    ops = MutationOps([OP_INS, OP_MUT, OP_MUT, OP_INS], [0, 1, 2, 4], "|_-|")
+    assert ops.to_string() == "Ins_0_||Mut_1__|Mut_2_-|Ins_4_|"
+    assert MutationOps.from_string(ops.to_string()) == ops
+    for mutation in ["Mut_1_", "Mut_1_||", "Mut_1_AB", "|Del_2"]:
+        with pytest.raises(ValueError):
+            MutationOps.from_string(mutation)
+
+    data = {
+        "genes": {"G0": "ACGT"},
+        "blocks": [{"gene": "G0", "mutation": ops}, {"gene": "G0", "mutation": MutationOps()}],
+        "metadata": {"original_length": 10, "block_size": 4, "mutation_format": "ops"},
+    }
+    for options in ({}, {"binary": True}, {"mapped": True}):
+        path = str(tmp_path / "special.dna")
+        StorageModel.save(data, path, **options)
+        assert GenomeDecoder.decode(StorageModel.load(path)) == "|A_-T|ACGT"
+        assert GenomeDecoder.decode_range(path, 1, 7) == "A_-T|A"
+
+def test_apply_unsorted_and_batch():
+    """
+    FR: Vérifie le tri des opérations avant application et l'application par lots.
+    EN: Checks that operations are sorted before application, and batch application.
+    """
+    ops = MutationOps([OP_DEL, OP_MUT, OP_INS], [3, 1, 0], "TG")
+    assert not ops.is_sorted()
+    assert ops.apply("ACGT") == "GATG"
+    assert ops.is_sorted()
+    assert ops == MutationOps([OP_INS, OP_MUT, OP_DEL], [0, 1, 3], "GT")
+
+    pairs = [("ACGT", ops), ("CCCC", MutationOps()), ("AAAA", MutationOps([OP_INS], [4], "T"))]
+    assert MutationOps.apply_batch(pairs) == "GATG" + "CCCC" + "AAAAT"
+
+
+@pytest.mark.parametrize("mutation, decoder, encoder", [
+    ("Ins_1_T|Ins_3_G|Del_5|Mut_6_C", "ATCGGTACT", "ATCGGTACT"),
+    ("Mut_3_G|Mut_1_T", "ATGGACGT", "ATGGACGT"),       # retour en arrière / going backwards
+    ("Ins_9_T|Mut_0_G", "GCGTACGT", "AGGTACGTT"),     # insertion hors limites / out of range
+    ("Del_7|Ins_7_A|Mut_-1_C", "ACGTACAG", "ACGTACAG"),
+    ("Mut_x_A|Foo_1_C|Del_2", "ACTACGT", "ACTACGT"),  # jetons ignorés / ignored tokens
+])
+def test_apply_legacy_matches_decoders(mutation, decoder, encoder):
+    """
+    FR: Vérifie que le moteur linéaire suit les règles des deux anciens décodeurs.
+    EN: Checks that the linear engine follows the rules of both legacy decoders.
+    """
+    assert apply_legacy("ACGTACGT", mutation) == decoder
+    assert apply_legacy("ACGTACGT", mutation, insert_anywhere=True) == encoder
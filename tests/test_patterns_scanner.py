@@ -47,7 +47,10 @@ Author                 : Rakotondravelo Tahina Mickaël
 """
 
 
+import random
+
 import pytest
+from src import pattern_scanner
 from src.pattern_scanner import PatternScanner
 
 def test_naive_detection():
@@ -135,4 +138,54 @@ def test_find_frequent_patterns():
     scanner = PatternScanner(min_length=3, max_length=3, min_frequency=2)
     blocks = ["abc", "abc", "abc", "def"]
     top = scanner.find_frequent_patterns(blocks, top_k=2)
-    assert "abc" in top
\ No newline at end of file
+    assert "abc" in top
+
+def test_suffix_array_matches_naive():
+    """
+    FR : Vérifie que la méthode suffix-array retourne exactement le résultat naïf (ordre compris).
+    EN : Check that the suffix-array method returns exactly the naive result (ordering included).
+    """
+    data = "bonjourbonjourbonsoirbonjour"
+    naive = PatternScanner(min_length=2, max_length=7, min_frequency=2, method="naive").scan(data)
+    suffix = PatternScanner(min_length=2, max_length=7, min_frequency=2, method="suffix-array").scan(data)
+    assert list(suffix.items()) == list(naive.items())
+    assert suffix["bonjour"] == 3
+
+
+
+@pytest.mark.parametrize("with_numpy", [True, False])
+def test_suffix_array_matches_naive_random(monkeypatch, with_numpy):
+    """
+    FR : Même résultat que la méthode naïve sur de l'ADN aléatoire, avec ou sans NumPy,
+    à longueur variable, fixe, et pour les motifs uniques.
+    EN : Same result as the naive method on random DNA, with or without NumPy, for
+    variable and fixed lengths, and for unique patterns.
+    """
+    if not with_numpy:
+        monkeypatch.setattr(pattern_scanner, "np", None)
+    rng = random.Random(4)
+    data = "".join(rng.choice("ACGT") for _ in range(3000)) + "N|ACGT"
+    for min_length, max_length, min_frequency in ((3, 12, 2), (6, 6, 2), (1, 5, 1), (4, 9, 3)):
+        naive = PatternScanner(min_length, max_length, min_frequency, method="naive").scan(data)
+        suffix = PatternScanner(min_length, max_length, min_frequency, method="suffix-array").scan(data)
+        assert list(suffix.items()) == list(naive.items())
+
+def test_suffix_array_find_frequent_patterns():
+    """
+    FR : Vérifie que find_frequent_patterns fonctionne avec le moteur suffix-array.
+    EN : Check that find_frequent_patterns works with the suffix-array engine.
+    """
+    scanner = PatternScanner(min_length=3, max_length=3, min_frequency=2, method="suffix-array")
+    blocks = ["abc", "abc", "abc", "def"]
+    assert scanner.find_frequent_patterns(blocks, top_k=1) == ["abc"]
+
+
+def test_auto_mode_packed():
+    """
+    FR : Vérifie que le mode automatique utilise le compteur 2 bits pour une séquence A/C/G/T.
+    EN : Check that auto mode uses the 2-bit counter for an A/C/G/T sequence.
+    """
+    scanner = PatternScanner(min_length=4, max_length=4, min_frequency=2)
+    assert scanner.method == "packed"
+    data = "ACGTACGTTTACGT"
+    assert scanner.scan(data) == PatternScanner(4, 4, 2, method="naive").scan(data)
@@ -0,0 +1,117 @@
+# tests/test_reference_index.py
+
+#------------------------------------------------------------------------------
+
+# Copyright (c) 2025 Rakotondravelo Tahina Mickaël
+# All rights reserved.
+#
+# This file is part of the GENOME_COMPRESSOR project.
+#
+# licensed under the MIT License. You may obtain a copy of the License at:
+# https://opensource.org/licences/MIT
+#------------------------------------------------------------------------------
+
+"""
+FR:
+Tests unitaires pour le module reference_index.
+
+Ce fichier vérifie :
+- Le tri des positions par k-mer (NumPy et Python pur identiques)
+- La recherche des positions candidates d'un bloc
+- La sauvegarde / relecture de l'index sans nouveau tri
+- La résolution des gènes "R<position>"
+
+Auteur               : Rakotondravelo Tahina Mickaël
+
+
+EN:
+Unit tests for the reference_index module.
+
+This file verifies:
+- Sorting of the positions by k-mer (NumPy and pure Python identical)
+- Lookup of the candidate positions of a block
+- Saving / reading back the index without sorting again
+- Resolution of "R<position>" genes
+
+Author               : Rakotondravelo Tahina Mickaël
+"""
+
+import random
+
+import pytest
+from src import reference_index
+from src.reference_index import ReferenceIndex, SharedGenes, reference_position, resolve_genes
+
+
+def random_sequence(rng, length):
+    return "".join(rng.choice("ACGT") for _ in range(length))
+
+
+def test_positions_sorted_by_kmer(monkeypatch):
+    """
+    FR : Les positions sont triées par k-mer puis par position, avec ou sans NumPy.
+    EN : Positions are sorted by k-mer then by position, with or without NumPy.
+    """
+    sequence = random_sequence(random.Random(1), 2000)
+    expected = sorted(range(len(sequence) - 5), key=lambda p: (sequence[p:p + 6], p))
+    assert list(ReferenceIndex(sequence, k=6).positions) == expected
+    monkeypatch.setattr(reference_index, "np", None)
+    assert list(ReferenceIndex(sequence, k=6).positions) == expected
+
+
+def test_candidates_find_mutated_block():
+    """
+    FR : Un bloc copié de la référence avec peu de substitutions retrouve sa position.
+    EN : A block copied from the reference with few substitutions finds its position.
+    """
+    rng = random.Random(2)
+    sequence = random_sequence(rng, 20000)
+    index = ReferenceIndex(sequence, k=8)
+    for _ in range(50):
+        start = rng.randrange(len(sequence) - 32)
+        block = list(sequence[start:start + 32])
+        for i in rng.sample(range(32), 3):
+            block[i] = rng.choice("ACGT")
+        assert start in index.candidates("".join(block))
+    assert index.candidates("A" * 7) == []
+
+
+def test_save_and_load(tmp_path):
+    """
+    FR : La référence relue a la même empreinte et le même index, et est enregistrée.
+    EN : The reloaded reference has the same digest and index, and is registered.
+    """
+    sequence = random_sequence(random.Random(3), 5000)
+    index = ReferenceIndex(sequence, k=10)
+    index.save(str(tmp_path / "ref.dnaref"))
+    reference_index._loaded.clear()
+
+    loaded = ReferenceIndex.load(str(tmp_path / "ref.dnaref"))
+    assert (loaded.sequence, loaded.k, loaded.digest) == (sequence, 10, index.digest)
+    assert loaded.positions == index.positions
+    assert ReferenceIndex.get(index.digest) is loaded
+
+    (tmp_path / "bad.dnaref").write_bytes(b"DNAR\x0a\xff")
+    with pytest.raises(ValueError):
+        ReferenceIndex.load(str(tmp_path / "bad.dnaref"))
+
+
+def test_reference_genes_resolution():
+    """
+    FR : Les gènes "R<p>" sont lus dans la référence sans être stockés ; sans
+    référence chargée, le décodage échoue clairement.
+    EN : "R<p>" genes are read from the reference without being stored; without a
+    loaded reference, decoding fails clearly.
+    """
+    index = ReferenceIndex("ACGTACGTTTGCA", k=4)
+    genes = resolve_genes({"G_dyn_0": "CCCC"}, {"reference": index.metadata(), "block_size": 4})
+    assert isinstance(genes, SharedGenes)
+    assert (genes["R2"], genes["G_dyn_0"]) == ("GTAC", "CCCC")
+    assert dict(genes) == {"G_dyn_0": "CCCC"}
+    assert reference_position("R12") == 12
+    with pytest.raises(KeyError):
+        genes["G_dyn_1"]
+
+    reference_index._loaded.clear()
+    with pytest.raises(ValueError):
+        SharedGenes({}, {"reference": index.metadata(), "block_size": 4})["R0"]
@@ -0,0 +1,106 @@
+# tests/test_rolling_hash.py
+
+#------------------------------------------------------------------------------
+
+# Copyright (c) 2025 Rakotondravelo Tahina Mickaël
+# All rights reserved.
+#
+# This file is part of the GENOME_COMPRESSOR project.
+#
+# licensed under the MIT License. You may obtain a copy of the License at:
+# https://opensource.org/licences/MIT
+#------------------------------------------------------------------------------
+
+"""
+FR:
+Tests unitaires pour le module rolling_hash.
+
+Ce fichier vérifie :
+- Le comptage exact des k-mers par empreinte
+- La résolution correcte des collisions
+- L'équivalence des chemins Python pur et NumPy
+
+Auteur               : Rakotondravelo Tahina Mickaël
+
+
+EN:
+Unit tests for the rolling_hash module.
+
+This file verifies:
+- Exact k-mer counting by fingerprint
+- Correct collision resolution
+- Equivalence of the pure Python and NumPy paths
+
+Author               : Rakotondravelo Tahina Mickaël
+"""
+
+from collections import Counter
+
+import pytest
+from src import rolling_hash
+from src.rolling_hash import RollingHash
+
+
+def naive_count(data, length):
+    return Counter(data[i:i + length] for i in range(len(data) - length + 1))
+
+
+def test_count_matches_naive():
+    """
+    FR : Vérifie que le comptage par empreinte correspond au comptage naïf.
+    EN : Checks that fingerprint counting matches naive counting.
+    """
+    data = "ACGTTGCAACGTACGTTTGACGT" * 3
+    assert RollingHash(4).count(data, use_numpy=False) == naive_count(data, 4)
+
+
+def test_collisions_are_resolved():
+    """
+    FR : Avec un modulo minuscule, toutes les fenêtres collisionnent mais le résultat reste exact.
+    EN : With a tiny modulus every window collides, yet the result stays exact.
+    """
+    data = "abcbacabccbaabc"
+    assert RollingHash(3, base=1, modulus=7).count(data, use_numpy=False) == naive_count(data, 3)
+
+
+def test_short_input():
+    """
+    FR : Une entrée plus courte que la fenêtre ne produit aucun k-mer.
+    EN : An input shorter than the window yields no k-mer.
+    """
+    assert RollingHash(5).count("ACG") == {}
+
+
+@pytest.mark.skipif(rolling_hash.np is None, reason="NumPy non installé")
+def test_numpy_path_matches_python():
+    """
+    FR : Vérifie que le chemin NumPy (collisions forcées avec base=1) est exact.
+    EN : Checks that the NumPy path (collisions forced with base=1) is exact.
+    """
+    data = "abcbacabccbaabcé" * 20
+    expected = naive_count(data, 3)
+    assert RollingHash(3).count(data, use_numpy=True) == expected
+    assert RollingHash(3, base=1).count(data, use_numpy=True) == expected
+
+
+@pytest.mark.skipif(rolling_hash.np is None, reason="NumPy non installé")
+def test_numpy_path_thue_morse():
+    """
+    FR : Sur une suite de Thue-Morse (collisions garanties modulo 2^64), le chemin NumPy
+    calcule les mêmes empreintes modulo 2^61 - 1 que `hashes`, sans collision.
+    EN : On a Thue-Morse string (guaranteed collisions modulo 2^64), the NumPy path
+    computes the same fingerprints modulo 2^61 - 1 as `hashes`, without collision.
+    """
+    np = rolling_hash.np
+    data = "".join("ab"[bin(i).count("1") % 2] for i in range(1 << 13))
+    engine = RollingHash(2048)
+    codes = np.frombuffer(data.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    windows = len(data) - 2048 + 1
+    hashes = np.zeros(windows, dtype=np.uint64)
+    for j in range(2048):
+        hashes = engine._mul_add_numpy(hashes, codes[j:j + windows])
+
+    assert hashes.tolist() == list(engine.hashes(data))
+    expected = naive_count(data, 2048)
+    assert len(set(hashes.tolist())) == len(expected)
+    assert engine.count(data, use_numpy=True) == expected
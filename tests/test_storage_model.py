@@ -20,6 +20,7 @@ Ce fichier vérifie le capacité à :
 - Gérer les erreurs de JSON invalide
 - Détecter l'abscence de clés obligatoires
 - Enregistrer le nom du fichier source dans les métadonnées
+- Écrire et relire le format en flux (trames)
 
 
 Auteur                   : Rakotondravelo Tahina Mickaël
@@ -33,6 +34,7 @@ This file verifies the ability to:
 - Handle errors from invalid JSON
 - Detect missign required keys
 - Record the source filename in metadata
+- Write and read back the streaming (framed) format
 
 Author                   : Rakotondravelo Tahina Mickaël
 """
@@ -40,7 +42,7 @@ Author                   : Rakotondravelo Tahina Mickaël
 import os
 import json
 import pytest
-from src.storage_model import StorageModel
+from src.storage_model import DnaStreamReader, DnaStreamWriter, StorageModel
 
 @pytest.fixture
 def sample_data():
@@ -123,4 +125,77 @@ def test_save_with_source_filename(tmp_path, sample_data):
     StorageModel.save(sample_data, str(file_path), source_filename= "input.txt")
     loaded = StorageModel.load(str(file_path))
     assert "source_filename" in loaded["metadata"]
-    assert loaded["metadata"]["source_filename"] == "input.txt"
\ No newline at end of file
+    assert loaded["metadata"]["source_filename"] == "input.txt"
+
+def test_binary_save_and_load(tmp_path, sample_data):
+    """
+    FR: Vérifie l'aller-retour du conteneur binaire v2 et la détection automatique du format.
+    EN: Checks the v2 binary container roundtrip and automatic format detection.
+    """
+    sample_data["genes"]["G_dyn_1"] = "bonjour"
+    sample_data["blocks"].append({"gene": "G_dyn_1", "mutation": "-|Mut_1_a|Ins_7_!|Del_2|sub_2_T"})
+    sample_data["blocks"].append({"gene": "G0", "mutation": None})
+    file_path = tmp_path / "binary.dna"
+
+    StorageModel.save(sample_data, str(file_path), binary=True)
+    assert file_path.read_bytes().startswith(b"DNA\x02")
+
+    loaded = StorageModel.load(str(file_path))
+    assert loaded["genes"] == sample_data["genes"]
+    assert loaded["metadata"]["format_version"] == StorageModel.binary_version
+    assert [b["gene"] for b in loaded["blocks"]] == ["G0", "G_dyn_1", "G0"]
+    assert [b["mutation"] for b in loaded["blocks"]] == ["Mut_0_A", "Mut_1_a|Ins_7_!|Del_2|sub_2_T", "-"]
+
+
+def test_binary_reencoded_without_index(tmp_path, sample_data):
+    """
+    FR: Vérifie qu'un fichier indexé relu puis réencodé sans index reste lisible.
+    EN: Checks that an indexed file read back then re-encoded without an index stays readable.
+    """
+    file_path = tmp_path / "indexed.dna"
+    StorageModel.save(sample_data, str(file_path), binary=True)
+    loaded = StorageModel.load(str(file_path))
+    assert loaded["metadata"]["block_index"]
+
+    decoded = StorageModel.decode_binary(StorageModel.encode_binary(loaded, index_step=0))
+    assert "block_index" not in decoded["metadata"]
+    assert decoded["blocks"] == sample_data["blocks"]
+
+def test_binary_truncated_file(tmp_path, sample_data):
+    """
+    FR: Vérifie qu'un conteneur binaire tronqué est signalé comme corrompu.
+    EN: Checks that a truncated binary container is reported as corrupted.
+    """
+    file_path = tmp_path / "truncated.dna"
+    file_path.write_bytes(StorageModel.encode_binary(sample_data)[:-3])
+    with pytest.raises(ValueError, match="invalide ou corrompu"):
+        StorageModel.load(str(file_path))
+
+
+def test_stream_frames_and_reset(tmp_path):
+    """
+    FR: Vérifie l'écriture/lecture en trames, y compris après une réinitialisation des gènes.
+    EN: Checks framed writing/reading, including after a gene dictionary reset.
+    """
+    file_path = tmp_path / "stream.dna"
+    with open(file_path, "wb") as f:
+        writer = DnaStreamWriter(f, {"block_size": 4}, codec="zlib")
+        writer.write_frame({"G0": "ACGT"}, [{"gene": "G0", "mutation": "-"}])
+        writer.write_frame({"G_dyn_1": "TTTT"}, [{"gene": "G_dyn_1", "mutation": "Mut_0_A"},
+                                                  {"gene": "G0", "mutation": "-"}])
+        writer.write_frame({"G2": "CCCC"}, [{"gene": "G2", "mutation": "Del_3"}], reset=True)
+        writer.close({"original_length": 15})
+
+    with open(file_path, "rb") as f:
+        frames = list(DnaStreamReader(f))
+    assert [reset for _, _, reset in frames] == [False, False, True]
+
+    loaded = StorageModel.load(str(file_path))
+    assert loaded["genes"] == {"G0": "ACGT", "G_dyn_1": "TTTT", "G2": "CCCC"}
+    assert [b["gene"] for b in loaded["blocks"]] == ["G0", "G_dyn_1", "G0", "G2"]
+    assert loaded["metadata"]["original_length"] == 15
+    assert loaded["metadata"]["format_version"] == StorageModel.stream_version
+
+    file_path.write_bytes(file_path.read_bytes()[:-4])
+    with pytest.raises(ValueError, match="invalide ou corrompu"):
+        StorageModel.load(str(file_path))